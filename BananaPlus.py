@@ -25,69 +25,150 @@ if os.path.exists(data_path + "\\current_workspace.txt"):
     except:
         workspace_dir = os.path.dirname(os.path.realpath(__file__))
         
-from src.lexer import Lexer
+from src.lexer import Lexer, TokenStream, InternTable
 from src.parser import Parser
-from src.interpreter import Interpreter
+from src.resolver import Resolver
+from src.engine import Engine
 from src.errors import Context
+from src.position import Source, read_source, release
 from src.symbol_table import SymbolTable
 import src.built_in as built_in
+import src.cache as cache
 
 global_symbol_table = SymbolTable()
 
 lib_dir = pathlib.Path.home().drive + "\\BananaPlus\\libs"
 
-built_in.register_var(global_symbol_table)
+# Run scripts on the bytecode VM instead of the tree walking interpreter
+use_vm = "--vm" in sys.argv
+# Lex tokens as the parser asks for them instead of all up front
+stream_tokens = "--stream" in sys.argv
+# Parse every script again instead of reading its tree from __bpcache__
+use_cache = "--no-cache" not in sys.argv
 
-def run(fn, text):
-    lexer = Lexer(fn, text)
-    tokens, error = lexer.make_tokens()
-    if error: return None, error
+engine = Engine(use_vm)
 
-    parser = Parser(tokens)
-    ast = parser.parse()
-    if ast.error: return None, ast.error
+built_in.register_var(global_symbol_table)
 
-    interpreter = Interpreter()
-    context = Context('<program>')
+def parse(fn, text, path=None, interned=None):
+    # A script read from path is parsed once and then loaded from the cache
+    # for as long as the file stays the same
+    source = Source(fn, text, path)
+    try:
+        if path and use_cache:
+            node = cache.load(path, source)
+            if node != None: return node, source, None
+
+        lexer = Lexer(fn, text, interned, source)
+        if stream_tokens:
+            tokens = TokenStream(lexer)
+            ast = Parser(tokens).parse()
+            tokens.finish()
+            if lexer.error: return None, source, lexer.error
+        else:
+            tokens, error = lexer.make_tokens()
+            if error: return None, source, error
+            ast = Parser(tokens).parse()
+
+        if ast.error: return None, source, ast.error
+        node = Resolver().resolve(ast.node)
+        if path and use_cache: cache.store(path, source, node)
+        return node, source, None
+    finally:
+        # Nothing reads a mapped script once it is parsed but error messages,
+        # and those read it from its file again
+        source.unmap()
+
+def finish(error):
+    # Whatever the error points into may go once the script is done, so
+    # it is put into words while its sources are still there
+    if error: error.as_string()
+
+def run(fn, text, path=None):
+    engine.interned = InternTable()
+    node, source, error = parse(fn, text, path, engine.interned)
+    if error:
+        finish(error)
+        return None, error
+
+    context = Context('<program>', engine=engine, source=source)
     context.symbol_table = global_symbol_table
-    result = interpreter.visit(ast.node, context)
+    result = engine.execute(node, context)
+    finish(result.error)
     
     return result.value, result.error
 
-def import_lib(fn, text, context):
-    lexer = Lexer(fn, text)
-    tokens, error = lexer.make_tokens()
-    if error: return None, None, error
-
-    parser = Parser(tokens)
-    ast = parser.parse()
-    if ast.error: return None, None, ast.error
+def import_lib(fn, text, context, path=None):
+    node, source, error = parse(fn, text, path, context.engine.interned)
+    if error:
+        finish(error)
+        return None, None, error
 
-    interpreter = Interpreter()
-
-    from src.position import Position
-
-    new_context = Context(f"<Import '{fn}'>", context, Position(-1, 0, -1, fn, text))
+    new_context = Context(f"<Import '{fn}'>", context, source.base, source=source)
     lib_symbol_table = SymbolTable(new_context.parent.symbol_table)
 
 
 
     new_context.symbol_table = lib_symbol_table
 
-    result = interpreter.visit(ast.node, new_context)
+    result = new_context.engine.execute(node, new_context)
+    finish(result.error)
 
     return lib_symbol_table, result.value, result.error
 
+def check(fn, text):
+    # Every syntax error of a script, found in one pass. The lexer still
+    # stops at the first character it cannot read
+    lexer = Lexer(fn, text)
+    tokens, error = lexer.make_tokens()
+    if error: return [error], lexer.source
+
+    errors = []
+    Parser(tokens).parse(errors=errors)
+    return errors, lexer.source
+
+def check_dir(directory):
+    # Checks the syntax of every script under directory without running
+    # any, and prints the errors found. Returns how many there were
+    files = failed = count = 0
+    for root, dirs, names in os.walk(directory):
+        dirs[:] = sorted(name for name in dirs if name != cache.CACHE_DIR)
+        for name in sorted(names):
+            if not name.endswith(file_id): continue
+            path = os.path.join(root, name)
+            files += 1
+            try:
+                text = read_source(path)
+            except Exception as e:
+                print(f"Failed to load script \"{path}\"\n{e}\n")
+                failed += 1
+                count += 1
+                continue
+
+            errors, source = check(path, text)
+            for error in errors:
+                print(error.as_string() + "\n")
+            if errors:
+                failed += 1
+                count += len(errors)
+            # Nothing points into a checked script once its errors are shown
+            release(source)
+
+    print(f"{count} errors in {failed} of {files} scripts")
+    return count
+
 # run file
 if __name__ == "__main__":
+    if len(sys.argv) > 2 and sys.argv[1] == "--check":
+        sys.exit(1 if check_dir(sys.argv[2]) else 0)
+
     if len(sys.argv) > 1:
         file_name = sys.argv[1]
         if file_name.endswith(file_id):
             try:
-                with open(file_name, "r") as f:
-                    script = f.read()
+                script = read_source(file_name)
 
-                vlaue, error = run(file_name, script)
+                vlaue, error = run(file_name, script, file_name)
                 if error: print(error.as_string())
             except Exception as e:
                 print(e)
\ No newline at end of file
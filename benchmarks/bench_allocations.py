@@ -0,0 +1,77 @@
+# Values created per iteration of loops that compare, use null and count
+# with small numbers, when null, true, false and the small ints are shared
+# against when every result is a new value, and the time each loop takes.
+#
+#   python benchmarks/bench_allocations.py [iterations]
+
+import sys
+from common import parse, new_context, measure, report
+from src.engine import Engine
+from src.types import Type, Number, Boolean
+import src.types as types
+import src.interpreter as interpreter
+import src.vm as vm
+import src.built_in as built_in
+
+SCRIPTS = {
+    "comparisons": "for i = 0 to {n} then\n    let a = i < 10 and i != 5\n    let b = not (i == 3) or i >= 2\nend\n",
+    "null": "let v = null\nfor i = 0 to {n} then\n    let w = v\n    if v == null then let w = null end\nend\n",
+    "small ints": "for i = 0 to {n} then\n    let a = 3 + 4 * 2\n    let b = a - 10\nend\n",
+}
+
+MODULES = (types, interpreter, vm, built_in)
+
+def fresh(use):
+    # Makes number() and boolean() build a new value every time, in every
+    # module that imported them
+    saved = [(module, module.number, module.boolean) for module in MODULES]
+    if not use:
+        return saved
+    for module in MODULES:
+        module.number = Number
+        module.boolean = Boolean
+    return saved
+
+def restore(saved):
+    for module, number, boolean in saved:
+        module.number = number
+        module.boolean = boolean
+
+def count_values(engine, ast):
+    # Every value runs Type.__init__ once, so counting its calls counts them
+    created = 0
+    init = Type.__init__
+
+    def counting_init(self):
+        nonlocal created
+        created += 1
+        init(self)
+
+    types.Type.__init__ = counting_init
+    try:
+        engine.execute(ast, new_context(engine))
+    finally:
+        types.Type.__init__ = init
+    return created
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+
+    rows = []
+    for name, text in SCRIPTS.items():
+        ast = parse(text.format(n=iterations))
+        for use_vm in (False, True):
+            engine = Engine(use_vm)
+            for values, new in (("new", True), ("shared", False)):
+                saved = fresh(new)
+                try:
+                    created = count_values(engine, ast) / iterations
+                    elapsed = measure(lambda: engine.execute(ast, new_context(engine)), 3)
+                finally:
+                    restore(saved)
+                rows.append([name, "vm" if use_vm else "walk", values, f"{created:.1f}", f"{elapsed:.2f} s"])
+
+    report(f"{iterations} iterations", ["loop", "engine", "values", "per iteration", "time"], rows)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+# Cold start of a program made of generated library scripts: how long
+# parsing and executing them takes in a fresh process with the cache turned
+# off, on the run that fills __bpcache__, and on a run that reads it. The
+# libraries mostly define functions and tables, as libraries do, so with
+# the cache filled starting up should be dominated by executing them.
+#
+#   python benchmarks/bench_cache.py [libraries]
+
+import os
+import sys
+import json
+import shutil
+import subprocess
+import tempfile
+from common import report
+
+FUNCTION = """func {name}(items, scale)
+    let total = 0
+    for i = 0 to len(items) then
+        if items / i > {n} then
+            total += items / i * scale
+        end
+    end
+    return {{name: "{name}", total: total, tags: ["lib", "{name}"]}}
+end
+"""
+
+RUN = """
+import sys, json, time
+sys.path.insert(0, {root!r})
+if not {cached}: sys.argv.append("--no-cache")
+import BananaPlus
+from src.errors import Context
+from src.position import read_source
+from src.symbol_table import SymbolTable
+
+parse = execute = 0
+for path in {paths!r}:
+    started = time.perf_counter()
+    node, source, error = BananaPlus.parse(path, read_source(path), path)
+    parsed = time.perf_counter()
+    if error: raise Exception(error.as_string())
+
+    context = Context(path, engine=BananaPlus.engine)
+    context.symbol_table = SymbolTable(BananaPlus.global_symbol_table)
+    result = BananaPlus.engine.execute(node, context)
+    if result.error: raise Exception(result.error.as_string())
+    parse += parsed - started
+    execute += time.perf_counter() - parsed
+print(json.dumps([parse, execute]))
+"""
+
+def generate(directory, count):
+    paths = []
+    for lib in range(count):
+        functions = [FUNCTION.format(name=f"lib{lib}_f{n}", n=n) for n in range(60)]
+        calls = "\n".join(f"lib{lib}_f{n}([1, 2, 3, 4, 5, 6, 7, 8], {n})" for n in range(0, 60, 6))
+        path = os.path.join(directory, f"lib{lib}.bp")
+        with open(path, "w") as f:
+            f.write("".join(functions) + calls + "\n")
+        paths.append(path)
+    return paths
+
+def run(paths, cached):
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    code = RUN.format(root=root, paths=paths, cached=cached)
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    return json.loads(output)
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 12
+    directory = tempfile.mkdtemp()
+    try:
+        paths = generate(directory, count)
+        rows = []
+        for name, cached in (("no cache", False), ("filling cache", True), ("cached", True)):
+            parse, execute = run(paths, cached)
+            rows.append([name, f"{parse * 1000:.0f} ms", f"{execute * 1000:.0f} ms", f"{parse / (parse + execute) * 100:.0f}%"])
+        report(f"{count} libraries, {sum(os.path.getsize(path) for path in paths) // 1024} KiB", ["run", "parse", "execute", "parse share"], rows)
+    finally:
+        shutil.rmtree(directory)
+
+if __name__ == "__main__":
+    main()
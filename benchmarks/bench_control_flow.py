@@ -0,0 +1,48 @@
+# Time per unit of work of scripts dominated by function calls, returns and
+# loops, on the tree walker and on the VM. Values are passed back as plain
+# results and only leaving a function or loop early unwinds, so these are
+# what a change to how results travel shows up in.
+#
+#   python benchmarks/bench_control_flow.py [scale]
+
+import sys
+from common import parse, new_context, measure, report
+from src.engine import Engine
+
+# name, script, units of work it does, unit
+SCRIPTS = [
+    ("call", "func f(a) => a\nfor i = 0 to {n} then\n    f(i)\nend\n", lambda n: n, "call"),
+    ("return", "func f(a)\n    if a > 0 then\n        return a\n    end\n    return 0\nend\nfor i = 0 to {n} then\n    f(i)\nend\n", lambda n: n, "call"),
+    ("fib", "func fib(n)\n    if n < 2 then\n        return n\n    end\n    return fib(n - 1) + fib(n - 2)\nend\nfib({fib})\n", lambda n: fib_calls(fib_n(n)), "call"),
+    ("for", "let x = 0\nfor i = 0 to {n} then\n    x += i\nend\n", lambda n: n, "iteration"),
+    ("while", "let i = 0\nwhile true then\n    i += 1\n    if i < {n} then\n        continue\n    end\n    break\nend\n", lambda n: n, "iteration"),
+]
+
+def fib_n(n):
+    # The fib argument whose call count is closest to n
+    k = 1
+    while fib_calls(k + 1) <= n:
+        k += 1
+    return k
+
+def fib_calls(k):
+    a, b = 1, 1
+    for _ in range(k):
+        a, b = b, a + b + 1
+    return a
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+
+    rows = []
+    for name, text, units, unit in SCRIPTS:
+        ast = parse(text.format(n=n, fib=fib_n(n)))
+        for use_vm in (False, True):
+            engine = Engine(use_vm)
+            elapsed = measure(lambda: engine.execute(ast, new_context(engine)), 3)
+            rows.append([name, "vm" if use_vm else "walk", f"{elapsed:.2f} s", f"{elapsed / units(n) * 1e9:.0f} ns", unit])
+
+    report(f"scale {n}", ["script", "engine", "time", "per unit", "unit"], rows)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+# Parse and run time of generated scripts far longer or deeper than the
+# recursion limit allows a recursive walk of: a 100k term sum, a 100k term
+# 'and' chain, and list and object literals nested 100k deep. Each runs
+# on the tree walking interpreter and on the VM, with the recursion limit
+# left as it is.
+#
+#   python benchmarks/bench_deep.py [terms]
+
+import sys
+import time
+from common import parse, new_context, report
+from src.engine import Engine
+
+def scripts(terms):
+    return {
+        "a + b + ...": "let x = " + " + ".join(["1"] * terms) + "\nx\n",
+        "a and b and ...": " and ".join(["true"] * terms) + "\n",
+        "[[...]]": "[" * terms + "1" + "]" * terms + "\n",
+        "{k: {k: ...}}": "{k: " * terms + "1" + "}" * terms + "\n",
+    }
+
+def main():
+    terms = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+
+    rows = []
+    for name, text in scripts(terms).items():
+        started = time.perf_counter()
+        node = parse(text)
+        parsed = time.perf_counter() - started
+
+        for use_vm in (False, True):
+            engine = Engine(use_vm=use_vm)
+            started = time.perf_counter()
+            result = engine.execute(node, new_context(engine))
+            elapsed = time.perf_counter() - started
+            if result.error: raise Exception(result.error.as_string())
+            rows.append([name, f"{parsed * 1000:.0f} ms", "vm" if use_vm else "walk", f"{elapsed * 1000:.0f} ms"])
+
+    report(f"{terms} terms, recursion limit {sys.getrecursionlimit()}", ["script", "parse", "engine", "run"], rows)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+# Per-node overhead of Interpreter.visit: the old f-string + getattr lookup
+# against the per-class dispatch table, on a counted for loop.
+#
+#   python benchmarks/bench_dispatch.py [iterations]
+
+import sys
+from common import parse, new_context, measure, report
+from src.interpreter import Interpreter
+
+class GetattrInterpreter(Interpreter):
+    def visit(self, node, context, bin_op_right=False):
+        method_name = f'visit_{type(node).__name__}'
+        method = getattr(self, method_name, self.no_visit_method)
+        return method(node, context, bin_op_right)
+
+    def no_visit_method(self, node, context, bin_op_right=False):
+        raise Exception(f'No visit_{type(node).__name__} method defined')
+
+class RecordingInterpreter(Interpreter):
+    def __init__(self):
+        self.visited = []
+
+    def visit(self, node, context, bin_op_right=False):
+        self.visited.append(node)
+        return super().visit(node, context, bin_op_right)
+
+def script(iterations):
+    return f"let x = 0\nfor i = 0 to {iterations} then\n    x += i\nend\n"
+
+def lookup_getattr(interpreter, nodes):
+    for node in nodes:
+        getattr(interpreter, f'visit_{type(node).__name__}', interpreter.no_visit_method)
+
+def lookup_dispatch(interpreter, nodes):
+    dispatch = interpreter.dispatch
+    for node in nodes:
+        dispatch[node.__class__]
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+
+    # Every iteration visits the same nodes, so record them once on a short
+    # loop and replay them for the handler lookup on its own
+    small = RecordingInterpreter()
+    small.visit(parse(script(2)), new_context())
+    setup = len(small.visited) - 2 * 3
+    nodes = small.visited[setup:setup + 3] * iterations
+    visits = setup + len(nodes)
+
+    getattr_lookup = measure(lambda: lookup_getattr(GetattrInterpreter(), nodes), 3)
+    dispatch_lookup = measure(lambda: lookup_dispatch(Interpreter(), nodes), 3)
+
+    # The whole loop is dominated by value allocation; alternate the two
+    # interpreters so neither gets a warmer heap
+    ast = parse(script(iterations))
+    getattr_run = dispatch_run = None
+    for _ in range(2):
+        getattr_run = min(filter(None, (getattr_run, measure(lambda: GetattrInterpreter().visit(ast, new_context())))))
+        dispatch_run = min(filter(None, (dispatch_run, measure(lambda: Interpreter().visit(ast, new_context())))))
+
+    report(
+        f"for loop, {iterations} iterations, {visits} node visits",
+        ["visit", "handler lookup", "per node", "whole loop", "per node"],
+        [
+            ["getattr", f"{getattr_lookup:.3f} s", f"{getattr_lookup / len(nodes) * 1e9:.0f} ns", f"{getattr_run:.2f} s", f"{getattr_run / visits * 1e9:.0f} ns"],
+            ["dispatch table", f"{dispatch_lookup:.3f} s", f"{dispatch_lookup / len(nodes) * 1e9:.0f} ns", f"{dispatch_run:.2f} s", f"{dispatch_run / visits * 1e9:.0f} ns"]
+        ]
+    )
+
+if __name__ == "__main__":
+    main()
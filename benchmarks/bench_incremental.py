@@ -0,0 +1,52 @@
+# Latency of small edits to a large generated script kept parsed in a
+# Document, against parsing the whole edited text again, and how many of
+# the edits needed a whole document parse.
+#
+#   python benchmarks/bench_incremental.py [blocks]
+
+import sys
+import time
+from common import report
+from bench_stream import BLOCK
+from src.incremental import Document
+from src.lexer import Lexer
+from src.parser import Parser
+
+def full_parse(text):
+    lexer = Lexer("<bench>", text)
+    tokens, error = lexer.make_tokens()
+    if error: raise Exception(error.as_string())
+    return Parser(tokens).parse()
+
+def main():
+    blocks = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+    text = "".join(BLOCK.format(i=i) for i in range(blocks))
+
+    started = time.perf_counter()
+    document = Document("<bench>", text)
+    load = time.perf_counter() - started
+    if document.error: raise Exception(document.error.as_string())
+
+    # Retype one character in statements spread over the whole script
+    edits = []
+    for i in range(0, blocks, max(1, blocks // 50)):
+        offset = document.text.index(f"total{i} += i") + len(f"total{i} += ")
+        started = time.perf_counter()
+        node, error = document.edit(offset, 1, "i")
+        edits.append(time.perf_counter() - started)
+        if error: raise Exception(error.as_string())
+    edits.sort()
+
+    started = time.perf_counter()
+    full_parse(document.text)
+    full = time.perf_counter() - started
+
+    report(
+        f"{blocks} blocks, {document.text.count(chr(10))} lines",
+        ["load", "edit median", "edit max", "whole parse", "partial parses", "whole parses"],
+        [[f"{load * 1000:.0f} ms", f"{edits[len(edits) // 2] * 1000:.1f} ms", f"{edits[-1] * 1000:.1f} ms",
+          f"{full * 1000:.0f} ms", document.partial_parses, document.full_parses]]
+    )
+
+if __name__ == "__main__":
+    main()
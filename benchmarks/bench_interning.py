@@ -0,0 +1,47 @@
+# Interning hit rate of the lexer on a generated script, how many distinct
+# strs its names and short literals end up as, and what a symbol table
+# lookup costs with an interned name against an equal but separate str.
+#
+#   python benchmarks/bench_interning.py [megabytes]
+
+import sys
+import timeit
+from common import report
+from bench_lexer import script
+from src.lexer import Lexer, InternTable
+from src.symbol_table import SymbolTable
+from src.rt_types import TT_IDENTIFIER, TT_KEYWORD, TT_STRING
+
+def main():
+    megabytes = float(sys.argv[1]) if len(sys.argv) > 1 else 1
+    interned = InternTable()
+    tokens, error = Lexer("<bench>", script(megabytes), interned).make_tokens()
+    if error: raise Exception(error.as_string())
+
+    values = [tok.value for tok in tokens if tok.type in (TT_IDENTIFIER, TT_KEYWORD, TT_STRING)]
+    report(
+        f"{megabytes:g} MB script",
+        ["lookups", "hits", "hit rate", "strs", "distinct strs"],
+        [[interned.lookups, interned.lookups - interned.misses, f"{interned.hit_rate():.1%}", len(values), len({id(value) for value in values})]]
+    )
+
+    names = [tok.value for tok in tokens if tok.type == TT_IDENTIFIER][:1000]
+    copies = ["".join(list(name)) for name in names]
+    symbol_table = SymbolTable()
+    for name in names:
+        symbol_table.set(name, name)
+
+    def lookup(keys):
+        get = symbol_table.get
+        return lambda: [get(key) for key in keys]
+
+    interned_time = min(timeit.repeat(lookup(names), number=200, repeat=5))
+    copied_time = min(timeit.repeat(lookup(copies), number=200, repeat=5))
+    report(
+        "SymbolTable.get, 200k lookups",
+        ["keys", "time"],
+        [["interned", f"{interned_time * 1000:.1f} ms"], ["equal copies", f"{copied_time * 1000:.1f} ms"]]
+    )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+# Lexer throughput in MB/s on a generated multi-megabyte script: the table
+# driven Lexer against the character at a time CharLexer it replaced.
+#
+#   python benchmarks/bench_lexer.py [megabytes]
+
+import sys
+from common import measure, report
+from src.lexer import Lexer
+from char_lexer import CharLexer
+
+BLOCK = """// generated block {i}
+let total{i} = 0
+for i = 0 to {i} step 2 then
+    total{i} += i * 1.5 - (i / 3) ^ 2
+end
+func describe{i}(value, label) => label + ": " + String(value) + "\\n"
+let item{i} = {{name: "item {i}", tags: ['a', 'b'], ok: true, none: null}}
+if total{i} >= 10 and item{i}.ok != false then print(describe{i}(total{i}, "total")); end
+"""
+
+def script(megabytes):
+    blocks = []
+    size = 0
+    i = 0
+    while size < megabytes * 1024 * 1024:
+        block = BLOCK.format(i=i)
+        blocks.append(block)
+        size += len(block)
+        i += 1
+    return "".join(blocks)
+
+def lex(lexer_class, text):
+    tokens, error = lexer_class("<bench>", text).make_tokens()
+    if error: raise Exception(error.as_string())
+    return tokens
+
+def main():
+    megabytes = float(sys.argv[1]) if len(sys.argv) > 1 else 4
+    text = script(megabytes)
+    size = len(text) / (1024 * 1024)
+
+    tokens = lex(Lexer, text)
+    if len(tokens) != len(lex(CharLexer, text)):
+        raise Exception("Lexer and CharLexer disagree on the token stream")
+
+    char_time = measure(lambda: lex(CharLexer, text))
+    table_time = measure(lambda: lex(Lexer, text), 3)
+
+    report(
+        f"{size:.1f} MB, {len(tokens)} tokens",
+        ["lexer", "time", "throughput", "speedup"],
+        [
+            ["CharLexer", f"{char_time:.2f} s", f"{size / char_time:.2f} MB/s", "1.0x"],
+            ["Lexer", f"{table_time:.2f} s", f"{size / table_time:.2f} MB/s", f"{char_time / table_time:.1f}x"]
+        ]
+    )
+
+if __name__ == "__main__":
+    main()
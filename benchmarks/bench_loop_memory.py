@@ -0,0 +1,36 @@
+# Peak memory of a while loop used as a statement, where its value is
+# discarded, against the same loop used as an expression, which has to
+# collect every body value into its result list.
+#
+#   python benchmarks/bench_loop_memory.py [iterations ...]
+
+import sys
+from common import parse, new_context, peak_memory, report
+from src.engine import Engine
+
+def statement(iterations):
+    return f"let n = 0\nwhile n < {iterations} then\n    n += 1\nend\n"
+
+def expression(iterations):
+    return f"let n = 0\nlet r = while n < {iterations} then n += 1\n"
+
+def run(ast, use_vm):
+    engine = Engine(use_vm)
+    result = engine.execute(ast, new_context(engine))
+    if result.error: raise Exception(result.error.as_string())
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10000, 100000]
+
+    rows = []
+    for iterations in sizes:
+        for name, make in (("statement", statement), ("expression", expression)):
+            ast = parse(make(iterations))
+            for engine, use_vm in (("walker", False), ("vm", True)):
+                peak = peak_memory(lambda: run(ast, use_vm))
+                rows.append([iterations, name, engine, f"{peak / 1024:.0f} KiB", f"{peak / iterations:.1f} B"])
+
+    report("while loop peak memory", ["iterations", "loop used as", "engine", "peak", "per iteration"], rows)
+
+if __name__ == "__main__":
+    main()
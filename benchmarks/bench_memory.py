@@ -0,0 +1,70 @@
+# Memory held by the front end and by runtime values: bytes per token
+# after lexing, per AST node after parsing, and per Number / String.
+#
+#   python benchmarks/bench_memory.py [lines]
+
+import gc
+import sys
+import tracemalloc
+from common import report
+from src.lexer import Lexer
+from src.parser import Parser
+from src.types import Number, String
+import src.nodes as nodes
+
+def script(lines):
+    return "".join(
+        f'let value{i} = compute(item{i}, "text {i}") + {i} * 2\n'
+        for i in range(lines)
+    )
+
+def allocated(func):
+    # Bytes still allocated once func returns, with its result kept alive
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = func()
+        gc.collect()
+        return result, tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+def count_nodes(node):
+    count = 0
+    stack = [node]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, (list, tuple)):
+            stack.extend(value)
+        elif type(value).__module__ == nodes.__name__:
+            count += 1
+            stack.extend(getattr(value, name) for name in value.__slots__)
+    return count
+
+def main():
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    text = script(lines)
+
+    tokens, token_bytes = allocated(lambda: Lexer("<bench>", text).make_tokens()[0])
+    ast, node_bytes = allocated(lambda: Parser(tokens).parse().node)
+    node_count = count_nodes(ast)
+
+    numbers, number_bytes = allocated(lambda: [Number(i * 1.5) for i in range(lines)])
+    strings, string_bytes = allocated(lambda: [String(f"text {i}") for i in range(lines)])
+
+    # The lists holding the values are not what is being measured
+    list_bytes = sys.getsizeof(numbers)
+
+    report(
+        f"{lines} lines, {len(tokens)} tokens, {node_count} nodes",
+        ["object", "count", "total", "per object"],
+        [
+            ["token", len(tokens), f"{token_bytes / 1024:.0f} KiB", f"{token_bytes / len(tokens):.0f} B"],
+            ["AST node", node_count, f"{node_bytes / 1024:.0f} KiB", f"{node_bytes / node_count:.0f} B"],
+            ["Number", lines, f"{number_bytes / 1024:.0f} KiB", f"{(number_bytes - list_bytes) / lines:.0f} B"],
+            ["String", lines, f"{string_bytes / 1024:.0f} KiB", f"{(string_bytes - list_bytes) / lines:.0f} B"]
+        ]
+    )
+
+if __name__ == "__main__":
+    main()
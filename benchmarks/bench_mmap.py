@@ -0,0 +1,73 @@
+# Peak RSS of lexing a large generated config table, read into a str as
+# before against mapped with read_source. Each run streams the tokens
+# without keeping them, in a fresh process, so the peak shown is what
+# holding the source costs on top of the interpreter itself.
+#
+#   python benchmarks/bench_mmap.py [megabytes]
+
+import os
+import sys
+import subprocess
+import tempfile
+from common import report
+
+ROW = 'let entry{i} = {{id: {i}, name: "entry {i}", weight: {i}.25, tags: ["a", "b"]}}\n'
+
+RUN = """
+import resource, sys
+sys.path.insert(0, {root!r})
+from src.lexer import Lexer
+from src.position import read_source
+
+def rss():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+before = rss()
+if {mapped}:
+    text = read_source({path!r})
+else:
+    with open({path!r}, "r") as f:
+        text = f.read()
+lexer = Lexer({path!r}, text)
+count = sum(1 for tok in lexer.stream())
+if lexer.error: raise Exception(lexer.error.as_string())
+print(count, rss() - before)
+"""
+
+def generate(path, megabytes):
+    size = 0
+    i = 0
+    with open(path, "w") as f:
+        while size < megabytes * 1024 * 1024:
+            row = ROW.format(i=i)
+            f.write(row)
+            size += len(row)
+            i += 1
+
+def run(path, mapped):
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    code = RUN.format(root=root, path=path, mapped=mapped)
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    count, peak = output.split()
+    return int(count), int(peak)
+
+def main():
+    megabytes = float(sys.argv[1]) if len(sys.argv) > 1 else 32
+
+    fd, path = tempfile.mkstemp(suffix=".bp")
+    os.close(fd)
+    try:
+        generate(path, megabytes)
+        size = os.path.getsize(path)
+
+        rows = []
+        for name, mapped in (("open().read()", False), ("read_source", True)):
+            count, peak = run(path, mapped)
+            rows.append([name, count, f"{peak / 1024 / 1024:.0f} MiB", f"{peak / size:.2f}x"])
+    finally:
+        os.remove(path)
+
+    report(f"{size / 1024 / 1024:.0f} MiB source, peak RSS above start", ["read with", "tokens", "peak", "of file size"], rows)
+
+if __name__ == "__main__":
+    main()
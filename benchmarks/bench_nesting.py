@@ -0,0 +1,57 @@
+# Parse time per token of generated scripts as they grow in depth and in
+# length: nested if/for blocks around object literals, and long member
+# chains read and assigned to. Time per token staying flat down a column
+# is what linear scaling looks like; the stream rows also count how often
+# the TokenStream had to lex from the start again to step back.
+#
+#   python benchmarks/bench_nesting.py
+
+import time
+from common import report
+from src.lexer import Lexer, TokenStream
+from src.parser import Parser
+
+def nested(depth):
+    # One block of if/for levels, depth deep, with an object literal as
+    # deeply nested at the bottom
+    lines = []
+    for level in range(depth):
+        indent = "    " * level
+        lines.append(f"{indent}if a{level} > 0 then" if level % 2 == 0 else f"{indent}for i{level} = 0 to 3 then")
+    value = "1"
+    for level in range(depth):
+        value = f"{{k{level}: {value}, n: [a{level}, i]}}"
+    lines.append("    " * depth + f"let item = {value}")
+    for level in reversed(range(depth)):
+        lines.append("    " * level + "end")
+    return "\n".join(lines) + "\n"
+
+def chain(length):
+    path = "".join(f".k{i}" for i in range(length))
+    return f"a{path}\na{path} = 1\n"
+
+def parse(text, stream):
+    lexer = Lexer("<bench>", text)
+    tokens = TokenStream(lexer) if stream else lexer.make_tokens()[0]
+    started = time.perf_counter()
+    ast = Parser(tokens).parse()
+    elapsed = time.perf_counter() - started
+    if ast.error: raise Exception(ast.error.as_string())
+    return elapsed, tokens.restarts if stream else 0
+
+def main():
+    # Every level of nesting takes a few Python frames, so the depths stay
+    # well inside the default recursion limit
+    rows = []
+    for name, make, sizes, repeat in (("nested blocks", nested, (5, 10, 20, 40), 50), ("member chain", chain, (50, 100, 200, 400), 20)):
+        for size in sizes:
+            text = make(size) * repeat
+            count = len(Lexer("<bench>", text).make_tokens()[0])
+            for stream in (False, True):
+                elapsed, restarts = parse(text, stream)
+                rows.append([name, size, "stream" if stream else "list", count, f"{elapsed * 1000:.1f} ms", f"{elapsed / count * 1e6:.2f} us", restarts])
+
+    report("parse time by depth and chain length", ["script", "size", "tokens from", "tokens", "parse", "per token", "restarts"], rows)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+# Parse throughput on generated scripts that are almost all expressions,
+# one with operators between literals and one mixing names, calls and
+# member access, so the cost per operand and per operator shows.
+#
+#   python benchmarks/bench_parser.py [lines]
+
+import sys
+import timeit
+from common import report
+from src.lexer import Lexer
+from src.parser import Parser
+
+SCRIPTS = {
+    "arithmetic": "x{i} + 1 * 2 - 3 / 4 + 5 ^ 2 - (6 + 7) * 8 == 9 and 10 < 11\n",
+    "mixed": "let v{i} = a{i} * 2 + {i} - (b / 3) ^ -2 >= c.d and not e == 1.5 or f(x, {i}) < 7\n",
+}
+
+def main():
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+
+    rows = []
+    for name, line in SCRIPTS.items():
+        lexer = Lexer("<bench>", "".join(line.format(i=i) for i in range(lines)))
+        tokens, error = lexer.make_tokens()
+        if error: raise Exception(error.as_string())
+
+        def parse():
+            ast = Parser(tokens).parse()
+            if ast.error: raise Exception(ast.error.as_string())
+
+        elapsed = min(timeit.repeat(parse, number=1, repeat=5))
+        rows.append([name, len(tokens), f"{elapsed * 1000:.0f} ms", f"{len(tokens) / elapsed / 1000:.0f}k"])
+
+    report(f"{lines} lines", ["script", "tokens", "parse", "tokens/s"], rows)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+# Cost of a call to a script function in recursive programs, fib and
+# ackermann, on the tree walker and on the VM. Almost all of their time is
+# spent entering and leaving calls: checking and binding the arguments and
+# making the frame the body runs in.
+#
+#   python benchmarks/bench_recursion.py [fib n] [ackermann n]
+
+import sys
+from common import parse, new_context, measure, report
+from src.engine import Engine
+
+FIB = """func fib(n)
+    if n < 2 then
+        return n
+    end
+    return fib(n - 1) + fib(n - 2)
+end
+fib({n})
+"""
+
+ACKERMANN = """func ack(m, n)
+    if m == 0 then
+        return n + 1
+    end
+    if n == 0 then
+        return ack(m - 1, 1)
+    end
+    return ack(m - 1, ack(m, n - 1))
+end
+ack(2, {n})
+"""
+
+def fib_calls(n):
+    a, b = 1, 1
+    for _ in range(n):
+        a, b = b, a + b + 1
+    return a
+
+def ackermann_calls(m, n):
+    # Counted the way the script makes them, without recursing as deep
+    calls = 0
+    stack = [m]
+    while stack:
+        m = stack.pop()
+        calls += 1
+        if m == 0:
+            n += 1
+        elif n == 0:
+            n = 1
+            stack.append(m - 1)
+        else:
+            n -= 1
+            stack.append(m - 1)
+            stack.append(m)
+    return calls
+
+def main():
+    fib_n = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    ack_n = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    rows = []
+    for name, text, calls in (("fib", FIB.format(n=fib_n), fib_calls(fib_n)), ("ackermann", ACKERMANN.format(n=ack_n), ackermann_calls(2, ack_n))):
+        ast = parse(text)
+        for use_vm in (False, True):
+            engine = Engine(use_vm)
+            elapsed = measure(lambda: engine.execute(ast, new_context(engine)), 3)
+            rows.append([name, "vm" if use_vm else "walk", calls, f"{elapsed:.2f} s", f"{elapsed / calls * 1e9:.0f} ns"])
+
+    report(f"fib({fib_n}), ack(2, {ack_n})", ["program", "engine", "calls", "time", "per call"], rows)
+
+if __name__ == "__main__":
+    main()
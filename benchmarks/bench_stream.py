@@ -0,0 +1,57 @@
+# Peak memory of parsing a generated script from a full token list against
+# parsing it from a TokenStream. The tree itself grows with the file either
+# way, so the interesting column is the memory needed on top of it.
+#
+#   python benchmarks/bench_stream.py [blocks ...]
+
+import sys
+import tracemalloc
+from common import report
+from src.lexer import Lexer, TokenStream
+from src.parser import Parser
+
+BLOCK = """let total{i} = 0
+for i = 0 to {i} then
+    if i / 2 == 0 then
+        let item{i} = [i, i * 2, {{value: i}}]
+        total{i} += i
+    end
+end
+func describe{i}(value) => "total: " + String(value)
+"""
+
+def from_list(text):
+    lexer = Lexer("<bench>", text)
+    tokens, error = lexer.make_tokens()
+    if error: raise Exception(error.as_string())
+    return Parser(tokens).parse(), None
+
+def from_stream(text):
+    tokens = TokenStream(Lexer("<bench>", text))
+    return Parser(tokens).parse(), tokens
+
+def measure(parse, text, statements):
+    tracemalloc.start()
+    try:
+        ast, tokens = parse(text)
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    if ast.error: raise Exception(ast.error.as_string())
+    if len(ast.node.element_nodes) != statements: raise Exception("Parse stopped early")
+    return peak, peak - current, tokens.restarts if tokens else 0
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [100, 1000, 10000]
+
+    rows = []
+    for blocks in sizes:
+        text = "".join(BLOCK.format(i=i) for i in range(blocks))
+        for name, parse in (("list", from_list), ("stream", from_stream)):
+            peak, overhead, restarts = measure(parse, text, 3 * blocks)
+            rows.append([blocks, f"{len(text) / 1024:.0f} KiB", name, f"{peak / 1024:.0f} KiB", f"{overhead / 1024:.0f} KiB", restarts])
+
+    report("parse peak memory", ["blocks", "source", "tokens", "peak", "beyond the tree", "restarts"], rows)
+
+if __name__ == "__main__":
+    main()
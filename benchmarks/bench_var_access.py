@@ -0,0 +1,59 @@
+# Cost of reading variables in a loop: the values created per iteration
+# and the time per read, when a read returns the stored value against a
+# copy of it. The loop reads a string, a list and an object, whose copies
+# each ran their constructor again.
+#
+#   python benchmarks/bench_var_access.py [iterations]
+
+import sys
+from common import parse, new_context, measure, report
+from src.interpreter import Interpreter
+from src.types import Type
+import src.types as types
+
+READS = 6
+
+class CopyingInterpreter(Interpreter):
+    def visit_VarAccessNode(self, node, context, bin_op_right=False):
+        value = super().visit_VarAccessNode(node, context, bin_op_right)
+        return value if bin_op_right else value.copy()
+
+def script(iterations, reads):
+    body = "".join(f"    let v = {name}\n" for name in ("s", "l", "o")[:reads] * 2) or "    continue\n"
+    return f'let s = "text"\nlet l = [1, 2, 3]\nlet o = {{a: 1}}\nfor i = 0 to {iterations} then\n{body}end\n'
+
+def count_values(interpreter, ast):
+    # Every value runs Type.__init__ once, so counting its calls counts them
+    created = 0
+    init = Type.__init__
+
+    def counting_init(self):
+        nonlocal created
+        created += 1
+        init(self)
+
+    types.Type.__init__ = counting_init
+    try:
+        interpreter.visit(ast, new_context())
+    finally:
+        types.Type.__init__ = init
+    return created
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+
+    # The same loop body without reads is the baseline the reads add to
+    with_reads = parse(script(iterations, 3))
+    without_reads = parse(script(iterations, 0))
+
+    rows = []
+    for name, interpreter in (("copy", CopyingInterpreter()), ("stored value", Interpreter())):
+        values = (count_values(interpreter, with_reads) - count_values(interpreter, without_reads)) / iterations
+        elapsed = measure(lambda: interpreter.visit(with_reads, new_context()), 3)
+        baseline = measure(lambda: interpreter.visit(without_reads, new_context()), 3)
+        rows.append([name, f"{values / READS:.1f}", f"{elapsed:.2f} s", f"{(elapsed - baseline) / (iterations * READS) * 1e9:.0f} ns"])
+
+    report(f"{READS} variable reads per iteration, {iterations} iterations", ["read returns", "values per read", "loop", "per read"], rows)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+# The original character at a time lexer, which the table driven Lexer in
+# src/lexer.py replaced. It is kept out of the interpreter, as only the
+# lexer benchmark and the tests that hold Lexer to it use it
+
+from src.token import Token
+from src.position import Source
+from src.rt_types import *
+from src.errors import IllegalCharError, ExpectedCharError
+
+class CharLexer:
+    # The reference the table driven Lexer has to match token for token
+    def __init__(self, fn, text):
+        self.fn = fn
+        self.text = text
+        self.source = Source(fn, text)
+        self.pos = self.source.base - 1
+        self.current_char = None
+        self.advance()
+
+    def advance(self):
+        self.pos += 1
+        idx = self.pos - self.source.base
+        self.current_char = self.text[idx] if idx < len(self.text) else None
+
+    def make_tokens(self):
+        tokens = []
+
+        while self.current_char != None:
+            if self.current_char in char_spaces:
+                self.advance()
+            elif self.current_char in char_new_lines:
+                tokens.append(Token(TT_NEWLINE, pos_start=self.pos))
+                self.advance()
+            elif self.current_char in DIGITS:
+                tokens.append(self.make_number())
+            elif self.current_char in LETTERS:
+                tokens.append(self.make_identifier())
+            elif self.current_char in ('"', "'"):
+                tokens.append(self.make_string())
+            elif self.current_char == "+":
+                tokens.append(self.make_plus())
+            elif self.current_char == "-":
+                tokens.append(self.make_minus())
+            elif self.current_char == "*":
+                tokens.append(Token(TT_MUL, pos_start=self.pos))
+                self.advance()
+            elif self.current_char == "/":
+                token, error = self.make_slash()
+                if error: return [], error
+                if token != None:
+                    tokens.append(token)
+            elif self.current_char == "^":
+                tokens.append(Token(TT_POW, pos_start=self.pos))
+                self.advance()
+            elif self.current_char == "(":
+                tokens.append(Token(TT_LPAREN, pos_start=self.pos))
+                self.advance()
+            elif self.current_char == ")":
+                tokens.append(Token(TT_RPAREN, pos_start=self.pos))
+                self.advance()
+            elif self.current_char == "[":
+                tokens.append(Token(TT_LSQUARE, pos_start=self.pos))
+                self.advance()
+            elif self.current_char == "]":
+                tokens.append(Token(TT_RSQUARE, pos_start=self.pos))
+                self.advance()
+            elif self.current_char == "{":
+                tokens.append(Token(TT_LCURLY, pos_start=self.pos))
+                self.advance()
+            elif self.current_char == "}":
+                tokens.append(Token(TT_RCURLY, pos_start=self.pos))
+                self.advance()
+            elif self.current_char == ":":
+                tokens.append(Token(TT_COLON, pos_start=self.pos))
+                self.advance()
+            elif self.current_char == ".":
+                tokens.append(Token(TT_DOT, pos_start=self.pos))
+                self.advance()
+            elif self.current_char == "?":
+                tokens.append(Token(TT_QM, pos_start=self.pos))
+                self.advance()
+            elif self.current_char == "!":
+                tok, error = self.make_not_equals()
+                if error: return [], error
+                tokens.append(tok)
+            elif self.current_char == "=":
+                tokens.append(self.make_equals())
+            elif self.current_char == "<":
+                tokens.append(self.make_less_than())
+            elif self.current_char == ">":
+                tokens.append(self.make_greater_than())
+            elif self.current_char == ",":
+                tokens.append(Token(TT_COMMA, pos_start=self.pos))
+                self.advance()
+            else:
+                pos_start = self.pos
+                char = self.current_char
+                self.advance()
+                return [], IllegalCharError(pos_start, self.pos, "'" + char + "'")
+        
+        tokens.append(Token(TT_EOF, pos_start=self.pos))
+        return tokens, None
+    
+    def skip_comment(self):  
+        self.advance()
+
+        while self.current_char != '\n' and self.current_char != None:
+            self.advance()
+        self.advance()
+
+    def make_slash(self):
+        pos_start = self.pos
+
+        self.advance()
+
+        if self.current_char == "/":
+            self.skip_comment()
+            return None, None
+        
+        return Token(TT_DIV, pos_start=pos_start), None
+
+    def make_number(self):
+        num_str = ''
+        dot_count = 0
+        pos_start = self.pos
+
+        while self.current_char != None and self.current_char in DIGITS + '.':
+            if self.current_char == '.':
+                if dot_count == 1: break
+                dot_count += 1
+                num_str += "."
+            else:
+                num_str += self.current_char
+            self.advance()
+
+        if dot_count == 0:
+            return Token(TT_INT, int(num_str), pos_start, self.pos)
+        else:
+            return Token(TT_FLOAT, float(num_str), pos_start, self.pos)
+
+    def make_string(self):
+        string = ''
+        pos_start = self.pos
+        escape_character = False
+
+        started_quote = self.current_char
+
+        self.advance()
+
+        while self.current_char != None and (self.current_char != started_quote or escape_character):
+            if escape_character:
+                string += escape_characters.get(self.current_char, self.current_char)
+                escape_character = False
+            else:
+                if self.current_char == "\\":
+                    escape_character = True
+                else:
+                    string += self.current_char
+            self.advance()
+
+        self.advance()
+
+        return Token(TT_STRING, string, pos_start, self.pos)
+
+    def make_identifier(self):
+        id_str = ''
+        pos_start = self.pos
+
+        while self.current_char != None and self.current_char in LETTERS_DIGITS + '_':
+            id_str += self.current_char
+            self.advance()
+
+        tok_type = TT_KEYWORD if id_str in KEYWORDS_LIST else TT_IDENTIFIER
+        return Token(tok_type, id_str, pos_start, self.pos)
+
+    def make_not_equals(self):
+        pos_start = self.pos
+        self.advance()
+
+        if self.current_char == "=":
+            self.advance()
+            return Token(TT_NE, pos_start=pos_start, pos_end=self.pos), None
+        
+        self.advance()
+        return None, ExpectedCharError(pos_start, self.pos, "'=' (after '!')")
+
+    def make_equals(self):
+        tok_type = TT_EQ
+        pos_start = self.pos
+        self.advance()
+
+        if self.current_char == "=":
+            self.advance()
+            tok_type = TT_EE
+        elif self.current_char == ">":
+            self.advance()
+            tok_type = TT_ARROW
+
+
+        return Token(tok_type, pos_start=pos_start, pos_end=self.pos)
+
+    def make_less_than(self):
+        tok_type = TT_LT
+        pos_start = self.pos
+        self.advance()
+
+        if self.current_char == "=":
+            self.advance()
+            tok_type = TT_LTE
+
+        return Token(tok_type, pos_start=pos_start, pos_end=self.pos)
+
+    def make_greater_than(self):
+        tok_type = TT_GT
+        pos_start = self.pos
+        self.advance()
+
+        if self.current_char == "=":
+            self.advance()
+            tok_type = TT_GTE
+
+        return Token(tok_type, pos_start=pos_start, pos_end=self.pos)
+
+    def make_plus(self):
+        tok_type = TT_PLUS
+        pos_start = self.pos
+        self.advance()
+
+        if self.current_char == "=":
+            self.advance()
+            tok_type = TT_PE
+
+        return Token(tok_type, pos_start=pos_start, pos_end=self.pos)
+    
+    def make_minus(self):
+        tok_type = TT_MINUS
+        pos_start = self.pos
+        self.advance()
+
+        if self.current_char == "=":
+            self.advance()
+            tok_type = TT_ME
+
+        return Token(tok_type, pos_start=pos_start, pos_end=self.pos)
\ No newline at end of file
@@ -0,0 +1,60 @@
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.lexer import Lexer
+from src.parser import Parser
+from src.resolver import Resolver
+from src.errors import Context
+from src.engine import Engine
+from src.symbol_table import SymbolTable
+import src.built_in as built_in
+
+def parse(text, fn="<bench>"):
+    # The lexer holds the source the parser's errors point into
+    lexer = Lexer(fn, text)
+    tokens, error = lexer.make_tokens()
+    if error: raise Exception(error.as_string())
+
+    ast = Parser(tokens).parse()
+    if ast.error: raise Exception(ast.error.as_string())
+
+    return Resolver().resolve(ast.node)
+
+def new_context(engine=None):
+    context = Context("<program>", engine=engine or Engine())
+    context.symbol_table = SymbolTable()
+    built_in.register_var(context.symbol_table)
+    return context
+
+def measure(func, repeat=1):
+    best = None
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        if best == None or elapsed < best:
+            best = elapsed
+    return best
+
+def peak_memory(func):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def report(title, header, rows):
+    widths = [max(len(str(row[i])) for row in [header] + rows) for i in range(len(header))]
+    print(title)
+    print("  ".join(str(cell).ljust(width) for cell, width in zip(header, widths)))
+    for row in rows:
+        print("  ".join(str(cell).ljust(width) for cell, width in zip(row, widths)))
+    print()
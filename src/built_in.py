@@ -1,95 +1,89 @@
-from src.types import BaseFunction, Number, String, Null, Boolean, List, Object
+from src.types import BaseFunction, Signature, Number, String, Null, Boolean, List, Object, null, boolean, number
 import math
-from src.results import RTResult
 import os
-from src.errors import RTError
+import sys
+from src.errors import RTError, Context
+from src.symbol_table import Scope, Frame
+from src.position import read_text
 from src.rt_types import LETTERS_DIGITS, DIGITS
 
 class BuiltInFunction(BaseFunction):
+    __slots__ = ('this',)
+
     def __init__(self, name, this=None):
         super().__init__(name)
         self.this = this
 
-    def execute(self, args):
-        res = RTResult()
-        exec_ctx = self.generate_new_context()
-
-        method_name = f"execute_{self.name}"
-        method = getattr(self, method_name, self.no_visit_method)
-        res.register(self.check_and_populate_args(method.arg_names, args, exec_ctx))
-        if res.should_return(): return res
-
-        return_value = res.register(method(exec_ctx))
-        if res.should_return(): return res
-
-        return res.success(return_value)
+    def execute(self, args, context, pos_start, pos_end):
+        # Its arguments are all a built-in keeps, so like a script function
+        # it gets a frame with a slot for each instead of a symbol table
+        method, signature, scope = BuiltInFunction.methods[self.name]
+        exec_ctx = Context(self.name, context, pos_start, parent_entry_end=pos_end)
+        exec_ctx.symbol_table = Frame(scope, context.symbol_table)
+        self.check_and_populate_args(signature, args, exec_ctx, context, pos_start, pos_end)
 
-    def no_visit_method(self, node, context):
-        raise Exception(f"No execute_{self.name} method define")
+        return method(self, exec_ctx)
 
     def copy(self):
-        copy = BuiltInFunction(self.name, self.this)
-        copy.set_context(self.context)
-        copy.set_pos(self.pos_start, self.pos_end)
-        return copy
+        return BuiltInFunction(self.name, self.this)
 
     def __repr__(self):
         return f"<built-in function {self.name}>"
 
     def execute_print(self, exec_ctx):
         print(str(exec_ctx.symbol_table.get("value")))
-        return RTResult().success(Null())
+        return null
     execute_print.arg_names = [("value", False)]
     
     def execute_input(self, exec_ctx):
         text = input(str(exec_ctx.symbol_table.get("value")))
         if text == None: text = ""
-        return RTResult().success(String(text))
+        return String(text)
     execute_input.arg_names = [("value", True)]
     
     def execute_input_int(self, exec_ctx):
         text = input(str(exec_ctx.symbol_table.get("value")))
         if isinstance(text, Null) : text = "0"
         try:
-            number = int(text)
+            value = int(text)
         except ValueError:
-            return RTResult().success(Null())
-        return RTResult().success(Number(number))
+            return null
+        return number(value)
     execute_input_int.arg_names = [("value", True)]
 
     def execute_clear(self, exec_ctx):
         os.system("cls" if os.name == "nt" else 'clear')
-        return RTResult().success(Null())
+        return null
     execute_clear.arg_names = []
 
     def execute_is_number(self, exec_ctx):
         is_number = isinstance(exec_ctx.symbol_table.get("value"), Number)
-        return RTResult().success(Boolean(is_number))
+        return boolean(is_number)
     execute_is_number.arg_names = [("value", False)]
 
     def execute_is_string(self, exec_ctx):
         is_string = isinstance(exec_ctx.symbol_table.get("value"), String)
-        return RTResult().success(Boolean(is_string))
+        return boolean(is_string)
     execute_is_string.arg_names = [("value", False)]
 
     def execute_is_boolean(self, exec_ctx):
         is_boolean = isinstance(exec_ctx.symbol_table.get("value"), Boolean)
-        return RTResult().success(Boolean(is_boolean))
+        return boolean(is_boolean)
     execute_is_boolean.arg_names = [("value", False)]
 
     def execute_is_null(self, exec_ctx):
         is_null = isinstance(exec_ctx.symbol_table.get("value"), Null)
-        return RTResult().success(Boolean(is_null))
+        return boolean(is_null)
     execute_is_null.arg_names = [("value", False)]
 
     def execute_is_list(self, exec_ctx):
         is_list = isinstance(exec_ctx.symbol_table.get("value"), List)
-        return RTResult().success(Boolean(is_list))
+        return boolean(is_list)
     execute_is_list.arg_names = [("value", False)]
 
     def execute_is_function(self, exec_ctx):
         is_function = isinstance(exec_ctx.symbol_table.get("value"), BaseFunction)
-        return RTResult().success(Boolean(is_function))
+        return boolean(is_function)
     execute_is_function.arg_names = [("value", False)]
 
     def execute_append(self, exec_ctx):
@@ -97,30 +91,30 @@ class BuiltInFunction(BaseFunction):
         value = exec_ctx.symbol_table.get("value")
 
         list_.elements.append(value)
-        return RTResult().success(Null())
+        return null
     execute_append.arg_names = [("value", False)]
 
     def execute_pop(self, exec_ctx):
         list_ = self.this
         index = exec_ctx.symbol_table.get("index")
-        if isinstance(index, Null): index = Number(len(list_.elements)-1)
+        if isinstance(index, Null): index = number(len(list_.elements)-1)
 
         if not isinstance(index, Number):
-            return RTResult().failure(RTError(
-                self.pos_start, self.pos_end,
+            raise RTError(
+                exec_ctx.parent_entry_pos, exec_ctx.parent_entry_end,
                 "First argument must be number",
                 exec_ctx
-            ))
+            )
 
         try:
             element = list_.elements.pop(index.value)
         except:
-            return RTResult().failure(RTError(
-                self.pos_start, self.pos_end,
+            raise RTError(
+                exec_ctx.parent_entry_pos, exec_ctx.parent_entry_end,
                 "Element at this index could not be removed from list because index is out of bounds",
                 exec_ctx
-            ))
-        return RTResult().success(element)
+            )
+        return element
     execute_pop.arg_names = [("index", True)]
 
     def execute_extend(self, exec_ctx):
@@ -128,14 +122,14 @@ class BuiltInFunction(BaseFunction):
         listB = exec_ctx.symbol_table.get("list")
 
         if not isinstance(listB, List):
-            return RTResult().failure(RTError(
-                self.pos_start, self.pos_end,
+            raise RTError(
+                exec_ctx.parent_entry_pos, exec_ctx.parent_entry_end,
                 "First argument must be list",
                 exec_ctx
-            ))
+            )
 
         listA.elements.extend(listB.elements)
-        return RTResult().success(Null())
+        return null
     execute_extend.arg_names = [("list", False)]
 
     def execute_len(self, exec_ctx):
@@ -148,72 +142,70 @@ class BuiltInFunction(BaseFunction):
         elif isinstance(value, String):
             leng = len(value.value)
         else:
-            return RTResult().failure(RTError(
-                self.pos_start, self.pos_end,
+            raise RTError(
+                exec_ctx.parent_entry_pos, exec_ctx.parent_entry_end,
                 "Argument must be list or string",
                 exec_ctx
-            ))
+            )
 
-        return RTResult().success(Number(leng))
+        return number(leng)
     execute_len.arg_names = [("value", False)]
 
     def execute_String(self, exec_ctx):
         value = exec_ctx.symbol_table.get("value")
-        return RTResult().success(String(str(value)))
+        return String(str(value))
     execute_String.arg_names = [("value", False)]
     
     def execute_Number(self, exec_ctx):
         value = exec_ctx.symbol_table.get("value")
         if isinstance(value, String):
             try:
-                value = Number(int(value.value))
+                value = number(int(value.value))
             except:
-                return RTResult().failure(RTError(
-                    self.pos_start, self.pos_end,
+                raise RTError(
+                    exec_ctx.parent_entry_pos, exec_ctx.parent_entry_end,
                     "A string argument must contain at least one number",
                     exec_ctx
-                ))
+                )
         elif isinstance(value, Boolean):
             if value.value == True:
-                value = Number(1)
+                value = number(1)
             else:
-                value = Number(0)
+                value = number(0)
         else:
-            return RTResult().failure(RTError(
-                self.pos_start, self.pos_end,
+            raise RTError(
+                exec_ctx.parent_entry_pos, exec_ctx.parent_entry_end,
                 "The argument must be a string or boolean",
                 exec_ctx
-            ))
+            )
 
-        return RTResult().success(value)
+        return value
     execute_Number.arg_names = [("value", False)]
     
     def execute_Boolean(self, exec_ctx):
         value = exec_ctx.symbol_table.get("value")
         if isinstance(value, String):
-            value = Boolean("true" in value.value.lower())
+            value = boolean("true" in value.value.lower())
         elif isinstance(value, Number):
-           value = Boolean(1 == value.value)
+           value = boolean(1 == value.value)
         else:
-            return RTResult().failure(RTError(
-                self.pos_start, self.pos_end,
+            raise RTError(
+                exec_ctx.parent_entry_pos, exec_ctx.parent_entry_end,
                 "The argument must be a string or number",
                 exec_ctx
-            ))
+            )
 
-        return RTResult().success(value)
+        return value
     execute_Boolean.arg_names = [("value", False)]
 
     def execute_toLowerCase(self, exec_ctx):
         string = self.this
-        string.value = string.value.lower()
-        return RTResult().success(string)
+        return String(string.value.lower())
     execute_toLowerCase.arg_names = []        
     
     def execute_toUpperCase(self, exec_ctx):
         string = self.this
-        string.value = string.value.upper()
-        return RTResult().success(string)
+        return String(string.value.upper())
     execute_toUpperCase.arg_names = []        
     
     def execute_replace(self, exec_ctx):
@@ -222,88 +214,86 @@ class BuiltInFunction(BaseFunction):
         replace = exec_ctx.symbol_table.get("replace")
 
         if not isinstance(find, String) or not isinstance(replace, String):
-            return RTResult().failure(RTError(
-                self.pos_start, self.pos_end,
+            raise RTError(
+                exec_ctx.parent_entry_pos, exec_ctx.parent_entry_end,
                 "All arguments must be a string",
                 exec_ctx
-            ))
+            )
 
-        string.value = string.value.replace(find.value, replace.value)
-        return RTResult().success(string)
+        return String(string.value.replace(find.value, replace.value))
     execute_replace.arg_names = [("find", False), ("replace", False)]
 
     def execute_startsWith(self, exec_ctx):
         string = self.this
         char = exec_ctx.symbol_table.get("characters")
         if not isinstance(char, String):
-            return RTResult().failure(RTError(
-                self.pos_start, self.pos_end,
+            raise RTError(
+                exec_ctx.parent_entry_pos, exec_ctx.parent_entry_end,
                 "First argument must be a string",
                 exec_ctx
-            ))
-        return RTResult().success(Boolean(string.value.startswith(char.value)))
+            )
+        return boolean(string.value.startswith(char.value))
     execute_startsWith.arg_names = [("characters", False)]
     
     def execute_endsWith(self, exec_ctx):
         string = self.this
         char = exec_ctx.symbol_table.get("characters")
         if not isinstance(char, String):
-            return RTResult().failure(RTError(
-                self.pos_start, self.pos_end,
+            raise RTError(
+                exec_ctx.parent_entry_pos, exec_ctx.parent_entry_end,
                 "First argument must be a string",
                 exec_ctx
-            ))
-        return RTResult().success(Boolean(string.value.endswith(char.value)))
+            )
+        return boolean(string.value.endswith(char.value))
     execute_endsWith.arg_names = [("characters", False)]
 
     def execute_indexOf(self, exec_ctx):
         string = self.this
         find = exec_ctx.symbol_table.get("find")
         if not isinstance(find, String):
-            return RTResult().failure(RTError(
-                self.pos_start, self.pos_end,
+            raise RTError(
+                exec_ctx.parent_entry_pos, exec_ctx.parent_entry_end,
                 "First argument must be a string",
                 exec_ctx
-            ))
-        return RTResult().success(Number(string.value.find(find.value)))
+            )
+        return number(string.value.find(find.value))
     execute_indexOf.arg_names = [("find", False)]
 
     def execute_isAllNum(self, exec_ctx):
         string = self.this
-        return RTResult().success(Boolean(string.value.isnumeric()))
+        return boolean(string.value.isnumeric())
     execute_isAllNum.arg_names = []
 
     def execute_isAllAlpha(self, exec_ctx):
         string = self.this
-        return RTResult().success(Boolean(string.value.isalpha()))
+        return boolean(string.value.isalpha())
     execute_isAllAlpha.arg_names = []
 
     def execute_isSpace(self, exec_ctx):
         string = self.this
-        return RTResult().success(Boolean(string.value.isspace()))
+        return boolean(string.value.isspace())
     execute_isSpace.arg_names = []
 
     def execute_split(self, exec_ctx):
         string = self.this
         char = exec_ctx.symbol_table.get("character")
         if not isinstance(char, String):
-            return RTResult().failure(RTError(
-                self.pos_start, self.pos_end,
+            raise RTError(
+                exec_ctx.parent_entry_pos, exec_ctx.parent_entry_end,
                 "First argument must be a string",
                 exec_ctx
-            ))
+            )
 
         elements = []
         for part in string.value.split(char.value):
             elements.append(String(part))
 
-        return RTResult().success(List(elements))
+        return List(elements)
     execute_split.arg_names = [("character", False)]
 
     def execute_trim(self, exec_ctx):
         string = self.this
-        string.value = string.value.strip()
-        return RTResult().success(string)
+        return String(string.value.strip())
     execute_trim.arg_names = []
 
     def execute_sub(self, exec_ctx):
@@ -312,28 +302,27 @@ class BuiltInFunction(BaseFunction):
         count = exec_ctx.symbol_table.get("count")
         
         if not isinstance(pos, Number) or not isinstance(count, Number):
-            return RTResult().failure(RTError(
-                self.pos_start, self.pos_end,
+            raise RTError(
+                exec_ctx.parent_entry_pos, exec_ctx.parent_entry_end,
                 "First and second argument must be a number",
                 exec_ctx
-            ))
+            )
 
         if pos.value < 0 or pos.value >= len(string.value):
-            return RTResult().failure(RTError(
-                self.pos_start, self.pos_end,
+            raise RTError(
+                exec_ctx.parent_entry_pos, exec_ctx.parent_entry_end,
                 "First argument (Position) can't be below 0 and more than the string length",
                 exec_ctx
-            ))
+            )
 
         if count.value < 1:
-            return RTResult().failure(RTError(
-                self.pos_start, self.pos_end,
+            raise RTError(
+                exec_ctx.parent_entry_pos, exec_ctx.parent_entry_end,
                 "Decond argument (Count) can't be below 1",
                 exec_ctx
-            ))
+            )
 
-        string.value = string.value[:pos.value] + string.value[pos.value+count.value:]
-        return RTResult().success(string)
+        return String(string.value[:pos.value] + string.value[pos.value+count.value:])
     execute_sub.arg_names = [("position", False), ("count", False)]
 
     def execute_includes(self, exec_ctx):
@@ -341,13 +330,13 @@ class BuiltInFunction(BaseFunction):
         _str = exec_ctx.symbol_table.get("str")
 
         if not isinstance(_str, String):
-            return RTResult().failure(RTError(
-                self.pos_start, self.pos_end,
+            raise RTError(
+                exec_ctx.parent_entry_pos, exec_ctx.parent_entry_end,
                 "First argument must be a string",
                 exec_ctx
-            ))
+            )
 
-        return RTResult().success(Boolean(_str.value in string.value))
+        return boolean(_str.value in string.value)
     execute_includes.arg_names = [("str", False)]
 
     def execute_to_letters(self, exec_ctx):
@@ -358,18 +347,18 @@ class BuiltInFunction(BaseFunction):
         for i in string.value:
             letter_list.append(String(i))
 
-        return RTResult().success(List(letter_list))
+        return List(letter_list)
     execute_to_letters.arg_names = []
 
     def execute_readFile(self, exec_ctx):
         file_name = exec_ctx.symbol_table.get("file_name")
         
         if not isinstance(file_name, String):
-            return RTResult().failure(RTError(
-                self.pos_start, self.pos_end,
+            raise RTError(
+                exec_ctx.parent_entry_pos, exec_ctx.parent_entry_end,
                 "The argument must be a string",
                 exec_ctx
-            ))
+            )
 
         from BananaPlus import workspace_dir
 
@@ -379,16 +368,13 @@ class BuiltInFunction(BaseFunction):
             file_to_open = workspace_dir + "\\" + file_name.value[2:].replace("/", "\\")
         
         try:
-            file =  open(file_to_open, 'r')
-            file_data = file.read()
-            file.close()
-            return RTResult().success(String(file_data))
+            return String(read_text(file_to_open))
         except Exception as e:
-            return RTResult().failure(RTError(
-                self.pos_start, self.pos_end,
+            raise RTError(
+                exec_ctx.parent_entry_pos, exec_ctx.parent_entry_end,
                 "Can't open that file",
                 exec_ctx
-            ))
+            )
     execute_readFile.arg_names = [("file_name", False)]  
     
     def execute_writeFile(self, exec_ctx):
@@ -396,11 +382,11 @@ class BuiltInFunction(BaseFunction):
         data = exec_ctx.symbol_table.get("data")
 
         if not isinstance(file_name, String) or not isinstance(data, String):
-            return RTResult().failure(RTError(
-                self.pos_start, self.pos_end,
+            raise RTError(
+                exec_ctx.parent_entry_pos, exec_ctx.parent_entry_end,
                 "All arguments must be a string",
                 exec_ctx
-            ))
+            )
 
         from BananaPlus import workspace_dir
 
@@ -413,24 +399,24 @@ class BuiltInFunction(BaseFunction):
             file = open(file_to_open, 'w')
             file.write(data.value)
             file.close()
-            return RTResult().success(data.copy())
+            return data.copy()
         except Exception as e:
-            return RTResult().failure(RTError(
-                self.pos_start, self.pos_end,
+            raise RTError(
+                exec_ctx.parent_entry_pos, exec_ctx.parent_entry_end,
                 "Can't write in that file",
                 exec_ctx
-            ))
+            )
     execute_writeFile.arg_names = [("file_name", False), ("data", False)]
 
     def execute_deleteFile(self, exec_ctx):
         file_name = exec_ctx.symbol_table.get("file_name")
         
         if not isinstance(file_name, String):
-            return RTResult().failure(RTError(
-                self.pos_start, self.pos_end,
+            raise RTError(
+                exec_ctx.parent_entry_pos, exec_ctx.parent_entry_end,
                 "The argument must be a string",
                 exec_ctx
-            ))
+            )
 
         from BananaPlus import workspace_dir
 
@@ -443,19 +429,19 @@ class BuiltInFunction(BaseFunction):
             try:
                 os.remove(file_to_delete)              
             except Exception as e:
-                return RTResult().failure(RTError(
-                    self.pos_start, self.pos_end,
+                raise RTError(
+                    exec_ctx.parent_entry_pos, exec_ctx.parent_entry_end,
                     "Can't delete that file",
                     exec_ctx
-                ))
+                )
         else:
-            return RTResult().failure(RTError(
-                self.pos_start, self.pos_end,
+            raise RTError(
+                exec_ctx.parent_entry_pos, exec_ctx.parent_entry_end,
                 "File does not exist",
                 exec_ctx
-            ))
+            )
         
-        return RTResult().success(Null())
+        return null
     execute_deleteFile.arg_names = [("file_name", False)]  
 
     def execute_object_set(self, exec_ctx):
@@ -464,11 +450,11 @@ class BuiltInFunction(BaseFunction):
         value = exec_ctx.symbol_table.get("value")
 
         if not isinstance(key, String):
-            return RTResult().failure(RTError(
-                self.pos_start, self.pos_end,
+            raise RTError(
+                exec_ctx.parent_entry_pos, exec_ctx.parent_entry_end,
                 "First argument (key) must be a string",
                 exec_ctx
-            ))
+            )
 
         first_letter = True
         err = False
@@ -482,15 +468,15 @@ class BuiltInFunction(BaseFunction):
             first_letter = False
 
         if err: 
-            return RTResult().failure(RTError(
-                self.pos_start, self.pos_end,
+            raise RTError(
+                exec_ctx.parent_entry_pos, exec_ctx.parent_entry_end,
                 "First argument (key) is invalid",
                 exec_ctx
-            ))
+            )
 
         obj.elements[key.value] = value
 
-        return RTResult().success(obj)
+        return obj
     execute_object_set.arg_names = [("key", False), ("value", False)]
 
     def execute_object_get(self, exec_ctx):
@@ -499,15 +485,30 @@ class BuiltInFunction(BaseFunction):
         default = exec_ctx.symbol_table.get("default", None)
 
         if not isinstance(key, String):
-            return RTResult().failure(RTError(
-                self.pos_start, self.pos_end,
+            raise RTError(
+                exec_ctx.parent_entry_pos, exec_ctx.parent_entry_end,
                 "First argument (key) must be a string",
                 exec_ctx
-            ))
+            )
 
-        return RTResult().success(obj.elements.get(key.value, Null() if not default else default))
+        return obj.elements.get(key.value, null if not default else default)
     execute_object_get.arg_names = [("key", False), ("default", True)]
 
+def method_entry(name, method):
+    # The scope of a built-in's frame holds just its arguments
+    scope = Scope(name)
+    for arg_name, optional in method.arg_names:
+        scope.declare(arg_name)
+    return method, Signature(method.arg_names, scope), scope
+
+# The method, signature and frame scope of each built-in by name, so a call
+# does not look them up by attribute or work out its arguments again. The
+# names are interned like the lexer's, which cutting off "execute_" is not
+BuiltInFunction.methods = {
+    sys.intern(name[len("execute_"):]): method_entry(sys.intern(name[len("execute_"):]), method)
+    for name, method in vars(BuiltInFunction).items() if name.startswith("execute_")
+}
+
 BuiltInFunction.print = BuiltInFunction("print")
 BuiltInFunction.input = BuiltInFunction("input")
 BuiltInFunction.input_int = BuiltInFunction("input_int")
@@ -527,8 +528,8 @@ BuiltInFunction.write_file = BuiltInFunction("writeFile")
 BuiltInFunction.delete_file = BuiltInFunction("deleteFile")
 
 global_math = Object({
-    "pi": Number(math.pi),
-    "inf": Number(math.inf)
+    "pi": number(math.pi),
+    "inf": number(math.inf)
 })
 
 global_File = Object({
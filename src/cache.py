@@ -0,0 +1,138 @@
+import gc
+import os
+import sys
+import pickle
+import hashlib
+
+# Parsed scripts are kept in a __bpcache__ directory next to them, as the
+# pickled tree the resolver returned. FORMAT_VERSION has to be bumped with
+# any change to the lexer, parser, resolver or node classes that changes
+# what a parsed script looks like, so entries an older interpreter wrote
+# are parsed again rather than trusted
+FORMAT_VERSION = 2
+TAG = f'bpc{FORMAT_VERSION}-{sys.implementation.cache_tag}'
+CACHE_DIR = '__bpcache__'
+
+POSITIONS = ('pos_start', 'pos_end')
+
+def cache_path(path):
+    directory, name = os.path.split(os.path.abspath(path))
+    return os.path.join(directory, CACHE_DIR, name + 'c')
+
+def digest(text):
+    data = text.encode('utf-8', 'surrogatepass') if isinstance(text, str) else text
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+def load(path, source):
+    # The tree cached for the script at path, which source holds the text
+    # of, or None. An entry is only used when this version wrote it and the
+    # file still has the same mtime, size and content
+    try:
+        stat = os.stat(path)
+        with open(cache_path(path), 'rb') as f:
+            tag, mtime, size, content, base, flat = pickle.load(f)
+            if tag != TAG or mtime != stat.st_mtime_ns or size != stat.st_size: return None
+            if content != digest(source.text): return None
+            # Loading a tree creates thousands of objects that all live on,
+            # so collections run while it does would find nothing to free
+            enabled = gc.isenabled()
+            gc.disable()
+            try:
+                node = pickle.load(f)
+                # A flattened tree lists its root last
+                if flat: node = node[-1]
+            finally:
+                if enabled: gc.enable()
+    except Exception:
+        return None
+
+    if base != source.base: rebase(node, source.base - base)
+    return node
+
+def store(path, source, node):
+    # Written to a temporary file that is then moved into place, so a run
+    # reading the entry at the same time never sees half of it. A tree
+    # nested deeper than pickle can recurse is written flattened instead,
+    # which takes longer to write but loads as fast. A script that cannot
+    # be cached at all, in a read only directory, is simply parsed again
+    # next time
+    target = cache_path(path)
+    directory = os.path.dirname(target)
+    created = not os.path.isdir(directory)
+    temp = f'{target}.{os.getpid()}.tmp'
+    try:
+        stat = os.stat(path)
+        os.makedirs(directory, exist_ok=True)
+        with open(temp, 'wb') as f:
+            header = (TAG, stat.st_mtime_ns, stat.st_size, digest(source.text), source.base)
+            try:
+                pickle.dump(header + (False,), f, pickle.HIGHEST_PROTOCOL)
+                pickle.dump(node, f, pickle.HIGHEST_PROTOCOL)
+            except RecursionError:
+                f.seek(0)
+                f.truncate()
+                pickle.dump(header + (True,), f, pickle.HIGHEST_PROTOCOL)
+                pickle.dump(flatten(node), f, pickle.HIGHEST_PROTOCOL)
+        os.replace(temp, target)
+    except (OSError, RecursionError, pickle.PicklingError):
+        try:
+            os.remove(temp)
+        except OSError:
+            pass
+        # Nor is a cache directory left behind that holds nothing
+        if created:
+            try:
+                os.rmdir(directory)
+            except OSError:
+                pass
+
+def flatten(node):
+    # Every node and token of the tree, each one after all of those it
+    # holds. Pickled in this order, whatever a node holds was already
+    # written and is only referred to, so pickle never recurses deeper than
+    # a single node however deep the tree is. A token shared between nodes
+    # is listed once, and may be written inside one of them
+    objects = []
+    seen = set()
+    stack = [node]
+    while stack:
+        obj = stack.pop()
+        if isinstance(obj, (list, tuple)):
+            stack.extend(obj)
+            continue
+        if not hasattr(type(obj), '__slots__') or id(obj) in seen: continue
+        seen.add(id(obj))
+        objects.append(obj)
+
+        for cls in type(obj).__mro__:
+            for name in getattr(cls, '__slots__', ()):
+                stack.append(getattr(obj, name, None))
+
+    objects.reverse()
+    return objects
+
+def rebase(node, delta):
+    # Positions are offsets into the space every source gets a range of, so
+    # a cached tree whose source now starts at another offset has all of
+    # them moved by the difference. Tokens can be shared between nodes, and
+    # are only moved once
+    seen = set()
+    stack = [node]
+    while stack:
+        obj = stack.pop()
+        if isinstance(obj, (list, tuple)):
+            stack.extend(obj)
+            continue
+        if not hasattr(type(obj), '__slots__') or id(obj) in seen: continue
+        seen.add(id(obj))
+
+        for cls in type(obj).__mro__:
+            for name in getattr(cls, '__slots__', ()):
+                value = getattr(obj, name, None)
+                if name in POSITIONS:
+                    if value != None: setattr(obj, name, value + delta)
+                elif name == 'var_name_toks':
+                    setattr(obj, name, [(tok, pos_start + delta, pos_end + delta) for tok, pos_start, pos_end in value])
+                    stack.extend(tok for tok, _, _ in value)
+                else:
+                    stack.append(value)
@@ -0,0 +1,404 @@
+from src.rt_types import *
+from src.nodes import *
+from src.symbol_table import GLOBAL_SLOT
+from src.types import Signature
+from src.dispatch import build_dispatch
+
+LOAD_CONST = 0
+LOAD_NUMBER = 1
+LOAD_STRING = 2
+LOAD_BOOLEAN = 3
+LOAD_NULL = 4
+LOAD_NAME = 6
+STORE_NAME = 7
+UPDATE_NAME = 8
+BUILD_LIST = 9
+BUILD_OBJECT = 10
+BINARY_OP = 11
+BINARY_DOT = 12
+UNARY_NEG = 13
+UNARY_NOT = 14
+POP_TOP = 16
+JUMP = 17
+POP_JUMP_IF_FALSE = 18
+CASE_MATCH = 19
+SETUP_LOOP = 20
+POP_BLOCK = 21
+LOAD_ACC = 22
+COLLECT = 23
+BUILD_LOOP_LIST = 24
+FOR_RANGE_PREP = 25
+FOR_RANGE_NEXT = 26
+FOR_OBJECT_PREP = 27
+FOR_OBJECT_NEXT = 28
+FOR_LIST_PREP = 29
+FOR_LIST_NEXT = 30
+BREAK_LOOP = 31
+CONTINUE_LOOP = 32
+RETURN_VALUE = 33
+MAKE_FUNCTION = 34
+CALL = 35
+EVAL_NODE = 36
+CHECK_NUMBER = 37
+END = 38
+LOAD_FAST = 39
+LOAD_DEREF = 40
+LOAD_GLOBAL = 41
+STORE_FAST = 42
+JUMP_IF_DECIDED = 43
+
+OP_NAMES = {
+    value: name for name, value in list(globals().items())
+    if name.isupper() and isinstance(value, int)
+}
+
+BINARY_METHODS = {
+    TT_PLUS: "added_to",
+    TT_MINUS: "subbed_by",
+    TT_MUL: "multed_by",
+    TT_DIV: "dived_by",
+    TT_POW: "powed_by",
+    TT_EE: "get_comparison_eq",
+    TT_NE: "get_comparison_ne",
+    TT_LT: "get_comparison_lt",
+    TT_GT: "get_comparison_gt",
+    TT_LTE: "get_comparison_lte",
+    TT_GTE: "get_comparison_gte",
+    KEYWORDS.AND: "anded_by",
+    KEYWORDS.OR: "ored_by"
+}
+
+class Code:
+    def __init__(self, name):
+        self.name = name
+        self.instructions = []
+        self.positions = []
+        self.consts = []
+        self.names = []
+        self.const_ids = {}
+        self.name_ids = {}
+
+    def add_const(self, value):
+        key = (type(value), value) if isinstance(value, (int, float, str, bool)) else id(value)
+        if key not in self.const_ids:
+            self.const_ids[key] = len(self.consts)
+            self.consts.append(value)
+        return self.const_ids[key]
+
+    def add_name(self, name):
+        if name not in self.name_ids:
+            self.name_ids[name] = len(self.names)
+            self.names.append(name)
+        return self.name_ids[name]
+
+    def emit(self, op, arg, node):
+        self.instructions.append((op, arg))
+        self.positions.append((node.pos_start, node.pos_end))
+        return len(self.instructions) - 1
+
+    def patch(self, index, arg):
+        op, _ = self.instructions[index]
+        self.instructions[index] = (op, arg)
+
+    def here(self):
+        return len(self.instructions)
+
+    def dis(self):
+        lines = []
+        for i, (op, arg) in enumerate(self.instructions):
+            lines.append(f'{i:>5} {OP_NAMES[op]:<18} {arg!r}')
+        return '\n'.join(lines)
+
+    def __repr__(self):
+        return f'<code {self.name}>'
+
+class Compiler:
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.dispatch = build_dispatch(cls, 'compile_')
+
+    def compile(self, node, name='<program>', discard=False):
+        code = Code(name)
+        if discard:
+            self.visit_discarded(node, code)
+            code.emit(LOAD_NULL, None, node)
+        else:
+            self.visit(node, code)
+        code.emit(END, None, node)
+        return code
+
+    def visit(self, node, code, bin_op_right=False):
+        self.dispatch[node.__class__](self, node, code, bin_op_right)
+
+    def visit_discarded(self, node, code, bin_op_right=False):
+        # Building a list that is thrown away right after has no visible
+        # effect, so statement blocks only evaluate their statements
+        if isinstance(node, ListNode):
+            for element_node in node.element_nodes:
+                self.visit_discarded(element_node, code, bin_op_right)
+            return
+
+        if isinstance(node, LOOP_NODES):
+            self.dispatch[node.__class__](self, node, code, bin_op_right, True)
+            return
+
+        self.visit(node, code, bin_op_right)
+        code.emit(POP_TOP, None, node)
+
+    def compile_NumberNode(self, node, code, bin_op_right=False):
+        code.emit(LOAD_NUMBER, code.add_const(node.tok.value), node)
+
+    def compile_StringNode(self, node, code, bin_op_right=False):
+        code.emit(LOAD_STRING, code.add_const(node.tok.value), node)
+
+    def compile_BooleanNode(self, node, code, bin_op_right=False):
+        code.emit(LOAD_BOOLEAN, node.value, node)
+
+    def compile_NullNode(self, node, code, bin_op_right=False):
+        code.emit(LOAD_NULL, None, node)
+
+    def compile_ListNode(self, node, code, bin_op_right=False):
+        # Literals nested in one another are compiled with a stack of the
+        # ones still open, so their depth is not bounded by the recursion
+        # limit. Each literal is built once the values of its elements are
+        # on the stack
+        frames = [(node, iter(node.element_nodes))]
+        while frames:
+            node, element_nodes = frames[-1]
+            is_object = isinstance(node, ObjectNode)
+
+            for element in element_nodes:
+                element_node = element[1] if is_object else element
+                if isinstance(element_node, (ListNode, ObjectNode)):
+                    frames.append((element_node, iter(element_node.element_nodes)))
+                    break
+                self.visit(element_node, code, bin_op_right)
+            else:
+                frames.pop()
+                if is_object:
+                    code.emit(BUILD_OBJECT, tuple(element[0].value for element in node.element_nodes), node)
+                else:
+                    code.emit(BUILD_LIST, len(node.element_nodes), node)
+
+    def compile_ObjectNode(self, node, code, bin_op_right=False):
+        self.compile_ListNode(node, code, bin_op_right)
+
+    def compile_VarAccessNode(self, node, code, bin_op_right=False):
+        name_idx = code.add_name(node.var_name_tok.value)
+        if bin_op_right:
+            code.emit(LOAD_CONST, code.add_const(node.var_name_tok.value), node)
+        elif node.slot == None:
+            code.emit(LOAD_NAME, name_idx, node)
+        elif node.slot == GLOBAL_SLOT:
+            code.emit(LOAD_GLOBAL, name_idx, node)
+        elif node.slot[0] == 0:
+            code.emit(LOAD_FAST, (node.slot[1], name_idx), node)
+        else:
+            code.emit(LOAD_DEREF, (node.slot, name_idx), node)
+
+    def compile_VarAssignNode(self, node, code, bin_op_right=False):
+        self.visit(node.value_node, code, bin_op_right)
+        name_idx = code.add_name(node.var_name_tok.value)
+        if node.update:
+            code.emit(UPDATE_NAME, (name_idx, node.assign_type, node.slot, node.value_node.pos_start, node.value_node.pos_end), node)
+        elif node.slot:
+            code.emit(STORE_FAST, node.slot[1], node)
+        else:
+            code.emit(STORE_NAME, (name_idx, node.public), node)
+
+    def compile_MultiVarAssignNode(self, node, code, bin_op_right=False):
+        code.emit(EVAL_NODE, (node, bin_op_right), node)
+
+    def compile_BinOpNode(self, node, code, bin_op_right=False):
+        # A chain like a + b + c leans left, so it is compiled down its left
+        # operands and back up again rather than recursing per operator
+        spine = []
+        while isinstance(node, BinOpNode):
+            spine.append(node)
+            node = node.left_node
+        self.visit(node, code, bin_op_right)
+
+        for node in reversed(spine):
+            if node.op_tok.type == TT_KEYWORD:
+                decided = code.emit(JUMP_IF_DECIDED, None, node)
+                self.visit(node.right_node, code)
+                code.emit(BINARY_OP, (BINARY_METHODS[node.op_tok.value], node.right_node.pos_start, node.right_node.pos_end), node)
+                code.patch(decided, (node.op_tok.value == KEYWORDS.OR, code.here()))
+                continue
+
+            self.visit(node.right_node, code, node.op_tok.type == TT_DOT)
+
+            if node.op_tok.type == TT_DOT:
+                code.emit(BINARY_DOT, (node.right_node.pos_start, node.right_node.pos_end), node)
+            else:
+                code.emit(BINARY_OP, (BINARY_METHODS[node.op_tok.type], node.right_node.pos_start, node.right_node.pos_end), node)
+
+    def compile_UnaryOpNode(self, node, code, bin_op_right=False):
+        self.visit(node.node, code, bin_op_right)
+
+        # A '+' sign leaves its operand as it is
+        if node.op_tok.type == TT_MINUS:
+            code.emit(UNARY_NEG, None, node.node)
+        elif node.op_tok.matches(TT_KEYWORD, KEYWORDS.NOT):
+            code.emit(UNARY_NOT, None, node.node)
+
+    def compile_IfNode(self, node, code, bin_op_right=False):
+        end_jumps = []
+
+        for condition, expr, should_return_null in node.cases:
+            self.visit(condition, code, bin_op_right)
+            next_jump = code.emit(POP_JUMP_IF_FALSE, None, condition)
+            if should_return_null:
+                self.visit_discarded(expr, code, bin_op_right)
+                code.emit(LOAD_NULL, None, node)
+            else:
+                self.visit(expr, code, bin_op_right)
+            end_jumps.append(code.emit(JUMP, None, node))
+            code.patch(next_jump, code.here())
+
+        if node.else_case:
+            expr, should_return_null = node.else_case
+            if should_return_null:
+                self.visit_discarded(expr, code, bin_op_right)
+                code.emit(LOAD_NULL, None, node)
+            else:
+                self.visit(expr, code, bin_op_right)
+        else:
+            code.emit(LOAD_NULL, None, node)
+
+        for jump in end_jumps:
+            code.patch(jump, code.here())
+
+    def compile_SwitchNode(self, node, code, bin_op_right=False):
+        self.visit(node.value_node, code, bin_op_right)
+        end_jumps = []
+
+        for case, expr in node.cases:
+            self.visit(case, code, bin_op_right)
+            next_jump = code.emit(CASE_MATCH, None, case)
+            code.emit(POP_TOP, None, node)
+            self.visit_discarded(expr, code, bin_op_right)
+            end_jumps.append(code.emit(JUMP, None, node))
+            code.patch(next_jump, code.here())
+
+        code.emit(POP_TOP, None, node)
+        if node.default:
+            self.visit_discarded(node.default, code, bin_op_right)
+
+        for jump in end_jumps:
+            code.patch(jump, code.here())
+        code.emit(LOAD_NULL, None, node)
+
+    def compile_loop(self, node, code, bin_op_right, collect, next_op, next_arg, collect_offset):
+        # The result accumulator and the iteration state (if any) are already
+        # on the stack. Loop signals raised outside of the body range are not
+        # handled by this loop, just like the tree walker returns them from
+        # the loop's visit method.
+        setup = code.emit(SETUP_LOOP, None, node)
+        head = code.here()
+
+        if next_op == POP_JUMP_IF_FALSE:
+            self.visit(node.condition_node, code, bin_op_right)
+            exit_jump = code.emit(POP_JUMP_IF_FALSE, None, node.condition_node)
+        else:
+            exit_jump = code.emit(next_op, None, node)
+
+        body_start = code.here()
+        if collect:
+            self.visit(node.body_node, code, bin_op_right)
+            code.emit(COLLECT, collect_offset, node)
+        else:
+            self.visit_discarded(node.body_node, code, bin_op_right)
+        body_end = code.here()
+        code.emit(JUMP, head, node)
+
+        exit_target = code.here()
+        code.emit(POP_BLOCK, None, node)
+        code.patch(setup, (head, exit_target, body_start, body_end))
+        code.patch(exit_jump, exit_target if next_op == POP_JUMP_IF_FALSE else next_arg + (exit_target,))
+
+    def start_loop(self, node, code, discard):
+        # Only loops whose value is used build a result list; a discarded
+        # loop leaves nothing on the stack
+        collect = not (discard or node.should_return_null)
+        if collect:
+            code.emit(LOAD_ACC, None, node)
+        return collect
+
+    def finish_loop(self, node, code, collect, discard, has_state):
+        if has_state:
+            code.emit(POP_TOP, None, node)
+
+        if collect:
+            code.emit(BUILD_LOOP_LIST, None, node)
+        elif not discard:
+            code.emit(LOAD_NULL, None, node)
+
+    def compile_ForNode(self, node, code, bin_op_right=False, discard=False):
+        collect = self.start_loop(node, code, discard)
+        self.visit(node.start_value_node, code, bin_op_right)
+        code.emit(CHECK_NUMBER, None, node.start_value_node)
+        self.visit(node.end_value_node, code, bin_op_right)
+        code.emit(CHECK_NUMBER, None, node.end_value_node)
+        if node.step_value_node:
+            self.visit(node.step_value_node, code, bin_op_right)
+            code.emit(CHECK_NUMBER, None, node.step_value_node)
+        name_idx = code.add_name(node.var_name_tok.value)
+        code.emit(FOR_RANGE_PREP, (node.step_value_node is not None, node.slot, name_idx), node)
+        self.compile_loop(node, code, bin_op_right, collect, FOR_RANGE_NEXT, (), 2)
+        self.finish_loop(node, code, collect, discard, True)
+
+    def compile_ForObjectNode(self, node, code, bin_op_right=False, discard=False):
+        collect = self.start_loop(node, code, discard)
+        self.visit(node.object_tok, code, bin_op_right)
+        code.emit(FOR_OBJECT_PREP, None, node.object_tok)
+
+        key_idx = code.add_name(node.var_name_key_tok.value)
+        value_idx = code.add_name(node.var_name_value_tok.value)
+        self.compile_loop(node, code, bin_op_right, collect, FOR_OBJECT_NEXT, (key_idx, node.key_slot, value_idx, node.value_slot), 2)
+        self.finish_loop(node, code, collect, discard, True)
+
+    def compile_ForListNode(self, node, code, bin_op_right=False, discard=False):
+        collect = self.start_loop(node, code, discard)
+        self.visit(node.list_tok, code, bin_op_right)
+        code.emit(FOR_LIST_PREP, None, node.list_tok)
+
+        name_idx = code.add_name(node.var_name_tok.value)
+        self.compile_loop(node, code, bin_op_right, collect, FOR_LIST_NEXT, (name_idx, node.slot), 2)
+        self.finish_loop(node, code, collect, discard, True)
+
+    def compile_WhileNode(self, node, code, bin_op_right=False, discard=False):
+        collect = self.start_loop(node, code, discard)
+        self.compile_loop(node, code, bin_op_right, collect, POP_JUMP_IF_FALSE, None, 1)
+        self.finish_loop(node, code, collect, discard, False)
+
+    def compile_FuncDefNode(self, node, code, bin_op_right=False):
+        func_name = node.var_name_tok.value if node.var_name_tok else None
+        body_code = self.compile(node.body_node, func_name or '<anonymous>', not node.should_auto_return)
+        signature = Signature(node.arg_name_toks, node.scope)
+        func = (func_name, node.body_node, node.arg_name_toks, node.should_auto_return, node.public, body_code, node.scope, node.slot, signature)
+        code.emit(MAKE_FUNCTION, code.add_const(func), node)
+
+    def compile_CallNode(self, node, code, bin_op_right=False):
+        self.visit(node.node_to_call, code, bin_op_right)
+        for arg_node in node.arg_nodes:
+            self.visit(arg_node, code, bin_op_right)
+        code.emit(CALL, len(node.arg_nodes), node)
+
+    def compile_ImportNode(self, node, code, bin_op_right=False):
+        code.emit(EVAL_NODE, (node, bin_op_right), node)
+
+    def compile_ReturnNode(self, node, code, bin_op_right=False):
+        if node.node_to_return:
+            self.visit(node.node_to_return, code, bin_op_right)
+        else:
+            code.emit(LOAD_NULL, None, node)
+        code.emit(RETURN_VALUE, None, node)
+
+    def compile_ContinueNode(self, node, code, bin_op_right=False):
+        code.emit(CONTINUE_LOOP, None, node)
+
+    def compile_BreakNode(self, node, code, bin_op_right=False):
+        code.emit(BREAK_LOOP, None, node)
+
+Compiler.dispatch = build_dispatch(Compiler, 'compile_')
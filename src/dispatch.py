@@ -0,0 +1,20 @@
+import src.nodes as nodes
+
+class DispatchTable(dict):
+    # Node class -> the method handling it, for a class whose methods are
+    # named <prefix><node class name>
+    def __init__(self, prefix):
+        super().__init__()
+        self.prefix = prefix
+
+    def __missing__(self, node_class):
+        raise Exception(f'No {self.prefix}{node_class.__name__} method defined')
+
+def build_dispatch(cls, prefix):
+    dispatch = DispatchTable(prefix)
+    for name in dir(cls):
+        if not name.startswith(prefix): continue
+        node_class = getattr(nodes, name[len(prefix):], None)
+        if isinstance(node_class, type):
+            dispatch[node_class] = getattr(cls, name)
+    return dispatch
@@ -0,0 +1,31 @@
+from src.interpreter import Interpreter
+from src.compiler import Compiler
+from src.vm import VM
+from src.lexer import InternTable
+from src.results import RTResult, FuncReturn, LoopBreak, LoopContinue
+from src.errors import RTError
+
+class Engine:
+    def __init__(self, use_vm=False):
+        self.use_vm = use_vm
+        self.interpreter = Interpreter()
+        self.compiler = Compiler()
+        self.vm = VM()
+        # The names lexed by the current run, shared with every script it
+        # imports. Each run starts a new one
+        self.interned = InternTable()
+
+    def execute(self, node, context):
+        # Where what a run raises ends up: an error becomes its result, and
+        # a return, break or continue outside of any function or loop ends
+        # the script without a value
+        res = RTResult()
+        try:
+            if self.use_vm:
+                code = self.compiler.compile(node)
+                return res.success(self.vm.run(code, context))
+            return res.success(self.interpreter.visit(node, context))
+        except RTError as error:
+            return res.failure(error.with_traceback(None))
+        except (FuncReturn, LoopBreak, LoopContinue):
+            return res.success(None)
@@ -1,22 +1,48 @@
 from src.strings_with_arrows import *
+from src.position import source_of
 
 class Context:
-    def __init__(self, display_name, parent=None, parent_entry_pos=None):
+    __slots__ = ('display_name', 'parent', 'parent_entry_pos', 'parent_entry_end', 'symbol_table', 'engine', 'source')
+
+    def __init__(self, display_name, parent=None, parent_entry_pos=None, engine=None, parent_entry_end=None, source=None):
         self.display_name = display_name
         self.parent = parent
+        # The span of the call that entered this context
         self.parent_entry_pos = parent_entry_pos
+        self.parent_entry_end = parent_entry_end
         self.symbol_table = None
+        self.engine = engine if engine or not parent else parent.engine
+        # The source a script runs from, set on the context of its top level.
+        # Every function the script makes closes over a context whose parents
+        # lead here, so the source lives exactly as long as one of them does
+        self.source = source
 
-class Error:
+class Error(Exception):
     def __init__(self, pos_start, pos_end, error_name, details):
         self.error_name = error_name
         self.details = details
         self.pos_start = pos_start
         self.pos_end = pos_end
+        # The source the error is found in, which a syntax error is all that
+        # keeps alive once the lexer and parser that found it are gone. An
+        # operation's error only gets a span when it is pointed at its operand
+        self.source = source_of(pos_start) if pos_start != None else None
+        # The message once it has been put together, which stays readable
+        # after the source it points into has been released
+        self.text = None
+
+    def location(self, pos):
+        source = source_of(pos)
+        ln, col = source.location(pos)
+        return f' File {source.fn}, line {ln + 1}'
 
     def as_string(self):
+        if self.text == None: self.text = self.render()
+        return self.text
+
+    def render(self):
         result = f'{self.error_name}: {self.details}'
-        result += f'\n\n{string_with_arrows(self.pos_start.ftxt, self.pos_start, self.pos_end)}\n\n File {self.pos_start.fn}, line {self.pos_start.ln + 1}'
+        result += f'\n\n{string_with_arrows(self.pos_start, self.pos_end)}\n\n{self.location(self.pos_start)}'
         return result
 
 class IllegalCharError(Error):
@@ -36,10 +62,10 @@ class RTError(Error):
         super().__init__(pos_start, pos_end, "Runtime Error", details)
         self.context = context
 
-    def as_string(self):
+    def render(self):
         result = self.generate_traceback()
         result += f'{self.error_name}: {self.details}'
-        result += f'\n\n{string_with_arrows(self.pos_start.ftxt, self.pos_start, self.pos_end)}\n\n File {self.pos_start.fn}, line {self.pos_start.ln + 1}'
+        result += f'\n\n{string_with_arrows(self.pos_start, self.pos_end)}\n\n{self.location(self.pos_start)}'
         return result
 
     def generate_traceback(self):
@@ -48,7 +74,7 @@ class RTError(Error):
         ctx = self.context
 
         while ctx:
-            result = f'  File {pos.fn}, line {str(pos.ln + 1)}, in {ctx.display_name}\n' + result
+            result = f' {self.location(pos)}, in {ctx.display_name}\n' + result
             pos = ctx.parent_entry_pos
             ctx = ctx.parent
 
@@ -0,0 +1,235 @@
+from bisect import bisect_right
+from itertools import accumulate, chain
+from operator import attrgetter
+from src.lexer import Lexer, InternTable
+from src.parser import Parser
+from src.resolver import Resolver
+from src.position import Source, release
+from src.nodes import ListNode
+from src.token import Token
+from src.rt_types import *
+
+# How many following chunks an edit may pull in when its own chunks no
+# longer end on a finished statement, before the whole document is parsed
+MAX_EXTEND = 4
+
+# The bookkeeping of an edit walks every chunk, so it is kept to builtins
+chunk_text = attrgetter('text')
+chunk_statements = attrgetter('statements')
+
+class Fragment(Source):
+    # The source of one chunk of a Document. Offsets into it stay valid
+    # however the text around the chunk is edited, and the line the chunk
+    # starts on is only counted when a location is asked for
+    __slots__ = ('document', 'chunk')
+
+    def __init__(self, document, chunk):
+        super().__init__(document.fn, chunk.text)
+        self.document = document
+        self.chunk = chunk
+
+    def location(self, pos):
+        ln, col = super().location(pos)
+        return self.document.line_of(self.chunk) + ln, col
+
+    def excerpt(self, pos, ln_start, ln_end):
+        first_line = self.document.line_of(self.chunk)
+        return super().excerpt(pos, ln_start - first_line, ln_end - first_line)
+
+class Chunk:
+    # Whole lines of a document holding complete top level statements. It
+    # is lexed and parsed on its own, which gives the same tokens and nodes
+    # as parsing the whole document, because it starts on a fresh line and
+    # ends on a line break of its own. A chunk whose edited text does not
+    # parse on its own yet has no source, tokens or statements
+    __slots__ = ('text', 'lines', 'source', 'tokens', 'statements')
+
+    def __init__(self, text):
+        self.text = text
+        self.lines = text.count('\n')
+        self.source = None
+        self.tokens = None
+        self.statements = None
+
+class Document:
+    # A script kept parsed while it is edited. An edit lexes and parses
+    # again only the chunks it touches, and node and error always hold what
+    # parsing the whole text from scratch gives. That takes a parse of the
+    # whole text while any chunk does not parse, as only it tells whether
+    # the rest of the document closes what the chunk left open, and which
+    # error the script really has
+    def __init__(self, fn, text):
+        self.fn = fn
+        self.text = text
+        self.chunks = None
+        # The source of the last whole document parse, whose nodes or error
+        # are still in use
+        self.scratch = None
+        # The names of every chunk, which keep being shared across edits
+        self.interned = InternTable()
+        self.node = None
+        self.error = None
+        self.full_parses = 0
+        self.partial_parses = 0
+        self.reload()
+
+    def edit(self, offset, removed, inserted):
+        self.text = self.text[:offset] + inserted + self.text[offset + removed:]
+        if self.chunks == None or not self.reparse(offset, removed, len(inserted)):
+            self.reload()
+        return self.node, self.error
+
+    def tokens(self):
+        tokens = [tok for chunk in self.chunks for tok in chunk.tokens[:-1]]
+        tokens.append(self.chunks[-1].tokens[-1])
+        return tokens
+
+    def line_of(self, chunk):
+        line = 0
+        for other in self.chunks or ():
+            if other is chunk: break
+            line += other.lines
+        return line
+
+    def reparse(self, offset, removed, added):
+        chunks = self.chunks
+        ends = list(accumulate(map(len, map(chunk_text, chunks))))
+        first = min(bisect_right(ends, offset), len(chunks) - 1)
+        last = min(bisect_right(ends, offset + removed), len(chunks) - 1)
+        start = ends[first] - len(chunks[first].text)
+        end = ends[last] + added - removed
+
+        new_chunks = self.split(self.text[start:end], last == len(chunks) - 1)
+        extended = last
+        while new_chunks == None and extended < len(chunks) - 1 and extended - last < MAX_EXTEND:
+            extended += 1
+            new_chunks = self.split(self.text[start:end + ends[extended] - ends[last]], extended == len(chunks) - 1)
+
+        if new_chunks == None:
+            new_chunks = [Chunk(self.text[start:end])]
+        else:
+            last = extended
+
+        self.forget(chunks[first:last + 1])
+        chunks[first:last + 1] = new_chunks
+
+        if None in map(chunk_statements, chunks): return False
+        self.partial_parses += 1
+        return self.finish()
+
+    def reload(self):
+        self.full_parses += 1
+        if self.scratch: release(self.scratch)
+        self.scratch = None
+
+        lexer = Lexer(self.fn, self.text, self.interned)
+        self.scratch = lexer.source
+        tokens, error = lexer.make_tokens()
+        if error:
+            self.node, self.error = None, error
+            return
+
+        starts = []
+        parser = Parser(tokens)
+        ast = parser.parse(starts)
+        if ast.error:
+            self.node, self.error = None, ast.error
+            return
+
+        # A parse that stops early at a stray keyword still succeeds, so
+        # the document is only split up when every token was used
+        chunks = None
+        if parser.current_tok.type == TT_EOF:
+            chunks = self.pieces(self.text, self.cuts(self.text, tokens, starts, lexer.source.base), True)
+
+        self.forget(self.chunks or [])
+        self.chunks = chunks
+        if chunks == None or not self.finish():
+            self.node, self.error = Resolver().resolve(ast.node), None
+
+    def forget(self, chunks):
+        for chunk in chunks:
+            if chunk.source: release(chunk.source)
+
+    def finish(self):
+        # A document without a single statement does not parse, so it is
+        # left to a whole document parse to report why
+        statements = list(chain.from_iterable(map(chunk_statements, self.chunks)))
+        if not statements: return False
+
+        if self.scratch: release(self.scratch)
+        self.scratch = None
+        self.node = ListNode(statements, self.chunks[0].tokens[0].pos_start, self.chunks[-1].tokens[-1].pos_end)
+        self.error = None
+        return True
+
+    def split(self, text, at_end):
+        # Parses the text of an edited region as one chunk, then cuts it
+        # again so the next edit has as little as possible to redo
+        chunk = Chunk(text)
+        starts = []
+        if not self.parse(chunk, at_end, starts):
+            release(chunk.source)
+            return None
+
+        cuts = self.cuts(text, chunk.tokens, starts, chunk.source.base)
+        if len(cuts) == 2: return [chunk]
+
+        pieces = self.pieces(text, cuts, at_end)
+        if pieces == None: return [chunk]
+        release(chunk.source)
+        return pieces
+
+    def cuts(self, text, tokens, starts, base):
+        # Every top level statement after the first that starts on a line
+        # of its own opens a new chunk
+        cuts = [0]
+        for idx in starts[1:]:
+            newline = tokens[idx - 1]
+            if newline.type == TT_NEWLINE and text[newline.pos_start - base] == '\n':
+                cuts.append(newline.pos_end - base)
+        cuts.append(len(text))
+        return cuts
+
+    def pieces(self, text, cuts, at_end):
+        pieces = []
+        for start, end in zip(cuts, cuts[1:]):
+            piece = Chunk(text[start:end])
+            pieces.append(piece)
+            if not self.parse(piece, at_end and end == len(text)):
+                for piece in pieces:
+                    release(piece.source)
+                return None
+        return pieces
+
+    def parse(self, chunk, at_end, starts=None):
+        chunk.source = Fragment(self, chunk)
+        tokens, error = Lexer(self.fn, chunk.text, self.interned, chunk.source).make_tokens()
+        if error: return False
+        chunk.tokens = tokens
+
+        # Only a line break the chunk ends on keeps its last statement from
+        # running on into the next chunk, as an open string or a comment
+        # swallowing the newline would
+        if not at_end:
+            eof = tokens[-1]
+            if not chunk.text.endswith('\n') or len(tokens) < 2: return False
+            if tokens[-2].type != TT_NEWLINE or tokens[-2].pos_end != eof.pos_start: return False
+
+        if all(tok.type == TT_NEWLINE for tok in tokens[:-1]):
+            chunk.statements = []
+            return True
+
+        # A block 'if' still open when the file ends is closed by the end of
+        # the file, so a chunk followed by others is only complete when an
+        # 'end' after it is left over, rather than closing its last statement
+        last = tokens[-1]
+        if not at_end:
+            last = Token(TT_KEYWORD, KEYWORDS.END, tokens[-1].pos_start, tokens[-1].pos_start)
+            tokens = tokens[:-1] + [last, tokens[-1]]
+
+        parser = Parser(tokens)
+        ast = parser.parse(starts)
+        if ast.error or parser.current_tok is not last: return False
+        chunk.statements = Resolver().resolve(ast.node).element_nodes
+        return True
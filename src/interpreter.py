@@ -1,109 +1,155 @@
-from src.types import Number, Boolean, Null, Function, String, List, Object
-from src.results import RTResult
+from src.types import Number, Boolean, Function, String, List, Object, null, boolean, number
+from src.results import FuncReturn, LoopBreak, LoopContinue
 from src.rt_types import *
 from src.errors import RTError
+from src.position import read_source
+import src.nodes as nodes
+from src.dispatch import build_dispatch
+
+def counted_range(start, end, step):
+    # Counted loops over ints run on a native range; anything else (floats,
+    # a zero step) keeps counting by hand with the same comparisons
+    if isinstance(start, int) and isinstance(end, int) and isinstance(step, int) and step != 0:
+        return range(start, end, step)
+    return float_range(start, end, step)
+
+def float_range(start, end, step):
+    i = start
+    if step >= 0:
+        while i < end:
+            yield i
+            i += step
+    else:
+        while i > end:
+            yield i
+            i += step
+
+def loop_variable(symbol_table, slot, name):
+    # Where a loop stores its variable: the frame slot the resolver gave it,
+    # or the symbol dict for top level code
+    if slot:
+        return symbol_table.slots, slot[1]
+    return symbol_table.symbols, name
+
+CONTAINER_NODES = (nodes.ListNode, nodes.ObjectNode)
 
 class Interpreter:
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.dispatch = build_dispatch(cls, 'visit_')
+
     def visit(self, node, context, bin_op_right=False):
-        method_name = f'visit_{type(node).__name__}'
-        method = getattr(self, method_name, self.no_visit_method)
-        return method(node, context, bin_op_right)
+        return self.dispatch[node.__class__](self, node, context, bin_op_right)
+
+    def visit_discarded(self, node, context, bin_op_right=False):
+        # Statement blocks whose value is thrown away are not turned into
+        # lists, and loops in them do not collect their body values
+        if isinstance(node, nodes.ListNode):
+            for element_node in node.element_nodes:
+                self.visit_discarded(element_node, context, bin_op_right)
+            return None
 
-    def no_visit_method(self, node, context, bin_op_right=False):
-        raise Exception(f'No visit_{type(node).__name__} method defined')
+        if isinstance(node, nodes.LOOP_NODES):
+            return self.dispatch[node.__class__](self, node, context, bin_op_right, True)
+
+        return self.visit(node, context, bin_op_right)
 
     def visit_NumberNode(self, node, context, bin_op_right=False):
-        return RTResult().success(Number(node.tok.value).set_context(context).set_pos(node.pos_start, node.pos_end))
+        return number(node.tok.value)
 
     def visit_StringNode(self, node, context, bin_op_right=False):
-        return RTResult().success(String(node.tok.value).set_context(context).set_pos(node.pos_start, node.pos_end))
+        return String(node.tok.value)
 
     def visit_BooleanNode(self, node, context, bin_op_right=False):
-        return RTResult().success(Boolean(node.value).set_context(context).set_pos(node.pos_start, node.pos_end))
+        return boolean(node.value)
 
     def visit_NullNode(self, node, context, bin_op_right=False):
-        return RTResult().success(Null().set_context(context).set_pos(node.pos_start, node.pos_end))
+        return null
 
     def visit_ListNode(self, node, context, bin_op_right=False):
-        res = RTResult()
-        elements = []
+        # Literals nested in one another are built with a stack of the ones
+        # still open rather than by recursion, so their depth is not bounded
+        # by the recursion limit. Each frame holds the literal, its elements
+        # still to evaluate, the values so far and its key in its parent
+        frames = [(node, iter(node.element_nodes), {} if node.__class__ is nodes.ObjectNode else [], None)]
 
-        for element_node in node.element_nodes:
-            elements.append(res.register(self.visit(element_node, context, bin_op_right)))
-            if res.should_return(): return res
+        while True:
+            node, element_nodes, values, _ = frames[-1]
+            is_object = node.__class__ is nodes.ObjectNode
+
+            for element in element_nodes:
+                element_node = element[1] if is_object else element
+                if element_node.__class__ in CONTAINER_NODES:
+                    frames.append((element_node, iter(element_node.element_nodes), {} if element_node.__class__ is nodes.ObjectNode else [], element[0].value if is_object else None))
+                    break
+
+                value = self.visit(element_node, context, bin_op_right)
+                if is_object:
+                    values[element[0].value] = value
+                else:
+                    values.append(value)
+            else:
+                _, _, _, key = frames.pop()
+                value = (Object if is_object else List)(values)
+                if not frames: return value
 
-        return res.success(
-            List(elements).set_context(context).set_pos(node.pos_start, node.pos_end)
-        )
+                parent_values = frames[-1][2]
+                if key == None:
+                    parent_values.append(value)
+                else:
+                    parent_values[key] = value
 
     def visit_ObjectNode(self, node, context, bin_op_right=False):
-        res = RTResult()
-        elements = {}
-
-        for element in node.element_nodes:
-            elements[element[0].value] = res.register(self.visit(element[1], context, bin_op_right))
-            if res.should_return(): return res
-
-        return res.success(
-            Object(elements).set_context(context).set_pos(node.pos_start, node.pos_end)
-        )
+        return self.visit_ListNode(node, context, bin_op_right)
 
     def visit_VarAccessNode(self, node, context, bin_op_right=False):
-        res = RTResult()
+        # The stored value itself is the result. Values do not know where
+        # they are used: errors about them take their span from the node
+        # and their context from the one evaluating it
         var_name = node.var_name_tok.value
         if not bin_op_right:
-            value = context.symbol_table.get(var_name)
-            if isinstance(value, tuple):
-                value, public = value
+            value = context.symbol_table.lookup(node.slot, var_name)
             if not value:
-                return res.failure(
-                    RTError(
-                        node.pos_start, node.pos_end,
-                        f"'{var_name}' is not defined",
-                        context
-                    )
+                raise RTError(
+                    node.pos_start, node.pos_end,
+                    f"'{var_name}' is not defined",
+                    context
                 )
 
-            value = value.copy().set_pos(context).set_context(context)
-            return res.success(value)
-        return res.success(var_name)
+            return value
+        return var_name
 
     def visit_VarAssignNode(self, node, context, bin_op_right=False):
-        res = RTResult()
         var_name = node.var_name_tok.value
         update = node.update
         assign_type = node.assign_type
         isPublic = node.public
-        value = res.register(self.visit(node.value_node, context, bin_op_right))
-        if res.should_return(): return res
+        value = self.visit(node.value_node, context, bin_op_right)
 
         if update:
-            u_value = context.symbol_table.get(var_name)
-            if isinstance(u_value, tuple):
-                u_value, public = u_value
+            u_value = context.symbol_table.lookup(node.slot, var_name)
             if not u_value:
-                return res.failure(
-                    RTError(
-                        node.pos_start, node.pos_end,
-                        f"'{var_name}' is not defined",
-                        context
-                    )
+                raise RTError(
+                    node.pos_start, node.pos_end,
+                    f"'{var_name}' is not defined",
+                    context
                 )
             
             if assign_type == TT_PE:
                 result, error = u_value.added_to(value)
-                if error: return res.failure(error)
+                if error: raise self.operand_error(error, node.value_node, context)
                 value = result
             elif assign_type == TT_ME:
                 result, error = u_value.subbed_by(value)
-                if error: return res.failure(error)
+                if error: raise self.operand_error(error, node.value_node, context)
                 value = result
 
-        context.symbol_table.set(var_name, (value, isPublic))
-        return res.success(value)
+            context.symbol_table.assign(node.slot, var_name, value)
+        else:
+            context.symbol_table.declare(node.slot, var_name, value, isPublic)
+        return value
 
     def visit_MultiVarAssignNode(self, node, context, bin_op_right=False):
-        res = RTResult()
         var_names = node.var_name_toks
         assign_type = node.assign_type
 
@@ -112,372 +158,328 @@ class Interpreter:
         for var_name in var_names:
             i += 1
             if current_value == None:
-                value = context.symbol_table.get(var_name[0].value)
-                if isinstance(value, tuple):
-                    value, public = value
+                value = context.symbol_table.lookup(node.slot, var_name[0].value)
 
                 if not isinstance(value, Object):
-                    return res.failure(
-                        RTError(
-                            node.pos_start, node.pos_end,
-                            f"'{current_value}' is not a object",
-                            context
-                        )
+                    raise RTError(
+                        node.pos_start, node.pos_end,
+                        f"'{current_value}' is not a object",
+                        context
                     )
             else:
                 value = current_value.elements.get(var_name[0].value, None)
-                if isinstance(value, tuple):
-                    value, public = value
 
             if not value:
-                return res.failure(
-                    RTError(
-                        var_name[1], var_name[2],
-                        f"'{var_name[0].value}' is not defined",
-                        context
-                    )
+                raise RTError(
+                    var_name[1], var_name[2],
+                    f"'{var_name[0].value}' is not defined",
+                    context
                 )
             
             current_value = value
 
             if len(var_names)-1 == i:
+                new_value = self.visit(node.value_node, context, bin_op_right)
+                # Only what the target turns out not to be an object for is
+                # reported as such. Errors, returns and loop jumps raised
+                # by the value go on up
                 try:
-                    new_value = res.register(self.visit(node.value_node, context, bin_op_right))
-                    isTuple = False
                     if var_names[len(var_names)-1][0].value in current_value.elements:
                         t_value = current_value.elements[var_names[len(var_names)-1][0].value]
-                        if isinstance(t_value, tuple):
-                            t_value, public = t_value
-                            isTuple = True
                         
                         if assign_type == TT_PE:
                             result, error = t_value.added_to(new_value)
-                            if error: return res.failure(error)
+                            if error: raise self.operand_error(error, node.value_node, context)
                             new_value = result
                         elif assign_type == TT_ME:
                             result, error = t_value.subbed_by(new_value)
-                            if error: return res.failure(error)
+                            if error: raise self.operand_error(error, node.value_node, context)
                             new_value = result
 
-                    if isTuple:
-                        current_value.elements[var_names[len(var_names)-1][0].value] = (new_value, public)
-                    else:
-                        current_value.elements[var_names[len(var_names)-1][0].value] = new_value
-                except:
-                    return res.failure(
-                        RTError(
-                            var_name[1], var_name[2],
-                            f"'{current_value}' is not a object",
-                            context
-                        )
+                    current_value.elements[var_names[len(var_names)-1][0].value] = new_value
+                except (AttributeError, TypeError):
+                    raise RTError(
+                        var_name[1], var_name[2],
+                        f"'{current_value}' is not a object",
+                        context
                     )
-        return res.success(context.symbol_table.get(var_names[0][0].value)[0])
+        return context.symbol_table.lookup(node.slot, var_names[0][0].value)
 
     def visit_BinOpNode(self, node, context, bin_op_right=False):
-        res = RTResult()
-        left = res.register(self.visit(node.left_node, context, bin_op_right))
-        if res.should_return(): return res
-        right = res.register(self.visit(node.right_node, context, node.op_tok.type == TT_DOT))
-        if res.should_return(): return res
-
-        if node.op_tok.type == TT_DOT:
-            result, error = left.dotted_to(right, node.right_node.pos_start, node.right_node.pos_end)
-        elif node.op_tok.type == TT_PLUS:
-            result, error = left.added_to(right)
-        elif node.op_tok.type == TT_MINUS:
-            result, error = left.subbed_by(right)
-        elif node.op_tok.type == TT_MUL:
-            result, error = left.multed_by(right)
-        elif node.op_tok.type == TT_DIV:
-            result, error = left.dived_by(right)
-        elif node.op_tok.type == TT_POW:
-            result, error = left.powed_by(right)
-        elif node.op_tok.type == TT_EE:
-            result, error = left.get_comparison_eq(right)
-        elif node.op_tok.type == TT_NE:
-            result, error = left.get_comparison_ne(right)
-        elif node.op_tok.type == TT_LT:
-            result, error = left.get_comparison_lt(right)
-        elif node.op_tok.type == TT_GT:
-            result, error = left.get_comparison_gt(right)
-        elif node.op_tok.type == TT_LTE:
-            result, error = left.get_comparison_lte(right)
-        elif node.op_tok.type == TT_GTE:
-            result, error = left.get_comparison_gte(right)
-        elif node.op_tok.matches(TT_KEYWORD, KEYWORDS.AND):
-            result, error = left.anded_by(right)
-        elif node.op_tok.matches(TT_KEYWORD, KEYWORDS.OR):
-            result, error = left.ored_by(right)
-
-        if error: 
-            return res.failure(error)
+        # A chain like a + b + c leans left, so it is evaluated down its left
+        # operands and back up again rather than recursing per operator
+        if node.left_node.__class__ is nodes.BinOpNode:
+            spine = []
+            while node.__class__ is nodes.BinOpNode:
+                spine.append(node)
+                node = node.left_node
+            spine.reverse()
         else:
-            return res.success(result.set_pos(node.pos_start, node.pos_end))
+            spine = (node,)
+            node = node.left_node
+
+        left = self.visit(node, context, bin_op_right)
+
+        for node in spine:
+            # `and` / `or` only evaluate their right side when it can still change the result
+            if node.op_tok.type == TT_KEYWORD and left.is_true() == node.op_tok.matches(TT_KEYWORD, KEYWORDS.OR):
+                if not isinstance(left, Boolean):
+                    left = boolean(left.is_true())
+                continue
+
+            right = self.visit(node.right_node, context, node.op_tok.type == TT_DOT)
+
+            if node.op_tok.type == TT_DOT:
+                result, error = left.dotted_to(right)
+            elif node.op_tok.type == TT_PLUS:
+                result, error = left.added_to(right)
+            elif node.op_tok.type == TT_MINUS:
+                result, error = left.subbed_by(right)
+            elif node.op_tok.type == TT_MUL:
+                result, error = left.multed_by(right)
+            elif node.op_tok.type == TT_DIV:
+                result, error = left.dived_by(right)
+            elif node.op_tok.type == TT_POW:
+                result, error = left.powed_by(right)
+            elif node.op_tok.type == TT_EE:
+                result, error = left.get_comparison_eq(right)
+            elif node.op_tok.type == TT_NE:
+                result, error = left.get_comparison_ne(right)
+            elif node.op_tok.type == TT_LT:
+                result, error = left.get_comparison_lt(right)
+            elif node.op_tok.type == TT_GT:
+                result, error = left.get_comparison_gt(right)
+            elif node.op_tok.type == TT_LTE:
+                result, error = left.get_comparison_lte(right)
+            elif node.op_tok.type == TT_GTE:
+                result, error = left.get_comparison_gte(right)
+            elif node.op_tok.matches(TT_KEYWORD, KEYWORDS.AND):
+                result, error = left.anded_by(right)
+            elif node.op_tok.matches(TT_KEYWORD, KEYWORDS.OR):
+                result, error = left.ored_by(right)
+
+            if error: raise self.operand_error(error, node.right_node, context)
+            left = result
+
+        return left
+
+    def operand_error(self, error, operand_node, context):
+        # Every error of an operation is about its right operand, or its
+        # only one, and points at the node it came from
+        error.pos_start, error.pos_end, error.context = operand_node.pos_start, operand_node.pos_end, context
+        return error
 
     def visit_UnaryOpNode(self, node, context, bin_op_right=False):
-        res = RTResult()
-        number = res.register(self.visit(node.node, context, bin_op_right))
-        if res.should_return(): return res
+        operand = self.visit(node.node, context, bin_op_right)
 
         error = None
 
         if node.op_tok.type == TT_MINUS:
-            number, error = number.multed_by(Number(-1))
+            operand, error = operand.multed_by(number(-1))
         elif node.op_tok.matches(TT_KEYWORD, KEYWORDS.NOT):
-            number, error = number.notted()
+            operand, error = operand.notted()
 
         if error:
-            return res.failure(error)
-        else:
-            return res.success(number.set_pos(node.pos_start, node.pos_end))
+            raise self.operand_error(error, node.node, context)
+        return operand
     
     def visit_IfNode(self, node, context, bin_op_right=False):
-        res = RTResult()
-
         for condition, expr, should_return_null in node.cases:
-            condition_value = res.register(self.visit(condition, context, bin_op_right))
-            if res.should_return(): return res
+            condition_value = self.visit(condition, context, bin_op_right)
             
             if condition_value.is_true():
-                expr_value = res.register(self.visit(expr, context, bin_op_right))
-                if res.should_return(): return res
-                return res.success(Null().set_context(context).set_pos(node.pos_start, node.pos_end) if should_return_null else expr_value)
+                if should_return_null:
+                    self.visit_discarded(expr, context, bin_op_right)
+                    return null
+                return self.visit(expr, context, bin_op_right)
 
         if node.else_case:
             expr, should_return_null = node.else_case
-            expr_value = res.register(self.visit(expr, context, bin_op_right))
-            if res.should_return(): return res
-            return res.success(Null().set_context(context).set_pos(node.pos_start, node.pos_end) if should_return_null else expr_value)
+            if should_return_null:
+                self.visit_discarded(expr, context, bin_op_right)
+                return null
+            return self.visit(expr, context, bin_op_right)
 
-        return res.success(Null().set_context(context).set_pos(node.pos_start, node.pos_end))
+        return null
 
     def visit_SwitchNode(self, node, context, bin_op_right=False):
-        res = RTResult()
-        value = res.register(self.visit(node.value_node, context, bin_op_right))
-        if res.should_return(): return res
+        value = self.visit(node.value_node, context, bin_op_right)
 
         for case, expr in node.cases:
-            case_value = res.register(self.visit(case, context, bin_op_right))
-            if res.should_return(): return res
+            case_value = self.visit(case, context, bin_op_right)
 
             if value.equals(case_value):
-                res.register(self.visit(expr, context, bin_op_right))
-                if res.should_return(): return res
-                return res.success(Null().set_context(context).set_pos(node.pos_start, node.pos_end))
+                self.visit_discarded(expr, context, bin_op_right)
+                return null
 
         if node.default:
-            res.register(self.visit(node.default, context, bin_op_right))
-            if res.should_return(): return res
+            self.visit_discarded(node.default, context, bin_op_right)
         
-        return res.success(Null().set_context(context).set_pos(node.pos_start, node.pos_end))
+        return null
 
-    def visit_ForNode(self, node, context, bin_op_right=False):
-        res = RTResult()
+    def visit_ForNode(self, node, context, bin_op_right=False, discard=False):
+        collect = not (discard or node.should_return_null)
         elements = []
 
-        start_value = res.register(self.visit(node.start_value_node, context, bin_op_right))
-        if res.should_return(): return res
+        start_value = self.visit(node.start_value_node, context, bin_op_right)
 
         if not isinstance(start_value, Number):
-                return res.failure(RTError(
-                    start_value.pos_start, start_value.pos_end,
+                raise RTError(
+                    node.start_value_node.pos_start, node.start_value_node.pos_end,
                     "Expected number",
                     context
-                ))
+                )
 
-        end_value = res.register(self.visit(node.end_value_node, context, bin_op_right))
-        if res.should_return(): return res
+        end_value = self.visit(node.end_value_node, context, bin_op_right)
 
         if not isinstance(end_value, Number):
-                return res.failure(RTError(
-                    end_value.pos_start, end_value.pos_end,
+                raise RTError(
+                    node.end_value_node.pos_start, node.end_value_node.pos_end,
                     "Expected number",
                     context
-                ))
+                )
 
         if node.step_value_node:
-            step_value = res.register(self.visit(node.step_value_node, context, bin_op_right))
-            if res.should_return(): return res
+            step_value = self.visit(node.step_value_node, context, bin_op_right)
 
             if not isinstance(step_value, Number):
-                return res.failure(RTError(
-                    step_value.pos_start, step_value.pos_end,
+                raise RTError(
+                    node.step_value_node.pos_start, node.step_value_node.pos_end,
                     "Expected number",
                     context
-                ))
-        else:
-            step_value = Number(1)
-
-        i = start_value.value
-
-        if step_value.value >= 0:
-            condition = lambda: i < end_value.value
+                )
         else:
-            condition = lambda: i > end_value.value
+            step_value = number(1)
 
-        while condition():
-            context.symbol_table.set(node.var_name_tok.value, Number(i))
-            i += step_value.value
+        variables, key = loop_variable(context.symbol_table, node.slot, node.var_name_tok.value)
 
-            value = res.register(self.visit(node.body_node, context, bin_op_right))
-            if res.should_return() and res.loop_should_continue == False and res.loop_should_break == False: return res
+        for i in counted_range(start_value.value, end_value.value, step_value.value):
+            variables[key] = number(i)
 
-            if res.loop_should_continue:
+            try:
+                if collect:
+                    elements.append(self.visit(node.body_node, context, bin_op_right))
+                else:
+                    self.visit_discarded(node.body_node, context, bin_op_right)
+            except LoopContinue:
                 continue
-
-            if res.loop_should_break:
+            except LoopBreak:
                 break
 
-            elements.append(value)
+        return List(elements) if collect else null
 
-        return res.success(
-            Null() if node.should_return_null else
-            List(elements).set_context(context).set_pos(node.pos_start, node.pos_end)
-        )
-
-    def visit_ForObjectNode(self, node, context, bin_op_right=False):
-        res = RTResult()
+    def visit_ForObjectNode(self, node, context, bin_op_right=False, discard=False):
+        collect = not (discard or node.should_return_null)
         elements = []
 
-        _object = res.register(self.visit(node.object_tok, context, bin_op_right))
-        if res.should_return(): return res
+        _object = self.visit(node.object_tok, context, bin_op_right)
 
         if not isinstance(_object, Object):
-                return res.failure(RTError(
-                    _object.pos_start, _object.pos_end,
+                raise RTError(
+                    node.object_tok.pos_start, node.object_tok.pos_end,
                     "Expected object",
                     context
-                ))
+                )
 
         for k, v in _object.elements.items():
-            context.symbol_table.set(node.var_name_key_tok.value, String(str(k)))
-            context.symbol_table.set(node.var_name_value_tok.value, v)
-
-            value = res.register(self.visit(node.body_node, context, bin_op_right))
-            if res.should_return() and res.loop_should_continue == False and res.loop_should_break == False: return res
-
-            if res.loop_should_continue:
+            context.symbol_table.assign(node.key_slot, node.var_name_key_tok.value, String(str(k)))
+            context.symbol_table.assign(node.value_slot, node.var_name_value_tok.value, v)
+
+            try:
+                if collect:
+                    elements.append(self.visit(node.body_node, context, bin_op_right))
+                else:
+                    self.visit_discarded(node.body_node, context, bin_op_right)
+            except LoopContinue:
                 continue
-
-            if res.loop_should_break:
+            except LoopBreak:
                 break
 
-            elements.append(value)
-
-        return res.success(
-            Null() if node.should_return_null else
-            List(elements).set_context(context).set_pos(node.pos_start, node.pos_end)
-        )
+        return List(elements) if collect else null
     
-    def visit_ForListNode(self, node, context, bin_op_right=False):
-        res = RTResult()
+    def visit_ForListNode(self, node, context, bin_op_right=False, discard=False):
+        collect = not (discard or node.should_return_null)
         elements = []
 
-        _list = res.register(self.visit(node.list_tok, context, bin_op_right))
-        if res.should_return(): return res
+        _list = self.visit(node.list_tok, context, bin_op_right)
 
         if not isinstance(_list, List):
-                return res.failure(RTError(
-                    _list.pos_start, _list.pos_end,
+                raise RTError(
+                    node.list_tok.pos_start, node.list_tok.pos_end,
                     "Expected list",
                     context
-                ))
+                )
 
         for i in _list.elements:
-            context.symbol_table.set(node.var_name_tok.value, i)
-
-            value = res.register(self.visit(node.body_node, context, bin_op_right))
-            if res.should_return() and res.loop_should_continue == False and res.loop_should_break == False: return res
-
-            if res.loop_should_continue:
+            context.symbol_table.assign(node.slot, node.var_name_tok.value, i)
+
+            try:
+                if collect:
+                    elements.append(self.visit(node.body_node, context, bin_op_right))
+                else:
+                    self.visit_discarded(node.body_node, context, bin_op_right)
+            except LoopContinue:
                 continue
-
-            if res.loop_should_break:
+            except LoopBreak:
                 break
 
-            elements.append(value)
-
-        return res.success(
-            Null() if node.should_return_null else
-            List(elements).set_context(context).set_pos(node.pos_start, node.pos_end)
-        )
+        return List(elements) if collect else null
 
-    def visit_WhileNode(self, node, context, bin_op_right=False):
-        res = RTResult()
+    def visit_WhileNode(self, node, context, bin_op_right=False, discard=False):
+        collect = not (discard or node.should_return_null)
         elements = []
 
-        while True:
-            condition = res.register(self.visit(node.condition_node, context, bin_op_right))
-            if res.should_return(): return res
-
-            if not condition.is_true(): break
-
-            value = res.register(self.visit(node.body_node, context, bin_op_right))
-            if res.should_return() and res.loop_should_continue == False and res.loop_should_break == False: return res
-
-            if res.loop_should_continue:
+        while self.visit(node.condition_node, context, bin_op_right).is_true():
+            try:
+                if collect:
+                    elements.append(self.visit(node.body_node, context, bin_op_right))
+                else:
+                    self.visit_discarded(node.body_node, context, bin_op_right)
+            except LoopContinue:
                 continue
-
-            if res.loop_should_break:
+            except LoopBreak:
                 break
 
-            elements.append(value)
-
-        return res.success(
-            Null() if node.should_return_null else
-            List(elements).set_context(context).set_pos(node.pos_start, node.pos_end)
-        )
+        return List(elements) if collect else null
 
     def visit_FuncDefNode(self, node, context, bin_op_right=False):
-        res = RTResult()
-
         func_name = node.var_name_tok.value if node.var_name_tok else None
         body_node = node.body_node
         isPublic = node.public
-        func_value = Function(func_name, body_node, node.arg_name_toks, node.should_auto_return, isPublic, context).set_context(context).set_pos(node.pos_start, node.pos_end)
+        func_value = Function(func_name, body_node, node.arg_name_toks, node.should_auto_return, isPublic, context, scope=node.scope)
 
         if node.var_name_tok:
-            context.symbol_table.set(func_name, (func_value))
+            context.symbol_table.declare(node.slot, func_name, func_value, isPublic)
 
-        return res.success(func_value)
+        return func_value
     
     def visit_CallNode(self, node, context, bin_op_right=False):
-        res = RTResult()
         args = []
 
-        value_to_call = res.register(self.visit(node.node_to_call, context, bin_op_right))
-        if res.should_return(): return res
-        value_to_call = value_to_call.copy().set_pos(node.pos_start, node.pos_end).set_context(context)
+        value_to_call = self.visit(node.node_to_call, context, bin_op_right)
         for arg_node in node.arg_nodes:
-            args.append(res.register(self.visit(arg_node, value_to_call.lib if isinstance(value_to_call, Function) else context, bin_op_right)))
-            if res.should_return(): return res
+            args.append(self.visit(arg_node, context, bin_op_right))
 
-        return_value = res.register(value_to_call.execute(args))
-        if res.should_return(): return res
-        return_value = return_value.copy().set_pos(node.pos_start, node.pos_end).set_context(context)
-        return res.success(return_value)
+        return value_to_call.execute(args, context, node.pos_start, node.pos_end)
 
     def visit_ImportNode(self, node, context, bin_op_right=False):
-        res = RTResult()
-
-        lib_name = res.register(self.visit(node.lib_name, context, bin_op_right))
-        if res.should_return(): return res
+        lib_name = self.visit(node.lib_name, context, bin_op_right)
 
         if not isinstance(lib_name, String):
-            return RTResult().failure(RTError(
+            raise RTError(
                 node.pos_start, node.pos_end,
                 "Lib name must be string",
                 context
-            ))
+            )
 
         var_name = node.var_name.value
 
         if not var_name:
-            return RTResult().failure(RTError(
+            raise RTError(
                 var_name.pos_start, var_name.pos_end,
                 "Expected identfier",
                 context
-            ))
+            )
 
         lib_name = lib_name.value
 
@@ -490,54 +492,44 @@ class Interpreter:
             path = lib_dir + "\\" + lib_name + file_id
 
         try:
-            with open(path, "r") as f:
-                script = f.read()
-                f.close()
+            script = read_source(path)
         except Exception as e:
-            return RTResult().failure(RTError(
+            raise RTError(
                 node.pos_start, node.pos_end,
                 F"Failed to load script \"{path}\"\n" + str(e),
                 context
-            ))
+            )
         
         from BananaPlus import import_lib
 
-        symbol_table, result, error = import_lib(lib_name, script, context)
+        symbol_table, result, error = import_lib(lib_name, script, context, path)
 
         if error:
-            return RTResult().failure(RTError(
+            raise RTError(
                 node.pos_start, node.pos_end,
                 f"Failed to finish executing script \"{path}\"\n" + error.as_string(),
                 context
-            ))
+            )
 
-        items_to_push = {}
+        symbols = symbol_table.symbols
+        items_to_push = {key: symbols[key] for key in symbol_table.exports or ()}
 
-        for key, value in symbol_table.symbols.items():
-            if isinstance(value, Function):
-                if value.isPublic:
-                    items_to_push[key] = value
-            elif isinstance(value, tuple):
-                if value[1] == True:
-                    items_to_push[key] = value
+        context.symbol_table.assign(node.slot, var_name, Object(items_to_push))
 
-        context.symbol_table.set(var_name, Object(items_to_push))
-
-        return RTResult().success(Null().set_context(context).set_pos(node.pos_start, node.pos_end))
+        return null
     
     def visit_ReturnNode(self, node, context, bin_op_right=False):
-        res = RTResult()
-
         if node.node_to_return:
-            value = res.register(self.visit(node.node_to_return, context, bin_op_right))
-            if res.should_return(): return res
+            value = self.visit(node.node_to_return, context, bin_op_right)
         else:
-            value = Null()
+            value = null
 
-        return res.success_return(value)
+        raise FuncReturn(value)
 
     def visit_ContinueNode(self, node, context, bin_op_right=False):
-        return RTResult().success_continue()
+        raise LoopContinue
     
     def visit_BreakNode(self, node, context, bin_op_right=False):
-        return RTResult().success_break()
\ No newline at end of file
+        raise LoopBreak
+
+Interpreter.dispatch = build_dispatch(Interpreter, 'visit_')
@@ -1,237 +1,242 @@
+import gc
+import re
+import sys
+from collections import deque
 from src.token import Token
-from src.position import Position
+from src.position import Source, decode
 from src.rt_types import *
 from src.errors import IllegalCharError, ExpectedCharError
 
+# Every token, after any run of spaces before it. Every character that is
+# not a space is matched by some alternative, so the matches returned by one
+# findall cover the whole text back to back and the offsets of the tokens
+# follow from their lengths
+TOKENS = [
+    r"[A-Za-z][A-Za-z0-9_]*",
+    r"//[^\n]*\n?",
+    r"[-+=!<>]=|=>|[-+*/^()\[\]{}:.?,=<>]",
+    r"[0-9]+(?:\.[0-9]*)?",
+    r"[;\n]",
+    # Plain or escaped characters, a backslash left dangling at the end of
+    # the file, then the closing quote if there is one
+    r"\"(?:[^\"\\]|\\.)*\\?\"?",
+    r"'(?:[^'\\]|\\.)*\\?'?"
+]
+TOKEN_RE = re.compile(r"[ \t]*(?:" + "|".join(TOKENS + [r"[^ \t]"]) + ")", re.DOTALL)
+# The same tokens in the bytes of a mapped source, which text mode reading
+# has not turned the line ends of into newlines. A Windows line end or a
+# carriage return on its own is one newline token, a comment stops at
+# either, and a character outside ASCII is one illegal token rather than
+# one per byte
+TOKENS_BYTES = [
+    r"\r\n?",
+    r"//[^\r\n]*(?:\r\n?|\n)?"
+] + [token for token in TOKENS if not token.startswith("//")]
+TOKEN_BYTES_RE = re.compile((r"[ \t]*(?:" + "|".join(TOKENS_BYTES + [
+    r"[\xc0-\xff][\x80-\xbf]*",
+    r"[^ \t]"
+]) + ")").encode('latin-1'), re.DOTALL)
+STRING_RE = re.compile(r"([\"'])((?:(?!\1)[^\\]|\\.)*)\\?(\1?)", re.DOTALL)
+ESCAPE_RE = re.compile(r"\\(.)", re.DOTALL)
+
+OPERATORS = {
+    "+": TT_PLUS,
+    "+=": TT_PE,
+    "-": TT_MINUS,
+    "-=": TT_ME,
+    "*": TT_MUL,
+    "/": TT_DIV,
+    "^": TT_POW,
+    "(": TT_LPAREN,
+    ")": TT_RPAREN,
+    "[": TT_LSQUARE,
+    "]": TT_RSQUARE,
+    "{": TT_LCURLY,
+    "}": TT_RCURLY,
+    ":": TT_COLON,
+    ".": TT_DOT,
+    "?": TT_QM,
+    ",": TT_COMMA,
+    "=": TT_EQ,
+    "==": TT_EE,
+    "=>": TT_ARROW,
+    "!=": TT_NE,
+    "<": TT_LT,
+    "<=": TT_LTE,
+    ">": TT_GT,
+    ">=": TT_GTE
+}
+
+KEYWORDS_SET = frozenset(KEYWORDS_LIST)
+
+# String literals up to this length are interned along with every name
+INTERN_LENGTH = 32
+
+class InternTable:
+    # Every identifier and short string literal lexed during one run, so
+    # that each name is one shared str instead of a copy per occurrence.
+    # This saves memory, not time: str hashes are cached and equal short
+    # strs compare quickly, so benchmarks/bench_interning.py measures no
+    # faster lookups. A table belongs to the run, or the Document, that
+    # lexes with it and goes away along with it
+    def __init__(self):
+        self.strings = {}
+        self.lookups = 0
+        self.misses = 0
+
+    def add(self, value):
+        self.misses += 1
+        # sys.intern rather than the first copy seen, so names also share
+        # the str that keywords and built-in names were compiled with
+        value = self.strings[value] = sys.intern(value)
+        return value
+
+    def hit_rate(self):
+        if not self.lookups: return 0.0
+        return (self.lookups - self.misses) / self.lookups
+
+def latin_1(data):
+    # One char per byte, so offsets into a mapped source are unchanged
+    return str(data, 'latin-1')
+
+def unescape(match):
+    return escape_characters.get(match.group(1), match.group(1))
+
 class Lexer:
-    def __init__(self, fn, text):
+    def __init__(self, fn, text, interned=None, source=None):
         self.fn = fn
         self.text = text
-        self.pos = Position(-1, 0, -1, fn, text)
-        self.current_char = None
-        self.advance()
-
-    def advance(self):
-        self.pos.advance(self.current_char)
-        self.current_char = self.text[self.pos.idx] if self.pos.idx < len(self.text) else None
+        self.source = source if source != None else Source(fn, text)
+        self.interned = interned if interned != None else InternTable()
+        self.error = None
 
     def make_tokens(self):
-        tokens = []
-
-        while self.current_char != None:
-            if self.current_char in char_spaces:
-                self.advance()
-            elif self.current_char in char_new_lines:
-                tokens.append(Token(TT_NEWLINE, pos_start=self.pos))
-                self.advance()
-            elif self.current_char in DIGITS:
-                tokens.append(self.make_number())
-            elif self.current_char in LETTERS:
-                tokens.append(self.make_identifier())
-            elif self.current_char in ('"', "'"):
-                tokens.append(self.make_string())
-            elif self.current_char == "+":
-                tokens.append(self.make_plus())
-            elif self.current_char == "-":
-                tokens.append(self.make_minus())
-            elif self.current_char == "*":
-                tokens.append(Token(TT_MUL, pos_start=self.pos))
-                self.advance()
-            elif self.current_char == "/":
-                token, error = self.make_slash()
-                if error: return [], error
-                if token != None:
-                    tokens.append(token)
-            elif self.current_char == "^":
-                tokens.append(Token(TT_POW, pos_start=self.pos))
-                self.advance()
-            elif self.current_char == "(":
-                tokens.append(Token(TT_LPAREN, pos_start=self.pos))
-                self.advance()
-            elif self.current_char == ")":
-                tokens.append(Token(TT_RPAREN, pos_start=self.pos))
-                self.advance()
-            elif self.current_char == "[":
-                tokens.append(Token(TT_LSQUARE, pos_start=self.pos))
-                self.advance()
-            elif self.current_char == "]":
-                tokens.append(Token(TT_RSQUARE, pos_start=self.pos))
-                self.advance()
-            elif self.current_char == "{":
-                tokens.append(Token(TT_LCURLY, pos_start=self.pos))
-                self.advance()
-            elif self.current_char == "}":
-                tokens.append(Token(TT_RCURLY, pos_start=self.pos))
-                self.advance()
-            elif self.current_char == ":":
-                tokens.append(Token(TT_COLON, pos_start=self.pos))
-                self.advance()
-            elif self.current_char == ".":
-                tokens.append(Token(TT_DOT, pos_start=self.pos))
-                self.advance()
-            elif self.current_char == "?":
-                tokens.append(Token(TT_QM, pos_start=self.pos))
-                self.advance()
-            elif self.current_char == "!":
-                tok, error = self.make_not_equals()
-                if error: return [], error
-                tokens.append(tok)
-            elif self.current_char == "=":
-                tokens.append(self.make_equals())
-            elif self.current_char == "<":
-                tokens.append(self.make_less_than())
-            elif self.current_char == ">":
-                tokens.append(self.make_greater_than())
-            elif self.current_char == ",":
-                tokens.append(Token(TT_COMMA, pos_start=self.pos))
-                self.advance()
-            else:
-                pos_start = self.pos.copy()
-                char = self.current_char
-                self.advance()
-                return [], IllegalCharError(pos_start, self.pos, "'" + char + "'")
-        
-        tokens.append(Token(TT_EOF, pos_start=self.pos))
+        # Tokens never form reference cycles, so the collector is kept from
+        # rescanning the growing token list over and over
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        self.error = None
+        try:
+            tokens = list(self.scan(self.values(False)))
+        finally:
+            if gc_enabled: gc.enable()
+
+        if self.error: return [], self.error
         return tokens, None
-    
-    def skip_comment(self):  
-        self.advance()
-
-        while self.current_char != '\n' and self.current_char != None:
-            self.advance()
-        self.advance()
-
-    def make_slash(self):
-        pos_start = self.pos.copy()
-
-        self.advance()
-
-        if self.current_char == "/":
-            self.skip_comment()
-            return None, None
-        
-        return Token(TT_DIV, pos_start=pos_start), None
-
-    def make_number(self):
-        num_str = ''
-        dot_count = 0
-        pos_start = self.pos.copy()
-
-        while self.current_char != None and self.current_char in DIGITS + '.':
-            if self.current_char == '.':
-                if dot_count == 1: break
-                dot_count += 1
-                num_str += "."
-            else:
-                num_str += self.current_char
-            self.advance()
-
-        if dot_count == 0:
-            return Token(TT_INT, int(num_str), pos_start, self.pos)
-        else:
-            return Token(TT_FLOAT, float(num_str), pos_start, self.pos)
-
-    def make_string(self):
-        string = ''
-        pos_start = self.pos.copy()
-        escape_character = False
-
-        started_quote = self.current_char
-
-        self.advance()
-
-        while self.current_char != None and (self.current_char != started_quote or escape_character):
-            if escape_character:
-                string += escape_characters.get(self.current_char, self.current_char)
-                escape_character = False
-            else:
-                if self.current_char == "\\":
-                    escape_character = True
-                else:
-                    string += self.current_char
-            self.advance()
-
-        self.advance()
-
-        return Token(TT_STRING, string, pos_start, self.pos)
-
-    def make_identifier(self):
-        id_str = ''
-        pos_start = self.pos.copy()
-
-        while self.current_char != None and self.current_char in LETTERS_DIGITS + '_':
-            id_str += self.current_char
-            self.advance()
-
-        tok_type = TT_KEYWORD if id_str in KEYWORDS_LIST else TT_IDENTIFIER
-        return Token(tok_type, id_str, pos_start, self.pos)
-
-    def make_not_equals(self):
-        pos_start = self.pos.copy()
-        self.advance()
-
-        if self.current_char == "=":
-            self.advance()
-            return Token(TT_NE, pos_start=pos_start, pos_end=self.pos), None
-        
-        self.advance()
-        return None, ExpectedCharError(pos_start, self.pos, "'=' (after '!')")
-
-    def make_equals(self):
-        tok_type = TT_EQ
-        pos_start = self.pos.copy()
-        self.advance()
-
-        if self.current_char == "=":
-            self.advance()
-            tok_type = TT_EE
-        elif self.current_char == ">":
-            self.advance()
-            tok_type = TT_ARROW
-
 
-        return Token(tok_type, pos_start=pos_start, pos_end=self.pos)
-
-    def make_less_than(self):
-        tok_type = TT_LT
-        pos_start = self.pos.copy()
-        self.advance()
-
-        if self.current_char == "=":
-            self.advance()
-            tok_type = TT_LTE
-
-        return Token(tok_type, pos_start=pos_start, pos_end=self.pos)
-
-    def make_greater_than(self):
-        tok_type = TT_GT
-        pos_start = self.pos.copy()
-        self.advance()
-
-        if self.current_char == "=":
-            self.advance()
-            tok_type = TT_GTE
-
-        return Token(tok_type, pos_start=pos_start, pos_end=self.pos)
-
-    def make_plus(self):
-        tok_type = TT_PLUS
-        pos_start = self.pos.copy()
-        self.advance()
-
-        if self.current_char == "=":
-            self.advance()
-            tok_type = TT_PE
-
-        return Token(tok_type, pos_start=pos_start, pos_end=self.pos)
-    
-    def make_minus(self):
-        tok_type = TT_MINUS
-        pos_start = self.pos.copy()
-        self.advance()
-
-        if self.current_char == "=":
-            self.advance()
-            tok_type = TT_ME
-
-        return Token(tok_type, pos_start=pos_start, pos_end=self.pos)
\ No newline at end of file
+    def stream(self):
+        # The same tokens as make_tokens, lexed one at a time as they are
+        # asked for. A lexing error ends the stream with an EOF token at the
+        # offending character and is left in self.error, which takes
+        # precedence over whatever the parser made of the cut off stream
+        return self.scan(self.values(True))
+
+    def values(self, lazy):
+        # The text of every token with the spaces before it. Mapped sources
+        # are always matched one token at a time, so no copy of the file is
+        # ever made, and each match is read back as latin-1 so that its
+        # length is its length in bytes
+        if self.source.mapped:
+            return map(latin_1, map(re.Match.group, TOKEN_BYTES_RE.finditer(self.text)))
+        if lazy:
+            return map(re.Match.group, TOKEN_RE.finditer(self.text))
+        return TOKEN_RE.findall(self.text)
+
+    def scan(self, values):
+        text = self.text
+        keywords = KEYWORDS_SET
+        operators = OPERATORS
+        interned = self.interned
+        strings = interned.strings
+        lookups = 0
+        mapped = self.source.mapped
+        spaces = char_spaces
+        new_lines = char_new_lines + '\r' if mapped else char_new_lines
+        line_ends = '\r\n' if mapped else '\n'
+        end = self.source.base
+        # A comment or string cut off by the end of the file still steps
+        # over its missing newline or quote, which moves the EOF token
+        overrun = 0
+
+        try:
+            for value in values:
+                end += len(value)
+                if value[0] in spaces: value = value.lstrip(spaces)
+                first = value[0]
+                pos = end - len(value)
+
+                if first in LETTERS:
+                    lookups += 1
+                    value = strings.get(value) or interned.add(value)
+                    yield Token(TT_KEYWORD if value in keywords else TT_IDENTIFIER, value, pos, end)
+                elif value in operators:
+                    yield Token(operators[value], None, pos, end)
+                elif first in DIGITS:
+                    if '.' in value:
+                        yield Token(TT_FLOAT, float(value), pos, end)
+                    else:
+                        yield Token(TT_INT, int(value), pos, end)
+                elif first in new_lines:
+                    yield Token(TT_NEWLINE, None, pos, end)
+                elif first in '"\'':
+                    quote, value, closed = STRING_RE.match(value).groups()
+                    if not closed: overrun = 1
+                    if mapped and not (value.isascii() and '\r' not in value): value = decode(value.encode('latin-1'))
+                    if '\\' in value: value = ESCAPE_RE.sub(unescape, value)
+                    if value and len(value) <= INTERN_LENGTH:
+                        lookups += 1
+                        value = strings.get(value) or interned.add(value)
+                    yield Token(TT_STRING, value, pos, end + overrun)
+                elif value.startswith('//'):
+                    if value[-1] not in line_ends: overrun = 1
+                else:
+                    if first == '!':
+                        self.error = ExpectedCharError(pos, pos + 2, "'=' (after '!')")
+                    else:
+                        if mapped: value = decode(value.encode('latin-1'))
+                        self.error = IllegalCharError(pos, end, "'" + value + "'")
+                    yield Token(TT_EOF, None, pos)
+                    return
+
+            yield Token(TT_EOF, None, self.source.base + len(text) + overrun)
+        finally:
+            # Counted here rather than per token, as the stream may be left
+            # unfinished
+            interned.lookups += lookups
+
+class TokenStream:
+    # Feeds the parser from Lexer.stream(), keeping only the last `window`
+    # tokens. The parser indexes it like a token list; stepping back past the
+    # window, which only a long failed statement does, lexes again from the
+    # start of the file
+    def __init__(self, lexer, window=64):
+        self.lexer = lexer
+        self.window = window
+        self.restarts = -1
+        self.restart()
+
+    def restart(self):
+        self.tokens = self.lexer.stream()
+        self.buffer = deque(maxlen=self.window)
+        self.start = 0
+        self.done = False
+        self.restarts += 1
+
+    def __getitem__(self, idx):
+        if idx < self.start:
+            self.restart()
+
+        buffer = self.buffer
+        while idx >= self.start + len(buffer):
+            if self.done: raise IndexError(idx)
+            tok = next(self.tokens)
+            if len(buffer) == self.window: self.start += 1
+            buffer.append(tok)
+            self.done = tok.type == TT_EOF
+
+        return buffer[idx - self.start]
+
+    def finish(self):
+        # Lexes whatever the parser left unread, so that a lexing error after
+        # a syntax error is reported first, as it is for a full token list
+        for tok in self.tokens: pass
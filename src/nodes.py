@@ -1,4 +1,6 @@
 class NumberNode:
+	__slots__ = ('tok', 'pos_start', 'pos_end')
+
 	def __init__(self, tok, pos_start, pos_end):
 		self.tok = tok
 
@@ -6,6 +8,8 @@ class NumberNode:
 		self.pos_end = pos_end
 
 class StringNode:
+	__slots__ = ('tok', 'pos_start', 'pos_end')
+
 	def __init__(self, tok, pos_start, pos_end):
 		self.tok = tok
 
@@ -13,6 +17,8 @@ class StringNode:
 		self.pos_end = pos_end
 
 class ListNode:
+	__slots__ = ('element_nodes', 'pos_start', 'pos_end')
+
 	def __init__(self, element_nodes, pos_start, pos_end):
 		self.element_nodes = element_nodes
 
@@ -20,6 +26,8 @@ class ListNode:
 		self.pos_end = pos_end
 
 class ObjectNode:
+	__slots__ = ('element_nodes', 'pos_start', 'pos_end')
+
 	def __init__(self, element_nodes, pos_start, pos_end):
 		self.element_nodes = element_nodes
 
@@ -27,6 +35,8 @@ class ObjectNode:
 		self.pos_end = pos_end
 
 class BooleanNode:
+	__slots__ = ('value', 'pos_start', 'pos_end')
+
 	def __init__(self, value, pos_start, pos_end):
 		self.value = value
 
@@ -34,38 +44,51 @@ class BooleanNode:
 		self.pos_end = pos_end
 
 class NullNode:
+	__slots__ = ('pos_start', 'pos_end')
+
 	def __init__(self, pos_start, pos_end):
 		self.pos_start = pos_start
 		self.pos_end = pos_end
 
 class VarAccessNode:
+	__slots__ = ('var_name_tok', 'slot', 'pos_start', 'pos_end')
+
 	def __init__(self, var_name_tok, pos_start, pos_end):
 		self.var_name_tok = var_name_tok
+		self.slot = None
 
 		self.pos_start = pos_start
 		self.pos_end = pos_end
 
 class VarAssignNode:
+	__slots__ = ('var_name_tok', 'value_node', 'assign_type', 'public', 'update', 'slot', 'pos_start', 'pos_end')
+
 	def __init__(self, var_name_tok, value_node, assign_type, public, update=False, pos_start=None, pos_end=None):
 		self.var_name_tok = var_name_tok
 		self.value_node = value_node
 		self.assign_type = assign_type
 		self.public = public
 		self.update = update
+		self.slot = None
 
 		self.pos_start = pos_start
 		self.pos_end = pos_end
 
 class MultiVarAssignNode:
+	__slots__ = ('var_name_toks', 'value_node', 'assign_type', 'slot', 'pos_start', 'pos_end')
+
 	def __init__(self, var_name_toks, value_node, assign_type, pos_start, pos_end):
 		self.var_name_toks = var_name_toks
 		self.value_node = value_node
 		self.assign_type = assign_type
+		self.slot = None
 
 		self.pos_start = pos_start
 		self.pos_end = pos_end
 
 class BinOpNode:
+	__slots__ = ('left_node', 'op_tok', 'right_node', 'pos_start', 'pos_end')
+
 	def __init__(self, left_node, op_tok, right_node, pos_start, pos_end):
 		self.left_node = left_node
 		self.op_tok = op_tok
@@ -78,6 +101,8 @@ class BinOpNode:
 		return f'({self.left_node}, {self.op_tok}, {self.right_node})'
 
 class UnaryOpNode:
+    __slots__ = ('op_tok', 'node', 'pos_start', 'pos_end')
+
     def __init__(self, op_tok, node, pos_start, pos_end):
         self.op_tok = op_tok
         self.node = node
@@ -89,6 +114,8 @@ class UnaryOpNode:
         return f'({self.op_tok}, {self.node})'
 
 class IfNode:
+	__slots__ = ('cases', 'else_case', 'pos_start', 'pos_end')
+
 	def __init__(self, cases, else_case, pos_start, pos_end):
 		self.cases = cases
 		self.else_case = else_case
@@ -97,6 +124,8 @@ class IfNode:
 		self.pos_end = pos_end
 
 class SwitchNode:
+	__slots__ = ('value_node', 'cases', 'default', 'pos_start', 'pos_end')
+
 	def __init__(self, value_node, cases, default, pos_start, pos_end):
 		self.value_node = value_node
 		self.cases = cases
@@ -106,6 +135,8 @@ class SwitchNode:
 		self.pos_end = pos_end
 
 class ForNode:
+	__slots__ = ('var_name_tok', 'start_value_node', 'end_value_node', 'step_value_node', 'body_node', 'should_return_null', 'slot', 'pos_start', 'pos_end')
+
 	def __init__(self, var_name_tok, start_value_node, end_value_node, step_value_node, body_node, should_return_null, pos_start, pos_end):
 		self.var_name_tok = var_name_tok
 		self.start_value_node = start_value_node
@@ -113,32 +144,42 @@ class ForNode:
 		self.step_value_node = step_value_node
 		self.body_node = body_node
 		self.should_return_null = should_return_null
+		self.slot = None
 
 		self.pos_start = pos_start
 		self.pos_end = pos_end
 
 class ForObjectNode:
+	__slots__ = ('var_name_key_tok', 'var_name_value_tok', 'object_tok', 'body_node', 'should_return_null', 'key_slot', 'value_slot', 'pos_start', 'pos_end')
+
 	def __init__(self, var_name_key_tok, var_name_value_tok, object_tok, body_node, should_return_null, pos_start, pos_end):
 		self.var_name_key_tok = var_name_key_tok
 		self.var_name_value_tok = var_name_value_tok
 		self.object_tok = object_tok
 		self.body_node = body_node
 		self.should_return_null = should_return_null
+		self.key_slot = None
+		self.value_slot = None
 
 		self.pos_start = pos_start
 		self.pos_end = pos_end
 
 class ForListNode:
+	__slots__ = ('var_name_tok', 'list_tok', 'body_node', 'should_return_null', 'slot', 'pos_start', 'pos_end')
+
 	def __init__(self, var_name_tok, list_tok, body_node, should_return_null, pos_start, pos_end):
 		self.var_name_tok = var_name_tok
 		self.list_tok = list_tok
 		self.body_node = body_node
 		self.should_return_null = should_return_null
+		self.slot = None
 
 		self.pos_start = pos_start
 		self.pos_end = pos_end
 
 class WhileNode:
+	__slots__ = ('condition_node', 'body_node', 'should_return_null', 'pos_start', 'pos_end')
+
 	def __init__(self, condition_node, body_node, should_return_null, pos_start, pos_end):
 		self.condition_node = condition_node
 		self.body_node = body_node
@@ -148,17 +189,23 @@ class WhileNode:
 		self.pos_end = pos_end
 
 class FuncDefNode:
+	__slots__ = ('var_name_tok', 'arg_name_toks', 'body_node', 'should_auto_return', 'public', 'slot', 'scope', 'pos_start', 'pos_end')
+
 	def __init__(self, var_name_tok, arg_name_toks, body_node, should_auto_return, public, pos_start, pos_end):
 		self.var_name_tok = var_name_tok
 		self.arg_name_toks = arg_name_toks
 		self.body_node = body_node
 		self.should_auto_return = should_auto_return
 		self.public = public
+		self.slot = None
+		self.scope = None
 
 		self.pos_start = pos_start
 		self.pos_end = pos_end
 
 class CallNode:
+	__slots__ = ('node_to_call', 'arg_nodes', 'pos_start', 'pos_end')
+
 	def __init__(self, node_to_call, arg_nodes, pos_start, pos_end):
 		self.node_to_call = node_to_call
 		self.arg_nodes = arg_nodes
@@ -167,6 +214,8 @@ class CallNode:
 		self.pos_end = pos_end
 
 class ReturnNode:
+	__slots__ = ('node_to_return', 'pos_start', 'pos_end')
+
 	def __init__(self, node_to_return, pos_start, pos_end):
 		self.node_to_return = node_to_return
 
@@ -174,19 +223,28 @@ class ReturnNode:
 		self.pos_end = pos_end
 
 class ContinueNode:
+	__slots__ = ('pos_start', 'pos_end')
+
 	def __init__(self, pos_start, pos_end):
 		self.pos_start = pos_start
 		self.pos_end = pos_end
 
 class BreakNode:
+	__slots__ = ('pos_start', 'pos_end')
+
 	def __init__(self, pos_start, pos_end):
 		self.pos_start = pos_start
 		self.pos_end = pos_end
 
 class ImportNode:
+	__slots__ = ('lib_name', 'var_name', 'slot', 'pos_start', 'pos_end')
+
 	def __init__(self, lib_name, var_name, pos_start, pos_end):
 		self.lib_name = lib_name
 		self.var_name = var_name
+		self.slot = None
 
 		self.pos_start = pos_start
-		self.pos_end = pos_end
\ No newline at end of file
+		self.pos_end = pos_end
+
+LOOP_NODES = (ForNode, ForObjectNode, ForListNode, WhileNode)
\ No newline at end of file
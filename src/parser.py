@@ -3,10 +3,50 @@ from src.rt_types import *
 from src.nodes import *
 from src.results import ParseResult
 
+# How tightly each binary operator binds, keyed by token type or, for
+# keywords, by value. A sign binds tighter than every binary operator but
+# '^', whose left operand cannot have one
+LOGIC = 1
+COMPARISON = 2
+SIGN = 5
+EXPONENT = 6
+BINARY_POWERS = {
+    KEYWORDS.AND: LOGIC, KEYWORDS.OR: LOGIC,
+    TT_EE: COMPARISON, TT_NE: COMPARISON, TT_LT: COMPARISON, TT_GT: COMPARISON, TT_LTE: COMPARISON, TT_GTE: COMPARISON,
+    TT_PLUS: 3, TT_MINUS: 3,
+    TT_MUL: 4, TT_DIV: 4,
+    TT_POW: EXPONENT,
+}
+
+# Tokens an expression can start with, by type and, for keywords, by value.
+# A statement can also start with 'return', 'continue' or 'break'. Whether
+# to parse one more expression or statement is decided from the current
+# token alone, so no token is ever parsed twice
+EXPR_START_TYPES = (TT_INT, TT_FLOAT, TT_STRING, TT_IDENTIFIER, TT_LPAREN, TT_LSQUARE, TT_LCURLY, TT_PLUS, TT_MINUS)
+EXPR_START_KEYWORDS = (
+    KEYWORDS.VAR, KEYWORDS.NOT, KEYWORDS.NULL, KEYWORDS.TRUE, KEYWORDS.FALSE, KEYWORDS.IF, KEYWORDS.FOR, KEYWORDS.WHILE,
+    KEYWORDS.FUNCTION, KEYWORDS.IMPORT, KEYWORDS.SWITCH, KEYWORDS.PRIVATE, KEYWORDS.PUBLIC
+)
+STATEMENT_START_KEYWORDS = EXPR_START_KEYWORDS + (KEYWORDS.RETURN, KEYWORDS.CONTINUE, KEYWORDS.BREAK)
+
+# Recovery gives up after this many errors in one script
+MAX_ERRORS = 100
+OPENING_BRACKETS = (TT_LPAREN, TT_LSQUARE, TT_LCURLY)
+CLOSING_BRACKETS = (TT_RPAREN, TT_RSQUARE, TT_RCURLY)
+# Keywords that start a statement but never an element of a list or object,
+# so a line starting with one ends recovery even inside an open bracket
+SYNC_KEYWORDS = (
+    KEYWORDS.VAR, KEYWORDS.IF, KEYWORDS.FOR, KEYWORDS.WHILE, KEYWORDS.FUNCTION, KEYWORDS.IMPORT, KEYWORDS.SWITCH,
+    KEYWORDS.PRIVATE, KEYWORDS.PUBLIC, KEYWORDS.RETURN, KEYWORDS.CONTINUE, KEYWORDS.BREAK
+)
+
 class Parser:
     def __init__(self, tokens):
         self.tokens = tokens
         self.tok_idx = -1
+        # Set by a 'public' or 'private' keyword for the variable or function
+        # right after it
+        self.public = False
 
         self.advance()
 
@@ -15,48 +55,111 @@ class Parser:
         self.update_current_tok()
         return self.current_tok
 
-    def deadvance(self, ignore_newline=False):
-        self.tok_idx -= 1
-        self.update_current_tok()
-        if self.current_tok.type == TT_NEWLINE and ignore_newline:
-            return self.deadvance()
-        return self.current_tok
-
     def skip_newline(self, res=None):
         while self.current_tok.type == TT_NEWLINE:
             if res: res.register_advancement()
             self.advance()
         return self.current_tok
 
-    def reverse(self, amount=1):
-        self.tok_idx -= amount
-        self.update_current_tok()
-        return self.current_tok
+    def starts(self, keywords):
+        # Whether the current token can start an expression, or a statement
+        # when given STATEMENT_START_KEYWORDS
+        tok = self.current_tok
+        if tok.type == TT_KEYWORD: return tok.value in keywords
+        return tok.type in EXPR_START_TYPES
 
     def update_current_tok(self):
-        if self.tok_idx >= 0 and self.tok_idx < len(self.tokens):
-            self.current_tok = self.tokens[self.tok_idx]
-
-    def parse(self):
-        res = self.statements()
+        # tokens is either the full token list or a TokenStream, so the end
+        # is found by indexing past it rather than by its length
+        if self.tok_idx >= 0:
+            try:
+                self.current_tok = self.tokens[self.tok_idx]
+            except IndexError:
+                pass
+
+    def parse(self, starts=None, errors=None):
+        # starts, when given, collects the index of the first token of every
+        # top level statement. errors, when given, turns on recovery: every
+        # syntax error is added to it, and the result holds the first
+        if errors != None: return self.recover(starts, errors)
+
+        res = self.statements(starts)
         if not res.error and self.current_tok.type not in (TT_EOF, TT_KEYWORD, TT_DOT):
-            self.deadvance()
+            return res.failure(self.unexpected())
+        return res
 
-            if self.current_tok.matches(TT_KEYWORD, KEYWORDS.AS):
-                self.advance()
-                if self.current_tok.type == TT_IDENTIFIER:
-                    return res
-                self.deadvance()
+    def unexpected(self):
+        return InvalidSyntaxError(self.current_tok.pos_start, self.current_tok.pos_end, f"Expected '.', '+', '-', '*', '/', '^', '==', '!=', '<', '>', <=', '>=', '{KEYWORDS.AND}' or '{KEYWORDS.OR}'")
 
+    def recover(self, starts, errors):
+        # After an error the rest of the failed statement is skipped and
+        # parsing goes on with the next line as a top level statement. The
+        # lines left of a block the error was in are parsed that way too,
+        # and the 'end', 'else' or 'elif' that closed it are skipped. Every
+        # token is parsed at most once, so one pass takes linear time however
+        # many errors the script has
+        res = ParseResult()
+        statements = []
+        pos_start = self.current_tok.pos_start
+        first_error = len(errors)
+
+        while len(errors) - first_error < MAX_ERRORS:
+            start_idx = self.tok_idx
+            part = self.statements(starts)
+            if part.error:
+                errors.append(part.error)
+            else:
+                statements.extend(part.node.element_nodes)
+                if self.current_tok.type == TT_EOF: break
+                # Before any error a stray keyword or dot ends the script, as
+                # it does without recovery. After one it is what is left of a
+                # block the error was in
+                if len(errors) == first_error:
+                    if self.current_tok.type in (TT_KEYWORD, TT_DOT): break
+                    errors.append(self.unexpected())
+
+            self.synchronize(start_idx)
+            # Only line breaks left after an error on the last line are not
+            # another statement that fails
+            idx = self.tok_idx
+            while self.tokens[idx].type == TT_NEWLINE: idx += 1
+            if self.tokens[idx].type == TT_EOF: break
+
+        if len(errors) > first_error: return res.failure(errors[first_error])
+        return res.success(ListNode(statements, pos_start, self.current_tok.pos_end))
+
+    def synchronize(self, start_idx):
+        # Skips to the line break ending the statement that started at
+        # start_idx. Brackets it left open are closed first, so the lines of
+        # a list or object spread over several lines are skipped along with
+        # it, unless a line starts with one of SYNC_KEYWORDS, as one after a
+        # bracket that is never closed does. At least one token is always
+        # skipped
+        depth = 0
+        for idx in range(max(start_idx, 0), self.tok_idx):
+            tok_type = self.tokens[idx].type
+            if tok_type in OPENING_BRACKETS: depth += 1
+            elif tok_type in CLOSING_BRACKETS: depth -= 1
+
+        if self.tok_idx == start_idx and self.current_tok.type != TT_EOF:
+            if self.current_tok.type in OPENING_BRACKETS: depth += 1
             self.advance()
-            
-            return res.failure(InvalidSyntaxError(self.current_tok.pos_start, self.current_tok.pos_end, f"Expected '.', '+', '-', '*', '/', '^', '==', '!=', '<', '>', <=', '>=', '{KEYWORDS.AND}' or '{KEYWORDS.OR}'"))
-        return res
 
-    def statements(self):
+        while self.current_tok.type != TT_EOF:
+            tok_type = self.current_tok.type
+            if tok_type == TT_NEWLINE:
+                if depth <= 0: break
+                self.advance()
+                if self.current_tok.type == TT_KEYWORD and self.current_tok.value in SYNC_KEYWORDS: break
+                continue
+            if tok_type in OPENING_BRACKETS: depth += 1
+            elif tok_type in CLOSING_BRACKETS: depth -= 1
+            self.advance()
+
+    def statements(self, starts=None):
         res = ParseResult()
         statements = []
-        pos_start = self.current_tok.pos_start.copy()
+        pos_start = self.current_tok.pos_start
 
         while self.current_tok.type == TT_NEWLINE:
             res.register_advancement()
@@ -66,9 +169,10 @@ class Parser:
                 return res.success(ListNode(
                     statements,
                     pos_start,
-                    self.current_tok.pos_end.copy()
+                    self.current_tok.pos_end
                 ))
 
+        if starts != None: starts.append(self.tok_idx)
         statement = res.register(self.statement())
         if res.error: return res
         statements.append(statement)
@@ -84,43 +188,41 @@ class Parser:
             if newline_count == 0:
                 more_statements = False
 
-            if not more_statements: break
-            statement = res.try_register(self.statement())
-            if not statement:
-                self.reverse(res.to_reverse_count)
-                more_statements = False
-                continue
+            if not more_statements or not self.starts(STATEMENT_START_KEYWORDS): break
+            if starts != None: starts.append(self.tok_idx)
+            statement = res.register(self.statement())
+            if res.error: return res
             statements.append(statement)
 
         return res.success(ListNode(
             statements,
             pos_start,
-            self.current_tok.pos_end.copy()
+            self.current_tok.pos_end
         ))
 
     def statement(self):
         res = ParseResult()
-        pos_start = self.current_tok.pos_start.copy()
+        pos_start = self.current_tok.pos_start
 
         if self.current_tok.matches(TT_KEYWORD, KEYWORDS.RETURN):
             res.register_advancement()
             self.advance()
 
-            expr = res.try_register(self.expr())
-
-            if not expr:
-                self.reverse(res.to_reverse_count)
-            return res.success(ReturnNode(expr, pos_start, self.current_tok.pos_start.copy()))
+            expr = None
+            if self.starts(EXPR_START_KEYWORDS):
+                expr = res.register(self.expr())
+                if res.error: return res
+            return res.success(ReturnNode(expr, pos_start, self.current_tok.pos_start))
 
         if self.current_tok.matches(TT_KEYWORD, KEYWORDS.CONTINUE):
             res.register_advancement()
             self.advance()
-            return res.success(ContinueNode(pos_start, self.current_tok.pos_start.copy()))
+            return res.success(ContinueNode(pos_start, self.current_tok.pos_start))
         
         if self.current_tok.matches(TT_KEYWORD, KEYWORDS.BREAK):
             res.register_advancement()
             self.advance()
-            return res.success(BreakNode(pos_start, self.current_tok.pos_start.copy()))
+            return res.success(BreakNode(pos_start, self.current_tok.pos_start))
 
         expr = res.register(self.expr())
         if res.error:
@@ -140,7 +242,8 @@ class Parser:
                 f"Expected '{KEYWORDS.FUNCTION}'"
             ))
 
-        isPublic = self.isPublic()
+        isPublic = self.public
+        self.public = False
 
         res.register_advancement()
         self.advance()
@@ -536,7 +639,7 @@ class Parser:
 
     def for_object_expr(self):
         res = ParseResult()
-        pos_start = self.current_tok.pos_start.copy()
+        pos_start = self.current_tok.pos_start
 
         res.register_advancement()
         self.advance()
@@ -623,7 +726,7 @@ class Parser:
                 body,
                 True,
                 pos_start,
-                self.current_tok.pos_end.copy()
+                self.current_tok.pos_end
             ))
 
         body = res.register(self.expr())
@@ -636,12 +739,12 @@ class Parser:
             body,
             False,
             pos_start,
-            self.current_tok.pos_end.copy()
+            self.current_tok.pos_end
         ))
 
     def for_list_expr(self):
         res = ParseResult()
-        pos_start = self.current_tok.pos_start.copy()
+        pos_start = self.current_tok.pos_start
 
         res.register_advancement()
         self.advance()
@@ -705,7 +808,7 @@ class Parser:
                 body,
                 True,
                 pos_start,
-                self.current_tok.pos_end.copy()
+                self.current_tok.pos_end
             ))
 
         body = res.register(self.expr())
@@ -717,7 +820,7 @@ class Parser:
             body,
             False,
             pos_start,
-            self.current_tok.pos_end.copy()
+            self.current_tok.pos_end
         ))
 
     def while_expr(self):
@@ -785,162 +888,123 @@ class Parser:
             body.pos_end
         ))
 
-    def list_expr(self):
+    def container_expr(self):
+        # List and object literals. Literals nested in one another, as
+        # generated data often is, are parsed with an explicit stack of the
+        # ones still open rather than by recursion, so their depth is not
+        # bounded by the recursion limit. An element that starts with a
+        # literal opens a frame for it, and once that closes, the rest of
+        # the element's expression is parsed on from the finished node
         res = ParseResult()
-        element_nodes = []
-        pos_start = self.current_tok.pos_start.copy()
+        frames = []
 
-        if self.current_tok.type != TT_LSQUARE:
-            return res.failure(InvalidSyntaxError(
-                self.current_tok.pos_start, self.current_tok.pos_end,
-                f"Expected '['"
-            ))
-
-        res.register_advancement()
-        self.advance()
-
-        self.skip_newline(res)
-        
-        if self.current_tok.type == TT_RSQUARE:
+        while True:
+            tok = self.current_tok
+            frame = [tok.type == TT_LCURLY, tok.pos_start, [], None]
             res.register_advancement()
             self.advance()
-        else:
-            element_nodes.append(res.register(self.expr()))
-            if res.error:
-                return res.failure(InvalidSyntaxError(
-                    self.current_tok.pos_start, self.current_tok.pos_end,
-                    f"Expected ']', '{KEYWORDS.VAR}', '{KEYWORDS.IF}', '{KEYWORDS.FOR}', '{KEYWORDS.WHILE}', '{KEYWORDS.FUNCTION}', int, float, list, boolean, null, identifier, '+', '-', '(', '{'{'}' or '['"
-                ))
 
             self.skip_newline(res)
 
-            while self.current_tok.type == TT_COMMA:
+            if self.current_tok.type == (TT_RCURLY if frame[0] else TT_RSQUARE):
                 res.register_advancement()
                 self.advance()
-
-                self.skip_newline(res)
-
-                element_nodes.append(res.register(self.expr()))
+                element = (ObjectNode if frame[0] else ListNode)(frame[2], frame[1], self.current_tok.pos_end)
+                if not frames: return res.success(element)
+                element = self.operation(res, LOGIC, element)
+                if res.error: return res
+            else:
+                if frame[0]:
+                    frame[3] = self.object_key(res)
+                    if res.error: return res
+                frames.append(frame)
+                if self.current_tok.type in (TT_LSQUARE, TT_LCURLY): continue
+                element = res.register(self.expr())
                 if res.error: return res
 
-                self.skip_newline(res)
-            
-            if self.current_tok.type != TT_RSQUARE:
-                return res.failure(InvalidSyntaxError(
-                    self.current_tok.pos_start, self.current_tok.pos_end,
-                    f"Expected ',' or ']'"
-                ))
-            
-            res.register_advancement()
-            self.advance()
-
-        return res.success(
-            ListNode(
-                element_nodes,
-                pos_start,
-                self.current_tok.pos_end.copy()
-            )
-        )
-    
-    def object_expr(self):
-        res = ParseResult()
-        elements_nodes = []
-        pos_start = self.current_tok.pos_start.copy()
-
-        if self.current_tok.type != TT_LCURLY:
-            return res.failure(InvalidSyntaxError(
-                self.current_tok.pos_start, self.current_tok.pos_end,
-                "Expected '{'"
-            ))
-
-        res.register_advancement()
-        self.advance()
+            # element ends the element the innermost open literal is on. Go
+            # on to its next element, or close it and carry on with the
+            # element it was the start of
+            while True:
+                is_object, pos_start, elements, key = frame = frames[-1]
+                elements.append((key, element) if is_object else element)
 
-        self.skip_newline(res)
-
-        if self.current_tok.type == TT_RCURLY:
-            res.register_advancement()
-            self.advance()
-        else:
-            if self.current_tok.type != TT_IDENTIFIER:
-                return res.failure(InvalidSyntaxError(
-                    self.current_tok.pos_start, self.current_tok.pos_end,
-                    "Expected identifier"
-                ))
+                self.skip_newline(res)
 
-            var_name = self.current_tok
+                more = False
+                if is_object:
+                    while self.current_tok.type == TT_COMMA:
+                        res.register_advancement()
+                        self.advance()
 
-            res.register_advancement()
-            self.advance()
+                        self.skip_newline(res)
 
-            if self.current_tok.type != TT_COLON:
-                return res.failure(InvalidSyntaxError(
-                    self.current_tok.pos_start, self.current_tok.pos_end,
-                    "Expected ':'"
-                ))
+                        if self.current_tok.type == TT_IDENTIFIER:
+                            frame[3] = self.object_key(res)
+                            if res.error: return res
+                            more = True
+                            break
+                elif self.current_tok.type == TT_COMMA:
+                    res.register_advancement()
+                    self.advance()
 
-            res.register_advancement()
-            self.advance()
+                    self.skip_newline(res)
+                    more = True
 
-            self.skip_newline(res)
+                if more:
+                    if self.current_tok.type in (TT_LSQUARE, TT_LCURLY): break
+                    element = res.register(self.expr())
+                    if res.error: return res
+                    continue
 
-            expr = res.register(self.expr())
-            if res.error: 
-                return res.failure(InvalidSyntaxError(
-                    self.current_tok.pos_start, self.current_tok.pos_end,
-                    f"Expected '{'}'}', '{KEYWORDS.VAR}', '{KEYWORDS.IF}', '{KEYWORDS.FOR}', '{KEYWORDS.WHILE}', '{KEYWORDS.FUNCTION}', int, float, list, boolean, null, identifier, '+', '-', '(', '{'{'}' or '['"
-                ))
-            
-            elements_nodes.append((var_name, expr))
-            
-            self.skip_newline(res)
+                if self.current_tok.type != (TT_RCURLY if is_object else TT_RSQUARE):
+                    return res.failure(InvalidSyntaxError(
+                        self.current_tok.pos_start, self.current_tok.pos_end,
+                        f"Expected ',' or '{'}'}'" if is_object else f"Expected ',' or ']'"
+                    ))
 
-            while self.current_tok.type == TT_COMMA:
                 res.register_advancement()
                 self.advance()
 
-                self.skip_newline(res)
-
-                if self.current_tok.type == TT_IDENTIFIER:
-                    var_name = self.current_tok
-
-                    res.register_advancement()
-                    self.advance()
+                frames.pop()
+                element = (ObjectNode if is_object else ListNode)(elements, pos_start, self.current_tok.pos_end)
+                if not frames: return res.success(element)
+                element = self.operation(res, LOGIC, element)
+                if res.error: return res
 
-                    if self.current_tok.type != TT_COLON:
-                        return res.failure(InvalidSyntaxError(
-                            self.current_tok.pos_start, self.current_tok.pos_end,
-                            "Expected ':'"
-                        ))
+    def object_key(self, res):
+        # The name and ':' an object element starts with
+        if self.current_tok.type != TT_IDENTIFIER:
+            res.failure(InvalidSyntaxError(
+                self.current_tok.pos_start, self.current_tok.pos_end,
+                "Expected identifier"
+            ))
+            return None
 
-                    res.register_advancement()
-                    self.advance()
+        var_name = self.current_tok
 
-                    self.skip_newline(res)
+        res.register_advancement()
+        self.advance()
 
-                    expr = res.register(self.expr())
-                    if res.error: return res
-                    elements_nodes.append((var_name, expr))
+        if self.current_tok.type != TT_COLON:
+            res.failure(InvalidSyntaxError(
+                self.current_tok.pos_start, self.current_tok.pos_end,
+                "Expected ':'"
+            ))
+            return None
 
-                    self.skip_newline(res)
+        res.register_advancement()
+        self.advance()
 
-            if self.current_tok.type != TT_RCURLY:
-                return res.failure(InvalidSyntaxError(
-                    self.current_tok.pos_start, self.current_tok.pos_end,
-                    f"Expected ',' or '{'}'}'"
-                ))
-        
-            res.register_advancement()
-            self.advance()
-        
-        return res.success(ObjectNode(
-                elements_nodes,
-                pos_start,
-                self.current_tok.pos_end.copy()
-            )
-        )
+        self.skip_newline(res)
+        return var_name
     
-    def identifier_expr(self):
+    def identifier_expr(self, left=None, dot_tok=None):
+        # A name, a name assigned to, or a chain of names and strings joined
+        # by '.' which is assigned to as a whole or else read as the same
+        # left leaning '.' operations call builds. left and dot_tok are given
+        # when the name follows a '.' in call, and the chain or assignment
+        # continues from them
         res = ParseResult()
 
         if self.current_tok.type != TT_IDENTIFIER:
@@ -960,7 +1024,7 @@ class Parser:
 
             expr = res.register(self.expr())
             if res.error: return res
-            return res.success(VarAssignNode(
+            node = VarAssignNode(
                 var_name,
                 expr,
                 var_assign_type,
@@ -968,29 +1032,40 @@ class Parser:
                 True,
                 var_name.pos_start,
                 expr.pos_end
-            ))
-        elif self.current_tok.type == TT_DOT:
-            advance_count = 0
+            )
+            if left: node = BinOpNode(left, dot_tok, node, left.pos_start, node.pos_end)
+            return res.success(node)
+
+        node = VarAccessNode(
+            var_name,
+            var_name.pos_start,
+            var_name.pos_end
+        )
+        if left: node = BinOpNode(left, dot_tok, node, left.pos_start, node.pos_end)
+
+        if self.current_tok.type == TT_DOT:
             var_names = []
 
             var_names.append((var_name, self.current_tok.pos_start, self.current_tok.pos_end))
 
             while self.current_tok.type == TT_DOT:
+                op_tok = self.current_tok
                 res.register_advancement()
                 self.advance()
-                advance_count += 1
 
-                if self.current_tok.type != TT_IDENTIFIER and self.current_tok.type != TT_STRING:
+                tok = self.current_tok
+                if tok.type != TT_IDENTIFIER and tok.type != TT_STRING:
                     return res.failure(InvalidSyntaxError(
-                        self.current_tok.pos_start, self.current_tok.pos_end,
+                        tok.pos_start, tok.pos_end,
                         "Expected identifier, string"
                     ))
 
-                var_names.append((self.current_tok, self.current_tok.pos_start, self.current_tok.pos_end))
+                var_names.append((tok, tok.pos_start, tok.pos_end))
+                right = (VarAccessNode if tok.type == TT_IDENTIFIER else StringNode)(tok, tok.pos_start, tok.pos_end)
+                node = BinOpNode(node, op_tok, right, node.pos_start, right.pos_end)
 
                 res.register_advancement()
                 self.advance()
-                advance_count += 1
             
             if self.current_tok.type in (TT_EQ, TT_PE, TT_ME):
                 var_assign_type = self.current_tok.type
@@ -999,27 +1074,20 @@ class Parser:
 
                 expr = res.register(self.expr())
                 if res.error: return res
-                return res.success(MultiVarAssignNode(
+                node = MultiVarAssignNode(
                     var_names,
                     expr,
                     var_assign_type,
                     var_names[0][1],
                     expr.pos_end
-                ))
-            else:
-                for i in range(advance_count):
-                    res.register_deadvancement()
-                    self.deadvance()
+                )
+                if left: node = BinOpNode(left, dot_tok, node, left.pos_start, node.pos_end)
             
-        return res.success(VarAccessNode(
-            var_name,
-            var_name.pos_start,
-            var_name.pos_end
-        ))
+        return res.success(node)
 
     def import_expr(self):
         res = ParseResult()
-        pos_start = self.current_tok.pos_start.copy()
+        pos_start = self.current_tok.pos_start
 
         if not self.current_tok.matches(TT_KEYWORD, KEYWORDS.IMPORT):
             return res.failure(InvalidSyntaxError(
@@ -1055,11 +1123,11 @@ class Parser:
         res.register_advancement()
         self.advance()
 
-        return res.success(ImportNode(lib_name, var_name, pos_start, self.current_tok.pos_end.copy()))
+        return res.success(ImportNode(lib_name, var_name, pos_start, self.current_tok.pos_end))
 
     def switch_expr(self):
         res = ParseResult()
-        pos_start = self.current_tok.pos_start.copy()
+        pos_start = self.current_tok.pos_start
 
         if not self.current_tok.matches(TT_KEYWORD, KEYWORDS.SWITCH):
             return res.failure(InvalidSyntaxError(
@@ -1166,10 +1234,11 @@ class Parser:
         res.register_advancement()
         self.advance()
 
-        return res.success(SwitchNode(value_node, cases, default, pos_start, self.current_tok.pos_end.copy()))
+        return res.success(SwitchNode(value_node, cases, default, pos_start, self.current_tok.pos_end))
 
     def private_and_public_expr(self):
         res = ParseResult()
+        self.public = self.current_tok.matches(TT_KEYWORD, KEYWORDS.PUBLIC)
         
         res.register_advancement()
         self.advance()
@@ -1226,14 +1295,10 @@ class Parser:
                 return res.success(expr)
             else:
                 return res.failure(InvalidSyntaxError(tok.pos_start, tok.pos_end, "Expected ')'"))
-        elif tok.type == TT_LSQUARE:
-            list_expr = res.register(self.list_expr())
-            if res.error: return res
-            return res.success(list_expr)
-        elif tok.type == TT_LCURLY:
-            object_expr = res.register(self.object_expr())
+        elif tok.type in (TT_LSQUARE, TT_LCURLY):
+            container_expr = res.register(self.container_expr())
             if res.error: return res
-            return res.success(object_expr)
+            return res.success(container_expr)
         elif tok.matches(TT_KEYWORD, KEYWORDS.IF):
             if_expr = res.register(self.if_expr())
             if res.error: return res
@@ -1265,13 +1330,42 @@ class Parser:
 
         return res.failure(InvalidSyntaxError(tok.pos_start, tok.pos_end, f"Expected '{KEYWORDS.IF}', '{KEYWORDS.FOR}', '{KEYWORDS.WHILE}', '{KEYWORDS.FUNCTION}', int, float, list, boolean, null, identifier, '+', '-', '(', '{'{'}' or '['"))
     
-    def dot(self):
-        return self.bin_op(self.atom, (TT_DOT, ))
+    def call(self, res, node=None):
+        # A chain of atoms joined by '.', called once if '(' follows it.
+        # Literals and plain names, which most operands are, are built here
+        # without going through atom. node is the first atom when the
+        # caller has parsed it already
+        tok = self.current_tok
+        if node != None:
+            pass
+        elif tok.type in (TT_INT, TT_FLOAT):
+            res.register_advancement()
+            self.advance()
+            node = NumberNode(tok, tok.pos_start, tok.pos_end)
+        elif tok.type == TT_STRING:
+            res.register_advancement()
+            self.advance()
+            node = StringNode(tok, tok.pos_start, tok.pos_end)
+        elif tok.type == TT_IDENTIFIER and self.tokens[self.tok_idx + 1].type not in (TT_EQ, TT_PE, TT_ME, TT_DOT):
+            res.register_advancement()
+            self.advance()
+            node = VarAccessNode(tok, tok.pos_start, tok.pos_end)
+        else:
+            node = res.register(self.atom())
+            if res.error: return None
 
-    def call(self):
-        res = ParseResult()
-        dot = res.register(self.dot())
-        if res.error: return res
+        while self.current_tok.type == TT_DOT:
+            op_tok = self.current_tok
+            res.register_advancement()
+            self.advance()
+            self.skip_newline(res)
+            if self.current_tok.type == TT_IDENTIFIER:
+                node = res.register(self.identifier_expr(node, op_tok))
+                if res.error: return None
+                continue
+            right = res.register(self.atom())
+            if res.error: return None
+            node = BinOpNode(node, op_tok, right, node.pos_start, right.pos_end)
 
         if self.current_tok.type == TT_LPAREN:
             res.register_advancement()
@@ -1285,10 +1379,11 @@ class Parser:
                 self.skip_newline(res)
                 arg_nodes.append(res.register(self.expr()))
                 if res.error:
-                    return res.failure(InvalidSyntaxError(
+                    res.failure(InvalidSyntaxError(
                         self.current_tok.pos_start, self.current_tok.pos_end,
                         f"Expected ')', '{KEYWORDS.VAR}', '{KEYWORDS.IF}', '{KEYWORDS.FOR}', '{KEYWORDS.WHILE}', '{KEYWORDS.FUNCTION}', int, float, list, boolean, null, identifier, '+', '-' or '('"
                     ))
+                    return None
                 self.skip_newline(res)
                 while self.current_tok.type == TT_COMMA:
                     res.register_advancement()
@@ -1297,84 +1392,81 @@ class Parser:
                     self.skip_newline(res)
 
                     arg_nodes.append(res.register(self.expr()))
-                    if res.error: return res
+                    if res.error: return None
                     self.skip_newline(res)
                 
                 if self.current_tok.type != TT_RPAREN:
-                    return res.failure(InvalidSyntaxError(
+                    res.failure(InvalidSyntaxError(
                         self.current_tok.pos_start, self.current_tok.pos_end,
                         f"Expected ',' or ')'"
                     ))
+                    return None
                 
                 res.register_advancement()
                 self.advance()
                 
-            return res.success(CallNode(
-                dot,
+            return CallNode(
+                node,
                 arg_nodes,
-                dot.pos_start,
-                arg_nodes[len(arg_nodes) - 1].pos_end if len(arg_nodes) > 0 else dot.pos_end               
-            ))
-        return res.success(dot)
-
-    def power(self):
-        return self.bin_op(self.call, (TT_POW, ), self.factor)
-
-    def factor(self):
-        res = ParseResult()
+                node.pos_start,
+                arg_nodes[len(arg_nodes) - 1].pos_end if len(arg_nodes) > 0 else node.pos_end               
+            )
+        return node
+
+    def operation(self, res, power, node=None):
+        # Precedence climbing over every operator of an expression. It parses
+        # an operand, then takes each following operator that binds at least
+        # as tightly as power, with its right operand parsed one level up so
+        # the operators of a level lean to the left. The right of '^' is
+        # parsed from a sign, so '^' leans to the right. Everything shares
+        # the caller's ParseResult and returns the node, or None on error.
+        # node is the first atom when the caller has parsed it already
+        start = res.advance_count
         tok = self.current_tok
 
-        if tok.type in (TT_PLUS, TT_MINUS):
+        if node != None:
+            left = self.call(res, node)
+        elif power <= COMPARISON and tok.type == TT_KEYWORD and tok.value == KEYWORDS.NOT:
             res.register_advancement()
             self.advance()
-            factor = res.register(self.factor())
-            if res.error: return res
-            return res.success(UnaryOpNode(
-                tok,
-                factor,
-                tok.pos_start,
-                factor.pos_end
-            ))
-        
-        return self.power()
-
-    def term(self):
-        return self.bin_op(self.factor, (TT_MUL, TT_DIV))
-
-    def arith_expr(self):
-        return self.bin_op(self.term, (TT_PLUS, TT_MINUS))
-
-    def comp_expr(self):
-        res = ParseResult()
-
-        if self.current_tok.matches(TT_KEYWORD, KEYWORDS.NOT):
-            op_tok = self.current_tok
+            node = self.operation(res, COMPARISON)
+            if res.error: return None
+            left = UnaryOpNode(tok, node, tok.pos_start, node.pos_end)
+        elif tok.type in (TT_PLUS, TT_MINUS):
             res.register_advancement()
             self.advance()
+            node = self.operation(res, SIGN)
+            if res.error: return None
+            left = UnaryOpNode(tok, node, tok.pos_start, node.pos_end)
+        else:
+            left = self.call(res)
 
-            node = res.register(self.comp_expr())
-            if res.error: return res
-            return res.success(UnaryOpNode(
-                op_tok,
-                node,
-                op_tok.pos_start,
-                node.pos_end
-            ))
-
-        node = res.register(self.bin_op(self.arith_expr, (TT_EE, TT_NE, TT_LT, TT_GT, TT_LTE, TT_GTE)))
+        while not res.error:
+            op_tok = self.current_tok
+            op_power = BINARY_POWERS.get(op_tok.value if op_tok.type == TT_KEYWORD else op_tok.type, 0)
+            if op_power < power: return left
 
-        if res.error:
-            return res.failure(InvalidSyntaxError(
+            res.register_advancement()
+            self.advance()
+            self.skip_newline(res)
+            right = self.operation(res, SIGN if op_power == EXPONENT else op_power + 1)
+            if res.error: break
+            left = BinOpNode(left, op_tok, right, left.pos_start, right.pos_end)
+
+        # An operand that is not there at all is reported as a missing
+        # comparison when one could have started here
+        if power <= COMPARISON and res.advance_count == start:
+            res.error = InvalidSyntaxError(
                 self.current_tok.pos_start, self.current_tok.pos_end,
-                f"Expected '{KEYWORDS.IF}', '{KEYWORDS.FOR}', '{KEYWORDS.WHILE}', '{KEYWORDS.FUNCTION}', int, float, list, boolean, null, identifier, '+', '-', '(', '{'{'}', '[' or '{KEYWORDS.NOT}'"))
-
-        return res.success(node)
+                f"Expected '{KEYWORDS.IF}', '{KEYWORDS.FOR}', '{KEYWORDS.WHILE}', '{KEYWORDS.FUNCTION}', int, float, list, boolean, null, identifier, '+', '-', '(', '{'{'}', '[' or '{KEYWORDS.NOT}'")
+        return None
 
     def expr(self):
         res = ParseResult()
 
         if self.current_tok.matches(TT_KEYWORD, KEYWORDS.VAR):
-            isPublic = self.isPublic()
+            isPublic = self.public
+            self.public = False
             res.register_advancement()
             self.advance()
 
@@ -1412,7 +1504,7 @@ class Parser:
                 expr.pos_end
             ))
 
-        node = res.register(self.bin_op(self.comp_expr, ((TT_KEYWORD, KEYWORDS.AND), (TT_KEYWORD, KEYWORDS.OR))))
+        node = self.operation(res, LOGIC)
         if res.error: 
             return res.failure(InvalidSyntaxError(
                 self.current_tok.pos_start, self.current_tok.pos_end,
@@ -1420,39 +1512,3 @@ class Parser:
             ))
 
         return res.success(node)
-
-    def bin_op(self, func_a, ops, func_b=None):
-        if func_b == None:
-            func_b = func_a
-        res = ParseResult()
-        left = res.register(func_a())
-        if res.error: return res
-
-        while self.current_tok.type in ops or (self.current_tok.type, self.current_tok.value) in ops:
-            op_tok = self.current_tok
-            res.register_advancement()
-            self.advance()
-            self.skip_newline(res)
-            right = res.register(func_b())
-            if res.error: return res
-            left = BinOpNode(
-                left,
-                op_tok,
-                right,
-                left.pos_start,
-                right.pos_end
-            )
-
-        return res.success(left)
-    
-    def isPublic(self):
-        self.deadvance()
-
-        if self.current_tok.matches(TT_KEYWORD, KEYWORDS.PUBLIC):
-            self.advance()
-            return True
-        elif self.current_tok.matches(TT_KEYWORD, KEYWORDS.PRIVATE):
-            self.advance()
-            return False
-        self.advance()
-        return False
\ No newline at end of file
@@ -1,20 +1,178 @@
-class Position:
-    def __init__(self, idx, ln, col, fn, ftxt):
-        self.idx = idx
-        self.ln = ln
-        self.col = col
+import os
+import re
+import mmap
+import codecs
+import locale
+import weakref
+from bisect import bisect_left, bisect_right
+
+# Positions are plain ints. Every source file gets its own range of offsets
+# in one shared space, so an offset alone identifies both the file and the
+# character, and tokens, nodes and values only carry two ints for a span.
+#
+# The text of a source is either a str or, for a large file opened with
+# read_source, the read only mapping of its bytes. Offsets into a mapped
+# source count bytes, and only what gets shown is ever decoded. Once it is
+# parsed the mapping is closed, and the file is read again if an error
+# message needs its text.
+#
+# The list of sources only holds weak references. A source lives for as long
+# as something that points into it does: the lexer and parser working on
+# it, the context a script runs in and so every function it made, or the
+# Document it is a chunk of, and drops out of the list when it goes.
+sources = []
+bases = []
+next_base = 0
+
+class SourceRef(weakref.ref):
+    __slots__ = ('base',)
+
+def forget(ref):
+    idx = bisect_left(bases, ref.base)
+    if idx < len(sources) and sources[idx] is ref:
+        del sources[idx]
+        del bases[idx]
+
+class Source:
+    __slots__ = ('fn', 'text', 'base', 'end', 'line_starts', 'mapped', 'path', '__weakref__')
+
+    def __init__(self, fn, text, path=None):
+        global next_base
         self.fn = fn
-        self.ftxt = ftxt
+        self.text = text
+        self.path = path
+        self.base = next_base
+        self.line_starts = None
+        self.mapped = not isinstance(text, str)
+
+        # Room for the end of file token: after a trailing comment or an
+        # unterminated string it starts one past the text and ends after that
+        next_base += len(text) + 3
+        self.end = next_base
+        ref = SourceRef(self, forget)
+        ref.base = self.base
+        sources.append(ref)
+        bases.append(self.base)
+
+    def location(self, pos):
+        # Line and column are only needed for error messages, so the line
+        # index is built the first time one is asked for
+        if self.line_starts == None:
+            if self.mapped:
+                self.line_starts = [0] + [match.end() for match in LINE_END_RE.finditer(self.bytes())]
+            else:
+                self.line_starts = [0]
+                idx = self.text.find('\n')
+                while idx >= 0:
+                    self.line_starts.append(idx + 1)
+                    idx = self.text.find('\n', idx + 1)
+
+        idx = pos - self.base
+        ln = bisect_right(self.line_starts, idx) - 1
+        if self.mapped:
+            return ln, len(decode(self.bytes()[self.line_starts[ln]:idx]))
+        return ln, idx - self.line_starts[ln]
+
+    def excerpt(self, pos, ln_start, ln_end):
+        # The text error messages cut lines from, with the index of pos in
+        # it. A mapped source only decodes the lines from ln_start to ln_end,
+        # along with the newline before them
+        if not self.mapped:
+            return self.text, pos - self.base
+
+        text = self.bytes()
+        start = max(self.line_starts[ln_start] - 1, 0)
+        end = LINE_END_RE.search(text, self.line_starts[ln_end])
+        end = end.start() if end else len(text)
+        return decode(text[start:end]), len(decode(text[start:pos - self.base]))
+
+    def bytes(self):
+        # The text of a mapped source, read from its file again if the
+        # mapping has been closed
+        if self.text == None:
+            with open(self.path, 'rb') as f:
+                self.text = f.read()
+        return self.text
+
+    def unmap(self):
+        # Closes the mapping of a parsed source. Only one read from a path
+        # can be read again, and the text of any other is kept
+        if self.path and isinstance(self.text, mmap.mmap):
+            self.text.close()
+            self.text = None
+
+    def __repr__(self):
+        return f'<source {self.fn}>'
+
+# Where lines end in a mapped source. Text mode reading turns each of these
+# into a newline, so a carriage return on its own ends a line too
+LINE_END_RE = re.compile(rb"\r\n?|\n")
+
+# What open() decodes a file in text mode with, which scripts were always
+# read that way. Every file is decoded like that, mapped or not
+ENCODING = locale.getpreferredencoding(False)
+
+def decode(data):
+    # Positions never fall between the two bytes of a Windows line end, so
+    # every carriage return left in data is a line end of its own
+    return str(data, ENCODING).replace('\r\n', '\n').replace('\r', '\n')
+
+def check_encoding(data):
+    # Reading a file in text mode fails if any of it does not decode, so a
+    # mapped one is decoded once up front, a piece at a time, and thrown away
+    decoder = codecs.getincrementaldecoder(ENCODING)()
+    for start in range(0, len(data), 1 << 20):
+        decoder.decode(data[start:start + (1 << 20)])
+    decoder.decode(b'', True)
+
+# Smaller scripts are still read into a str: mapping them saves nothing,
+# and every mapping keeps a file descriptor open for as long as its Source
+MAP_THRESHOLD = 1 << 20
+
+def read_source(path):
+    # A large script is mapped into memory instead of being read into a
+    # str, so the lexer scans the file's own pages
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size >= MAP_THRESHOLD:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                check_encoding(data)
+            except Exception:
+                data.close()
+                raise
+            return data
+
+    with open(path, 'r') as f:
+        return f.read()
 
-    def advance(self, current_char=None):
-        self.idx += 1
-        self.col += 1
+def read_text(path):
+    # The whole file as a str, decoded straight out of a mapping rather
+    # than through a bytes copy of it
+    with open(path, 'rb') as f:
+        if not os.fstat(f.fileno()).st_size: return ''
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
 
-        if current_char == "\n":
-            self.ln += 1
-            self.col = 0
+    try:
+        text = str(data, ENCODING)
+    finally:
+        data.close()
+    if '\r' in text: text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
 
-        return self
+def release(source):
+    # Forgets a source before it is collected, like a chunk of an edited
+    # Document that has been parsed again
+    if isinstance(source.text, mmap.mmap): source.text.close()
+    idx = bisect_left(bases, source.base)
+    if idx < len(sources) and sources[idx]() is source:
+        del sources[idx]
+        del bases[idx]
 
-    def copy(self):
-        return Position(self.idx, self.ln, self.col, self.fn, self.ftxt)
+def source_of(pos):
+    idx = bisect_right(bases, pos) - 1
+    source = sources[idx]() if idx >= 0 else None
+    # An offset past the end of the source before it belongs to one that
+    # has been released, and showing the wrong file would be worse than none
+    if source == None or pos >= source.end:
+        raise ValueError(f"Position {pos} is in no source that is still loaded")
+    return source
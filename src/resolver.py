@@ -0,0 +1,163 @@
+from src.symbol_table import Scope
+from src.nodes import ListNode, ObjectNode, BinOpNode
+from src.dispatch import build_dispatch
+
+class Resolver:
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.dispatch = build_dispatch(cls, 'visit_')
+
+    def resolve(self, node):
+        self.scope = None
+        self.uses = []
+        self.visit(node)
+
+        # Every use is resolved once all scopes are complete, so a function
+        # can refer to names its enclosing function only binds later on
+        for use_node, name, scope in self.uses:
+            use_node.slot = scope.find(name) if scope else None
+
+        return node
+
+    def visit(self, node):
+        return self.dispatch[node.__class__](self, node)
+
+    def declare(self, name):
+        return self.scope.declare(name) if self.scope else None
+
+    def use(self, node, name):
+        self.uses.append((node, name, self.scope))
+
+    def visit_NumberNode(self, node):
+        pass
+
+    def visit_StringNode(self, node):
+        pass
+
+    def visit_BooleanNode(self, node):
+        pass
+
+    def visit_NullNode(self, node):
+        pass
+
+    def visit_ListNode(self, node):
+        # Literals nested in one another are walked with a stack of the
+        # elements still to visit, so their depth is not bounded by the
+        # recursion limit
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, ListNode):
+                stack.extend(reversed(node.element_nodes))
+            elif isinstance(node, ObjectNode):
+                stack.extend(element[1] for element in reversed(node.element_nodes))
+            else:
+                self.visit(node)
+
+    def visit_ObjectNode(self, node):
+        self.visit_ListNode(node)
+
+    def visit_VarAccessNode(self, node):
+        self.use(node, node.var_name_tok.value)
+
+    def visit_VarAssignNode(self, node):
+        self.visit(node.value_node)
+        node.slot = self.declare(node.var_name_tok.value)
+
+    def visit_MultiVarAssignNode(self, node):
+        self.use(node, node.var_name_toks[0][0].value)
+        self.visit(node.value_node)
+
+    def visit_BinOpNode(self, node):
+        # A chain like a + b + c leans left, so it is walked down its left
+        # operands and back up again rather than recursing per operator
+        spine = []
+        while isinstance(node, BinOpNode):
+            spine.append(node)
+            node = node.left_node
+
+        self.visit(node)
+        for node in reversed(spine):
+            self.visit(node.right_node)
+
+    def visit_UnaryOpNode(self, node):
+        self.visit(node.node)
+
+    def visit_IfNode(self, node):
+        for condition, expr, should_return_null in node.cases:
+            self.visit(condition)
+            self.visit(expr)
+
+        if node.else_case:
+            self.visit(node.else_case[0])
+
+    def visit_SwitchNode(self, node):
+        self.visit(node.value_node)
+
+        for case, expr in node.cases:
+            self.visit(case)
+            self.visit(expr)
+
+        if node.default:
+            self.visit(node.default)
+
+    def visit_ForNode(self, node):
+        self.visit(node.start_value_node)
+        self.visit(node.end_value_node)
+        if node.step_value_node:
+            self.visit(node.step_value_node)
+
+        node.slot = self.declare(node.var_name_tok.value)
+        self.visit(node.body_node)
+
+    def visit_ForObjectNode(self, node):
+        self.visit(node.object_tok)
+
+        node.key_slot = self.declare(node.var_name_key_tok.value)
+        node.value_slot = self.declare(node.var_name_value_tok.value)
+        self.visit(node.body_node)
+
+    def visit_ForListNode(self, node):
+        self.visit(node.list_tok)
+
+        node.slot = self.declare(node.var_name_tok.value)
+        self.visit(node.body_node)
+
+    def visit_WhileNode(self, node):
+        self.visit(node.condition_node)
+        self.visit(node.body_node)
+
+    def visit_FuncDefNode(self, node):
+        if node.var_name_tok:
+            node.slot = self.declare(node.var_name_tok.value)
+
+        parent_scope = self.scope
+        self.scope = Scope(node.var_name_tok.value if node.var_name_tok else '<anonymous>', parent_scope)
+
+        for arg_name in node.arg_name_toks:
+            self.declare(arg_name[0].value)
+        self.visit(node.body_node)
+
+        node.scope = self.scope
+        self.scope = parent_scope
+
+    def visit_CallNode(self, node):
+        self.visit(node.node_to_call)
+        for arg_node in node.arg_nodes:
+            self.visit(arg_node)
+
+    def visit_ImportNode(self, node):
+        self.visit(node.lib_name)
+        node.slot = self.declare(node.var_name.value)
+
+    def visit_ReturnNode(self, node):
+        if node.node_to_return:
+            self.visit(node.node_to_return)
+
+    def visit_ContinueNode(self, node):
+        pass
+
+    def visit_BreakNode(self, node):
+        pass
+
+Resolver.dispatch = build_dispatch(Resolver, 'visit_')
@@ -4,28 +4,17 @@ class ParseResult:
         self.node = None
         self.last_registered_advance_count = 0
         self.advance_count = 0
-        self.to_reverse_count = 0
     
     def register_advancement(self):
         self.last_registered_advance_count = 1
         self.advance_count += 1
     
-    def register_deadvancement(self):
-        self.last_registered_advance_count = 0
-        self.advance_count -= 1
-
     def register(self, res):
         self.last_registered_advance_count = res.advance_count
         self.advance_count += res.advance_count
         if res.error: self.error = res.error
         return res.node
 
-    def try_register(self, res):
-        if res.error:
-            self.to_reverse_count = res.advance_count
-            return None
-        return self.register(res)
-
     def success(self, node):
         self.node = node
         return self
@@ -36,52 +25,28 @@ class ParseResult:
         return self
 
 class RTResult:
+    # What running a whole script gave: its value, or the error that
+    # stopped it. Inside a run values are returned and errors raised
     def __init__(self):
-        self.reset()
-
-    def reset(self):
         self.value = None
         self.error = None
-        self.func_return_value = None
-        self.loop_should_continue = False
-        self.loop_should_break = False
-
-    def register(self, res):
-        self.error = res.error
-        self.func_return_value = res.func_return_value
-        self.loop_should_continue = res.loop_should_continue
-        self.loop_should_break = res.loop_should_break
-        return res.value
 
     def success(self, value):
-        self.reset()
         self.value = value
         return self
 
-    def success_return(self, value):
-        self.reset()
-        self.func_return_value = value
-        return self
-
-    def success_continue(self):
-        self.reset()
-        self.loop_should_continue = True
-        return self
-
-    def success_break(self):
-        self.reset()
-        self.loop_should_break = True
-        return self
-
     def failure(self, error):
-        self.reset()
         self.error = error
         return self
 
-    def should_return(self):
-        return (
-            self.error or
-            self.func_return_value or
-            self.loop_should_continue or
-            self.loop_should_break
-        )
\ No newline at end of file
+# Leaving a function or a loop early unwinds everything evaluated in
+# between, so it is raised rather than checked for after every node
+class FuncReturn(Exception):
+    def __init__(self, value):
+        self.value = value
+
+class LoopBreak(Exception):
+    pass
+
+class LoopContinue(Exception):
+    pass
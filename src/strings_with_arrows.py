@@ -1,26 +1,32 @@
-def string_with_arrows(text, pos_start, pos_end):
+from src.position import source_of
+
+def string_with_arrows(pos_start, pos_end):
     result = ''
+    source = source_of(pos_start)
+    ln_start, col_start = source.location(pos_start)
+    ln_end, col_end = source_of(pos_end).location(pos_end)
+    text, idx = source.excerpt(pos_start, ln_start, ln_end)
 
     # Calculate indices
-    idx_start = max(text.rfind('\n', 0, pos_start.idx), 0)
+    idx_start = max(text.rfind('\n', 0, idx), 0)
     idx_end = text.find('\n', idx_start + 1)
     if idx_end < 0: idx_end = len(text)
     
     # Generate each line
-    line_count = pos_end.ln - pos_start.ln + 1
+    line_count = ln_end - ln_start + 1
     for i in range(line_count):
         # Calculate line columns
         line = text[idx_start:idx_end]
-        col_start = pos_start.col if i == 0 else 0
-        col_end = pos_end.col if i == line_count - 1 else len(line) - 1
+        col_start_line = col_start if i == 0 else 0
+        col_end_line = col_end if i == line_count - 1 else len(line) - 1
 
         # Append to result
         result += line + '\n'
-        result += ' ' * col_start + '^' * (col_end - col_start)
+        result += ' ' * col_start_line + '^' * (col_end_line - col_start_line)
 
         # Re-calculate indices
         idx_start = idx_end
         idx_end = text.find('\n', idx_start + 1)
         if idx_end < 0: idx_end = len(text)
 
-    return result.replace('\t', '')
\ No newline at end of file
+    return result.replace('\t', '')
@@ -1,6 +1,12 @@
+GLOBAL_SLOT = (-1, -1)
+
 class SymbolTable:
     def __init__(self, parent=None):
         self.symbols = {}
+        # The names a script's public declarations made, in the order they
+        # were made, so importing it only goes over what it exports. Made
+        # by the first one, as most tables never export anything
+        self.exports = None
         self.parent = parent
 
     def get(self, name, default=None):
@@ -12,10 +18,109 @@ class SymbolTable:
     def set(self, name, value):
         self.symbols[name] = value
 
+    def lookup(self, slot, name):
+        return self.get(name)
+
+    def assign(self, slot, name, value):
+        self.symbols[name] = value
+
+    def declare(self, slot, name, value, public):
+        # A declaration decides whether the name is exported, assigning to
+        # it later keeps that
+        self.symbols[name] = value
+        if public:
+            if self.exports == None: self.exports = {}
+            self.exports[name] = None
+        elif self.exports:
+            self.exports.pop(name, None)
+
     def remove(self, name):
         del self.symbols[name]
+        if self.exports: self.exports.pop(name, None)
 
     def copy(self):
         new_symbol_table = SymbolTable(self.parent)
         new_symbol_table.symbols = self.symbols
-        return new_symbol_table
\ No newline at end of file
+        new_symbol_table.exports = self.exports
+        return new_symbol_table
+
+class Scope:
+    def __init__(self, name, parent=None):
+        self.name = name
+        self.parent = parent
+        self.names = []
+        self.index = {}
+
+    def declare(self, name):
+        if name not in self.index:
+            self.index[name] = len(self.names)
+            self.names.append(name)
+        return (0, self.index[name])
+
+    def find(self, name):
+        scope = self
+        depth = 0
+
+        while scope:
+            if name in scope.index:
+                return (depth, scope.index[name])
+            scope = scope.parent
+            depth += 1
+
+        return GLOBAL_SLOT
+
+    def __repr__(self):
+        return f'<scope {self.name}>'
+
+class Frame(SymbolTable):
+    def __init__(self, scope, parent=None):
+        # Everything a frame holds has a slot, so unlike a symbol table it
+        # makes no dicts. One is made per call
+        self.parent = parent
+        self.scope = scope
+        self.slots = [None] * len(scope.names)
+        self.globals = parent.globals if isinstance(parent, Frame) else parent
+
+    def get(self, name, default=None):
+        index = self.scope.index.get(name)
+        if index is not None and self.slots[index] is not None:
+            return self.slots[index]
+        if self.parent:
+            return self.parent.get(name, default)
+        return default
+
+    def set(self, name, value):
+        index = self.scope.index.get(name)
+        if index == None:
+            raise Exception(f"'{name}' has no slot in {self.scope}")
+        self.slots[index] = value
+
+    def lookup(self, slot, name):
+        depth, index = slot
+        if depth < 0:
+            return self.globals.get(name)
+
+        frame = self
+        while depth:
+            frame = frame.parent
+            depth -= 1
+
+        value = frame.slots[index]
+        if value is None:
+            return frame.parent.get(name)
+        return value
+
+    def assign(self, slot, name, value):
+        self.slots[slot[1]] = value
+
+    def declare(self, slot, name, value, public):
+        # Only a script's top level is exported
+        self.slots[slot[1]] = value
+
+    def remove(self, name):
+        self.set(name, None)
+
+    def copy(self):
+        new_frame = Frame(self.scope, self.parent)
+        new_frame.slots = self.slots
+        return new_frame
@@ -1,15 +1,15 @@
 class Token:
+    __slots__ = ('type', 'value', 'pos_start', 'pos_end')
+
     def __init__(self, type_, value=None, pos_start=None, pos_end=None):
         self.type = type_
         self.value = value
 
-        if pos_start:
-            self.pos_start = pos_start.copy()
-            self.pos_end = pos_start.copy()
-            self.pos_end.advance()
-        
-        if pos_end:
-            self.pos_end = pos_end.copy()
+        if pos_start is not None:
+            self.pos_start = pos_start
+            self.pos_end = pos_end if pos_end is not None else pos_start + 1
+        elif pos_end is not None:
+            self.pos_end = pos_end
 
     def matches(self, type_, value):
         return self.type == type_ and self.value == value
@@ -1,40 +1,34 @@
 from src.errors import InvalidSyntaxError, RTError, Context
-from src.results import RTResult
-from src.symbol_table import SymbolTable
+from src.results import FuncReturn
+from src.symbol_table import SymbolTable, Frame
 from src.rt_types import *
 from src.token import Token
 
+def operation_error(details):
+    # Values are shared and do not know where they are used, so the engine
+    # running an operation fills in the span and context of its errors
+    return RTError(None, None, details, None)
+
 class Type:
+    __slots__ = ('value', 'elements')
+
+    # Built-in methods of the type: the name used in scripts mapped to the
+    # BuiltInFunction that implements it, bound to a value by dotted_to
+    built_in = {  }
+
     def __init__(self):
         self.value = None
         self.elements = None
-        self.built_in = {  }
-        self.set_pos()
-        self.set_context()
-
-    def set_pos(self, pos_start=None, pos_end=None):
-        self.pos_start = pos_start
-        self.pos_end = pos_end
-        return self
-
-    def set_context(self, context=None):
-        self.context = context
-        return self
 
-    def dotted_to(self, other, pos_start=None, pos_end=None):
-        if not pos_start: pos_start = self.pos_start
-        if not pos_end: pos_end = self.pos_end
+    def dotted_to(self, other):
         if other in self.built_in:
-            return self.built_in.get(other, Null().set_context(self.context)), None
+            from src.built_in import BuiltInFunction
+            return BuiltInFunction(self.built_in[other], self), None
         elif self.elements != None:
             if isinstance(self.elements, object):
                 if other in self.elements:
-                    return self.elements.get(other, Null().set_context(self.context)), None
-        return None, RTError(
-                        pos_start, pos_end,
-                        f"'{other}' is not defined",
-                        self.context
-                    )
+                    return self.elements.get(other, null), None
+        return None, operation_error(f"'{other}' is not defined")
 
     def added_to(self, other):
         return None, self.illegal_operation(other)
@@ -52,10 +46,10 @@ class Type:
         return None, self.illegal_operation(other)
 
     def get_comparison_eq(self, other):
-        return Boolean(self.equals(other)).set_context(self.context), None
+        return boolean(self.equals(other)), None
 
     def get_comparison_ne(self, other):
-        return Boolean(not self.equals(other)).set_context(self.context), None
+        return boolean(not self.equals(other)), None
 
     def get_comparison_lt(self, other):
         return None, self.illegal_operation(other)
@@ -70,16 +64,18 @@ class Type:
         return None, self.illegal_operation(other)
 
     def anded_by(self, other):
-        return Boolean(other.is_true() and self.is_true()).set_context(self.context), None
+        return boolean(other.is_true() and self.is_true()), None
 
     def ored_by(self, other):
-        return Boolean(other.is_true() or self.is_true()).set_context(self.context), None
+        return boolean(other.is_true() or self.is_true()), None
 
     def notted(self):
-        return Boolean(not self.is_true()).set_context(self.context), None
+        return boolean(not self.is_true()), None
 
-    def execute(self, args):
-        return RTResult().failure(self.illegal_operation())
+    def execute(self, args, context, pos_start, pos_end):
+        # Values are not stamped with where they are used, so the caller
+        # passes the context and span of the call
+        raise RTError(pos_start, pos_end, f"Can't do this operation with the type{type(self).__name__}.", context)
 
     def is_true(self):
         return True
@@ -88,87 +84,83 @@ class Type:
         return self.__class__ == other.__class__
 
     def copy(self):
-        copy = self(self.value)
-        copy.set_pos(self.pos_start, self.pos_end)
-        copy.set_context(self.context)
-        return copy
+        return self(self.value)
 
     def illegal_operation(self, other=None, show_type=True):
         if not other: other = self
-        return RTError(other.pos_start, other.pos_end, f"Can't do this operation{' with the type' + type(other).__name__ if show_type else ''}.", self.context)
+        return operation_error(f"Can't do this operation{' with the type' + type(other).__name__ if show_type else ''}.")
 
     def __repr__(self):
         return str(self.value)
 
 class Number(Type):
+    __slots__ = ()
+
     def __init__(self, value):
         super().__init__()
         self.value = value
 
     def added_to(self, other):
         if isinstance(other, Number):
-            return Number(self.value + other.value).set_context(self.context), None
+            return number(self.value + other.value), None
         elif isinstance(other, Null):
-            return Number(self.value + 0).set_context(self.context), None
+            return number(self.value + 0), None
         elif isinstance(other, String):
-            return String(str(self.value) + other.value).set_context(self.context), None
+            return String(str(self.value) + other.value), None
         return None, Type.illegal_operation(self, other)
 
     def subbed_by(self, other):
         if isinstance(other, Number):
-            return Number(self.value - other.value).set_context(self.context), None
+            return number(self.value - other.value), None
         elif isinstance(other, Null):
-            return Number(self.value - 0).set_context(self.context), None
+            return number(self.value - 0), None
         return None, Type.illegal_operation(self, other)
 
     def multed_by(self, other):
         if isinstance(other, Number):
-            return Number(self.value * other.value).set_context(self.context), None
+            return number(self.value * other.value), None
         elif isinstance(other, Null):
-            return Number(self.value * 0).set_context(self.context), None
+            return number(self.value * 0), None
         return None, Type.illegal_operation(self, other)
     
     def dived_by(self, other):
         if isinstance(other, Number):
             if other.value == 0:
-                return None, RTError(other.pos_start, other.pos_end, "Division by zero", self.context)
-            return Number(self.value / other.value).set_context(self.context), None
+                return None, operation_error("Division by zero")
+            return number(self.value / other.value), None
         elif isinstance(other, Null):
-            return None, RTError(other.pos_start, other.pos_end, "Division by null", self.context)
+            return None, operation_error("Division by null")
         return None, Type.illegal_operation(self, other)
     
     def powed_by(self, other):
         if isinstance(other, Number):
-            return Number(self.value ** other.value).set_context(self.context), None
+            return number(self.value ** other.value), None
         elif isinstance(other, Null):
-            return Number(self.value ** 0).set_context(self.context), None
+            return number(self.value ** 0), None
         return None, Type.illegal_operation(self, other)
 
     def get_comparison_lt(self, other):
         if isinstance(other, Number):
-            return Boolean(self.value < other.value).set_context(self.context), None
+            return boolean(self.value < other.value), None
         return None, Type.illegal_operation(self, other)
 
     def get_comparison_gt(self, other):
         if isinstance(other, Number):
-            return Boolean(self.value > other.value).set_context(self.context), None
+            return boolean(self.value > other.value), None
         return None, Type.illegal_operation(self, other)
 
     def get_comparison_lte(self, other):
         if isinstance(other, Number):
-            return Boolean(self.value <= other.value).set_context(self.context), None
+            return boolean(self.value <= other.value), None
         return None, Type.illegal_operation(self, other)
 
     def get_comparison_gte(self, other):
         if isinstance(other, Number):
-            return Boolean(self.value >= other.value).set_context(self.context), None
+            return boolean(self.value >= other.value), None
         return None, Type.illegal_operation(self, other)
 
     def copy(self):
-        copy = Number(self.value)
-        copy.set_pos(self.pos_start, self.pos_end)
-        copy.set_context(self.context)
-        return copy
+        return number(self.value)
 
     def equals(self, other):
         return self.__class__ == other.__class__ and self.value == other.value
@@ -177,50 +169,48 @@ class Number(Type):
         return str(self.value)
 
 class String(Type):
+    __slots__ = ()
+
+    built_in = { 
+        "toLowerCase": "toLowerCase",
+        "toUpperCase": "toUpperCase",
+        "replace": "replace",
+        "startsWith": "startsWith",
+        "endsWith": "endsWith",
+        "indexOf": "indexOf",
+        "isAllNum": "isAllNum",
+        "isAllAlpha": "isAllAlpha",
+        "isSpace": "isSpace",
+        "split": "split",
+        "trim": "trim",
+        "sub": "sub",
+        "includes": "includes",
+        "toLetters": "to_letters"
+    }
+
     def __init__(self, value):
         super().__init__()
         self.value = value
 
-        from src.built_in import BuiltInFunction
-        self.built_in = { 
-            "toLowerCase": BuiltInFunction("toLowerCase", self),
-            "toUpperCase": BuiltInFunction("toUpperCase", self),
-            "replace": BuiltInFunction("replace", self),
-            "startsWith": BuiltInFunction("startsWith", self),
-            "endsWith": BuiltInFunction("endsWith", self),
-            "indexOf": BuiltInFunction("indexOf", self),
-            "isAllNum": BuiltInFunction("isAllNum", self),
-            "isAllAlpha": BuiltInFunction("isAllAlpha", self),
-            "isSpace": BuiltInFunction("isSpace", self),
-            "split": BuiltInFunction("split", self),
-            "trim": BuiltInFunction("trim", self),
-            "sub": BuiltInFunction("sub", self),
-            "includes": BuiltInFunction("includes", self),
-            "toLetters": BuiltInFunction("to_letters", self)
-        }
-
     def added_to(self, other):
         if isinstance(other, Boolean):
-            return String(self.value + KEYWORDS[str(other.value).upper()]).set_context(self.context), None
+            return String(self.value + KEYWORDS[str(other.value).upper()]), None
         elif isinstance(other, Null):
-            return String(self.value + KEYWORDS.NULL).set_context(self.context), None
+            return String(self.value + KEYWORDS.NULL), None
         elif isinstance(other, List):
-            return String(self.value + str(other.elements)).set_context(self.context), None
-        return String(self.value + str(other)).set_context(self.context), None
+            return String(self.value + str(other.elements)), None
+        return String(self.value + str(other)), None
 
     def multed_by(self, other):
         if isinstance(other, Number):
-            return String(self.value * other.value).set_context(self.context), None
+            return String(self.value * other.value), None
         return None, Type.illegal_operation(self, other)
 
     def is_true(self):
         return len(self.value) > 0
 
     def copy(self):
-        copy = String(self.value)
-        copy.set_pos(self.pos_start, self.pos_end)
-        copy.set_context(self.context)
-        return copy
+        return String(self.value)
 
     def equals(self, other):
         return self.__class__ == other.__class__ and self.value == other.value
@@ -232,23 +222,22 @@ class String(Type):
         return self.value
 
 class Boolean(Type):
+    __slots__ = ()
+
     def __init__(self, value):
         super().__init__()
         self.value = value
 
     def added_to(self, other):
         if isinstance(other, String):
-            return String(KEYWORDS[str(self.value).upper()] + other.value).set_context(self.context), None
+            return String(KEYWORDS[str(self.value).upper()] + other.value), None
         return None, Type.illegal_operation(self, other)
 
     def is_true(self):
         return self.value
 
     def copy(self):
-        copy = Boolean(self.value)
-        copy.set_pos(self.pos_start, self.pos_end)
-        copy.set_context(self.context)
-        return copy
+        return self
 
     def equals(self, other):
         return self.__class__ == other.__class__ and self.value == other.value
@@ -257,47 +246,46 @@ class Boolean(Type):
         return f"{KEYWORDS.__dict__[str(self.value).upper()]}"
 
 class Null(Type):
+    __slots__ = ()
+
     def __init__(self):
         super().__init__()
         self.value = None
 
     def added_to(self, other):
         if isinstance(other, Number):
-            return Number(0 + other.value).set_context(self.context), None
+            return number(0 + other.value), None
         elif isinstance(other, String):
-            return String(KEYWORDS.NULL + other.value).set_context(self.context), None
+            return String(KEYWORDS.NULL + other.value), None
         return None, Type.illegal_operation(self, other)
 
     def subbed_by(self, other):
         if isinstance(other, Number):
-            return Number(0 - other.value).set_context(self.context), None
+            return number(0 - other.value), None
         return None, Type.illegal_operation(self, other)
 
     def multed_by(self, other):
         if isinstance(other, Number):
-            return Number(0 * other.value).set_context(self.context), None
+            return number(0 * other.value), None
         return None, Type.illegal_operation(self, other)
     
     def dived_by(self, other):
         if isinstance(other, Number):
             if other.value == 0:
-                return None, RTError(other.pos_start, other.pos_end, "Division by zero", self.context)
-            return Number(0 / other.value).set_context(self.context), None
+                return None, operation_error("Division by zero")
+            return number(0 / other.value), None
         return None, Type.illegal_operation(self, other)
     
     def powed_by(self, other):
         if isinstance(other, Number):
-            return Number(0 ** other.value).set_context(self.context), None
+            return number(0 ** other.value), None
         return None, Type.illegal_operation(self, other)
 
     def is_true(self):
         return False
 
     def copy(self):
-        copy = Null()
-        copy.set_pos(self.pos_start, self.pos_end)
-        copy.set_context(self.context)
-        return copy
+        return self
 
     def __repr__(self):
         return KEYWORDS.NULL
@@ -305,17 +293,48 @@ class Null(Type):
     def __str__(self):
         return KEYWORDS.NULL
 
+# Values never change once they are made, so null, true, false and the
+# ints scripts use most are made once and shared. Where a value was made or
+# is used is kept by the engine running it, not by the value
+null = Null()
+true = Boolean(True)
+false = Boolean(False)
+
+SMALL_INT_MIN = -128
+SMALL_INT_MAX = 1024
+small_ints = [Number(i) for i in range(SMALL_INT_MIN, SMALL_INT_MAX)]
+
+def boolean(value):
+    return true if value else false
+
+def number(value):
+    # Only ints are shared: 1.0 prints differently from 1, and a bool is an
+    # int too
+    if value.__class__ is int and SMALL_INT_MIN <= value < SMALL_INT_MAX:
+        return small_ints[value - SMALL_INT_MIN]
+    return Number(value)
+
+def values_equal(left, right):
+    # Elements of lists and objects are compared as values, as '==' does. A
+    # shared number is the same object wherever it is used and any other is
+    # not, so comparing them as objects would tell [1] and [1] equal but
+    # not [1000] and [1000]
+    if isinstance(left, Type) and isinstance(right, Type):
+        return left.equals(right)
+    return left is right
+
 class List(Type):
+    __slots__ = ()
+
+    built_in = { 
+        "extend": "extend",
+        "pop": "pop",
+        "append": "append"
+    }
+
     def __init__(self, elements):
         super().__init__()
         self.elements = elements
-        
-        from src.built_in import BuiltInFunction
-        self.built_in = { 
-            "extend": BuiltInFunction("extend", self),
-            "pop": BuiltInFunction("pop", self),
-            "append": BuiltInFunction("append", self)
-        }
     
     def added_to(self, other):
         new_list = self.copy()
@@ -329,11 +348,7 @@ class List(Type):
                 new_list.elements.pop(other.value)
                 return new_list, None
             except:
-                return None, RTError(
-                    other.pos_end, other.pos_end,
-                    "Element at this index could not be removed from list because index is out of bounds.",
-                    self.context
-                )
+                return None, operation_error("Element at this index could not be removed from list because index is out of bounds.")
         return None, Type.illegal_operation(self, other)
     
     def multed_by(self, other):
@@ -348,21 +363,14 @@ class List(Type):
             try:
                 return self.elements[other.value], None
             except:
-                return None, RTError(
-                    other.pos_end, other.pos_end,
-                    "Element at this index could not be retrived from list because index is out of bounds.",
-                    self.context
-                )
+                return None, operation_error("Element at this index could not be retrived from list because index is out of bounds.")
         return None, Type.illegal_operation(self, other)
 
     def copy(self):
-        copy = List(self.elements)
-        copy.set_pos(self.pos_start, self.pos_end)
-        copy.set_context(self.context)
-        return copy
+        return List(self.elements)
 
     def equals(self, other):
-        return self.__class__ == other.__class__ and self.elements == other.elements
+        return self.__class__ == other.__class__ and len(self.elements) == len(other.elements) and all(map(values_equal, self.elements, other.elements))
 
     def __repr__(self):
         list_ = []
@@ -374,16 +382,17 @@ class List(Type):
         return f'[{", ".join(list_)}]'
 
 class Object(Type):
+    __slots__ = ()
+
+    built_in = {
+        "set": "object_set",
+        "get": "object_get"
+    }
+
     def __init__(self, elements):
         super().__init__()
         self.elements = elements
 
-        from src.built_in import BuiltInFunction
-        self.built_in = {
-            "set": BuiltInFunction("object_set", self),
-            "get": BuiltInFunction("object_get", self)
-        }
-
     def added_to(self, other):
         if isinstance(other, Object):
             new_object = self.copy()
@@ -408,21 +417,14 @@ class Object(Type):
             try:
                 return self.elements.get(other.value), None
             except:
-                return None, RTError(
-                    other.pos_end, other.pos_end,
-                    "This element is not in the object",
-                    self.context
-                )
+                return None, operation_error("This element is not in the object")
         return None, Type.illegal_operation(self, other)
         
     def copy(self):
-        copy = Object(self.elements)
-        copy.set_pos(self.pos_start, self.pos_end)
-        copy.set_context(self.context)
-        return copy
+        return Object(self.elements)
 
     def equals(self, other):
-        return self.__class__ == other.__class__ and self.elements == other.elements
+        return self.__class__ == other.__class__ and self.elements.keys() == other.elements.keys() and all(values_equal(value, other.elements[key]) for key, value in self.elements.items())
 
     def __repr__(self):
         string = "{  }"
@@ -441,98 +443,116 @@ class Object(Type):
             string += " }"
         return string
 
+class Signature:
+    # What a function takes, worked out once when it is defined instead of
+    # on every call: its argument names, how many it takes, how many must
+    # be passed (those before the first optional one) and, for a function
+    # the resolver gave a scope, the frame slot each argument goes in
+    __slots__ = ('names', 'arity', 'required', 'slots')
+
+    def __init__(self, arg_names, scope=None):
+        self.names = tuple(name.value if isinstance(name, Token) else name for name, optional in arg_names)
+        self.arity = len(self.names)
+        self.required = self.arity
+        for i, (name, optional) in enumerate(arg_names):
+            if optional:
+                self.required = i
+                break
+        self.slots = tuple(scope.index[name] for name in self.names) if scope else None
+
 class BaseFunction(Type):
+    __slots__ = ('name',)
+
     def __init__(self, name):
         super().__init__()
         self.name = name or "<anonymous>"
 
-    def generate_new_context(self, context=None):
-        new_context = Context(self.name, context if context != None else self.context, self.pos_start)
+    def generate_new_context(self, context, pos_start, pos_end):
+        new_context = Context(self.name, context, pos_start, parent_entry_end=pos_end)
         new_context.symbol_table = SymbolTable(new_context.parent.symbol_table)
         return new_context
 
-    def check_args(self, arg_names, args):
-        res = RTResult()
-
-        if len(args) > len(arg_names):
-            return res.failure(RTError(
-                self.pos_start, self.pos_end,
-                f"{len(args) - len(arg_names)} too many args passed into '{self.name}'",
-                self.context
-            ))
-        
-        firstOp = -1
-
-        for i in range(len(arg_names)):
-            if arg_names[i][1] == True:
-                firstOp = i
-                break
-
-
-        if (len(args) <= firstOp-1) or ((firstOp < 0) and (len(args) < len(arg_names))):
-            return res.failure(RTError(
-                self.pos_start, self.pos_end,
-                f"{len(arg_names) - len(args)}, too few args passed into '{self.name}'",
-                self.context
-            ))
-
-        return res.success(None)
-
-    def populate_args(self, arg_names, args, exec_ctx):
-        for i in range(len(arg_names)):
-            arg_name = arg_names[i][0]
-            if isinstance(arg_name, Token):
-                arg_name = arg_names[i][0].value
-
-            if len(args)-1 < i:
-                arg_value = Null()
-            else:
-                arg_value = args[i]
-
-            arg_value.set_context(exec_ctx)
-            exec_ctx.symbol_table.set(arg_name, arg_value)
-
-    def check_and_populate_args(self, arg_names, args, exec_ctx):
-        res = RTResult()
-
-        res.register(self.check_args(arg_names, args))
-        if res.should_return(): return res
-        self.populate_args(arg_names, args, exec_ctx)
-        
-        return res.success(None)
+    def check_args(self, signature, args, context, pos_start, pos_end):
+        if len(args) > signature.arity:
+            raise RTError(
+                pos_start, pos_end,
+                f"{len(args) - signature.arity} too many args passed into '{self.name}'",
+                context
+            )
+
+        if len(args) < signature.required:
+            raise RTError(
+                pos_start, pos_end,
+                f"{signature.arity - len(args)}, too few args passed into '{self.name}'",
+                context
+            )
+
+    def populate_args(self, signature, args, exec_ctx):
+        # Arguments that were left out are null
+        if signature.slots != None:
+            slots = exec_ctx.symbol_table.slots
+            for slot, value in zip(signature.slots, args):
+                slots[slot] = value
+            for slot in signature.slots[len(args):]:
+                slots[slot] = null
+        else:
+            symbols = exec_ctx.symbol_table.symbols
+            for name, value in zip(signature.names, args):
+                symbols[name] = value
+            for name in signature.names[len(args):]:
+                symbols[name] = null
+
+    def check_and_populate_args(self, signature, args, exec_ctx, context, pos_start, pos_end):
+        self.check_args(signature, args, context, pos_start, pos_end)
+        self.populate_args(signature, args, exec_ctx)
 
     def equals(self, other):
         return self.__class__ == other.__class__ and self.name == other.name
 
 class Function(BaseFunction):
-    def __init__(self, name, body_node, arg_names, should_auto_return, isPublic, lib):
+    __slots__ = ('body_node', 'arg_names', 'should_auto_return', 'isPublic', 'lib', 'code', 'scope', 'signature')
+
+    def __init__(self, name, body_node, arg_names, should_auto_return, isPublic, lib, code=None, scope=None, signature=None):
         super().__init__(name)
         self.body_node = body_node
         self.arg_names = arg_names
         self.should_auto_return = should_auto_return
         self.isPublic = isPublic
         self.lib = lib
+        self.code = code
+        self.scope = scope
+        self.signature = signature or Signature(arg_names, scope)
 
-    def execute(self, args):
-        res = RTResult()
-        from src.interpreter import Interpreter
-        interpreter = Interpreter()
-        exec_ctx = self.generate_new_context(self.lib)
+    def generate_new_context(self, context, pos_start, pos_end):
+        if not self.scope:
+            return super().generate_new_context(context, pos_start, pos_end)
 
-        res.register(self.check_and_populate_args(self.arg_names, args, exec_ctx))
-        if res.should_return(): return res
+        new_context = Context(self.name, context, pos_start, parent_entry_end=pos_end)
+        new_context.symbol_table = Frame(self.scope, new_context.parent.symbol_table)
+        return new_context
 
-        value = res.register(interpreter.visit(self.body_node, exec_ctx))
-        if res.should_return() and res.func_return_value == None: return res
-        
-        ret_value = (value if self.should_auto_return else None) or res.func_return_value or Null()
-        return res.success(ret_value)
+    def execute(self, args, context, pos_start, pos_end):
+        exec_ctx = self.generate_new_context(self.lib, pos_start, pos_end)
+        self.check_and_populate_args(self.signature, args, exec_ctx, context, pos_start, pos_end)
+
+        # A break or continue outside of a loop in the body is left to the
+        # loop around the call
+        try:
+            if self.code:
+                value = exec_ctx.engine.vm.run(self.code, exec_ctx)
+            else:
+                interpreter = exec_ctx.engine.interpreter
+                if self.should_auto_return:
+                    value = interpreter.visit(self.body_node, exec_ctx)
+                else:
+                    value = interpreter.visit_discarded(self.body_node, exec_ctx)
+        except FuncReturn as ret:
+            return ret.value
+
+        return (value if self.should_auto_return else None) or null
 
     def copy(self):
-        copy = Function(self.name, self.body_node, self.arg_names, self.should_auto_return, self.isPublic, self.lib)
-        copy.set_context(self.context)
-        copy.set_pos(self.pos_start, self.pos_end)
-        return copy
+        return Function(self.name, self.body_node, self.arg_names, self.should_auto_return, self.isPublic, self.lib, self.code, self.scope, self.signature)
     
     def __repr__(self):
         return f"<function {self.name}>"
\ No newline at end of file
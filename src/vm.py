@@ -0,0 +1,281 @@
+from src.types import Number, String, Boolean, Function, List, Object, null, boolean, number
+from src.results import FuncReturn, LoopBreak, LoopContinue
+from src.errors import RTError
+from src.rt_types import *
+from src.compiler import *
+from src.interpreter import counted_range, loop_variable
+
+class VM:
+    def run(self, code, context):
+        instructions = code.instructions
+        consts = code.consts
+        names = code.names
+        symbol_table = context.symbol_table
+        stack = []
+        blocks = []
+        pc = 0
+
+        while True:
+            op, arg = instructions[pc]
+            pc += 1
+
+            if op == LOAD_FAST:
+                value = symbol_table.slots[arg[0]]
+                if value is None:
+                    value = symbol_table.parent.get(names[arg[1]])
+                if not value:
+                    raise self.error(code, pc, f"'{names[arg[1]]}' is not defined", context)
+                stack.append(value)
+
+            elif op == LOAD_NAME:
+                value = symbol_table.get(names[arg])
+                if not value:
+                    raise self.error(code, pc, f"'{names[arg]}' is not defined", context)
+                stack.append(value)
+
+            elif op == LOAD_NUMBER:
+                stack.append(number(consts[arg]))
+
+            elif op == BINARY_OP:
+                right = stack.pop()
+                left = stack.pop()
+                method, pos_start, pos_end = arg
+                result, error = getattr(left, method)(right)
+                if error: raise self.operand_error(error, pos_start, pos_end, context)
+                stack.append(result)
+
+            elif op == POP_TOP:
+                stack.pop()
+
+            elif op == STORE_FAST:
+                symbol_table.slots[arg] = stack[-1]
+
+            elif op == STORE_NAME:
+                symbol_table.declare(None, names[arg[0]], stack[-1], arg[1])
+
+            elif op == UPDATE_NAME:
+                name_idx, assign_type, slot, pos_start, pos_end = arg
+                value = stack.pop()
+                u_value = symbol_table.lookup(slot, names[name_idx])
+                if not u_value:
+                    raise self.error(code, pc, f"'{names[name_idx]}' is not defined", context)
+
+                if assign_type == TT_PE:
+                    value, error = u_value.added_to(value)
+                    if error: raise self.operand_error(error, pos_start, pos_end, context)
+                elif assign_type == TT_ME:
+                    value, error = u_value.subbed_by(value)
+                    if error: raise self.operand_error(error, pos_start, pos_end, context)
+
+                symbol_table.assign(slot, names[name_idx], value)
+                stack.append(value)
+
+            elif op == FOR_RANGE_NEXT:
+                variables, key, counter = stack[-1]
+                i = next(counter, None)
+                if i is None:
+                    pc = arg[0]
+                else:
+                    variables[key] = number(i)
+
+            elif op == JUMP:
+                pc = arg
+
+            elif op == POP_JUMP_IF_FALSE:
+                if not stack.pop().is_true():
+                    pc = arg
+
+            elif op == JUMP_IF_DECIDED:
+                left = stack[-1]
+                if left.is_true() == arg[0]:
+                    if not isinstance(left, Boolean):
+                        stack[-1] = boolean(left.is_true())
+                    pc = arg[1]
+
+            elif op == LOAD_STRING:
+                stack.append(String(consts[arg]))
+
+            elif op == CALL:
+                args = stack[len(stack) - arg:] if arg else []
+                del stack[len(stack) - arg:]
+                pos_start, pos_end = code.positions[pc - 1]
+                try:
+                    value = stack.pop().execute(args, context, pos_start, pos_end)
+                except (LoopBreak, LoopContinue) as signal:
+                    pc = self.unwind(isinstance(signal, LoopBreak), pc, stack, blocks)
+                    if pc is None: raise
+                    continue
+
+                stack.append(value)
+
+            elif op == BINARY_DOT:
+                right = stack.pop()
+                left = stack.pop()
+                result, error = left.dotted_to(right)
+                if error: raise self.operand_error(error, arg[0], arg[1], context)
+                stack.append(result)
+
+            elif op == LOAD_DEREF:
+                value = symbol_table.lookup(arg[0], names[arg[1]])
+                if not value:
+                    raise self.error(code, pc, f"'{names[arg[1]]}' is not defined", context)
+                stack.append(value)
+
+            elif op == LOAD_GLOBAL:
+                value = symbol_table.globals.get(names[arg])
+                if not value:
+                    raise self.error(code, pc, f"'{names[arg]}' is not defined", context)
+                stack.append(value)
+
+            elif op == LOAD_CONST:
+                stack.append(consts[arg])
+
+            elif op == COLLECT:
+                value = stack.pop()
+                stack[-arg].append(value)
+
+            elif op == FOR_LIST_NEXT:
+                value = next(stack[-1], StopIteration)
+                if value is StopIteration:
+                    pc = arg[2]
+                else:
+                    symbol_table.assign(arg[1], names[arg[0]], value)
+
+            elif op == FOR_OBJECT_NEXT:
+                item = next(stack[-1], StopIteration)
+                if item is StopIteration:
+                    pc = arg[4]
+                else:
+                    symbol_table.assign(arg[1], names[arg[0]], String(str(item[0])))
+                    symbol_table.assign(arg[3], names[arg[2]], item[1])
+
+            elif op == LOAD_BOOLEAN:
+                stack.append(boolean(arg))
+
+            elif op == LOAD_NULL:
+                stack.append(null)
+
+            elif op == BUILD_LIST:
+                elements = stack[len(stack) - arg:] if arg else []
+                del stack[len(stack) - arg:]
+                stack.append(List(elements))
+
+            elif op == BUILD_OBJECT:
+                values = stack[len(stack) - len(arg):] if arg else []
+                del stack[len(stack) - len(arg):]
+                stack.append(Object(dict(zip(arg, values))))
+
+            elif op == UNARY_NEG:
+                result, error = stack.pop().multed_by(number(-1))
+                if error:
+                    pos_start, pos_end = code.positions[pc - 1]
+                    raise self.operand_error(error, pos_start, pos_end, context)
+                stack.append(result)
+
+            elif op == UNARY_NOT:
+                result, error = stack.pop().notted()
+                if error:
+                    pos_start, pos_end = code.positions[pc - 1]
+                    raise self.operand_error(error, pos_start, pos_end, context)
+                stack.append(result)
+
+            elif op == CASE_MATCH:
+                case_value = stack.pop()
+                if not stack[-1].equals(case_value):
+                    pc = arg
+
+            elif op == SETUP_LOOP:
+                blocks.append((len(stack),) + arg)
+
+            elif op == POP_BLOCK:
+                blocks.pop()
+
+            elif op == LOAD_ACC:
+                stack.append([])
+
+            elif op == BUILD_LOOP_LIST:
+                stack.append(List(stack.pop()))
+
+            elif op == FOR_RANGE_PREP:
+                step_value = stack.pop() if arg[0] else number(1)
+                end_value = stack.pop()
+                start_value = stack.pop()
+                variables, key = loop_variable(symbol_table, arg[1], names[arg[2]])
+                stack.append((variables, key, iter(counted_range(start_value.value, end_value.value, step_value.value))))
+
+            elif op == CHECK_NUMBER:
+                if not isinstance(stack[-1], Number):
+                    raise self.error(code, pc, "Expected number", context)
+
+            elif op == FOR_OBJECT_PREP:
+                _object = stack.pop()
+                if not isinstance(_object, Object):
+                    raise self.error(code, pc, "Expected object", context)
+                stack.append(iter(_object.elements.items()))
+
+            elif op == FOR_LIST_PREP:
+                _list = stack.pop()
+                if not isinstance(_list, List):
+                    raise self.error(code, pc, "Expected list", context)
+                stack.append(iter(_list.elements))
+
+            elif op == BREAK_LOOP:
+                pc = self.unwind(True, pc, stack, blocks)
+                if pc is None: raise LoopBreak
+
+            elif op == CONTINUE_LOOP:
+                pc = self.unwind(False, pc, stack, blocks)
+                if pc is None: raise LoopContinue
+
+            elif op == RETURN_VALUE:
+                raise FuncReturn(stack.pop())
+
+            elif op == END:
+                return stack.pop()
+
+            elif op == MAKE_FUNCTION:
+                func_name, body_node, arg_names, should_auto_return, isPublic, body_code, scope, slot, signature = consts[arg]
+                func_value = Function(
+                    func_name, body_node, arg_names, should_auto_return, isPublic, context, body_code, scope, signature
+                )
+
+                if func_name:
+                    symbol_table.declare(slot, func_name, func_value, isPublic)
+                stack.append(func_value)
+
+            elif op == EVAL_NODE:
+                node, bin_op_right = arg
+                try:
+                    value = context.engine.interpreter.visit(node, context, bin_op_right)
+                except (LoopBreak, LoopContinue) as signal:
+                    pc = self.unwind(isinstance(signal, LoopBreak), pc, stack, blocks)
+                    if pc is None: raise
+                    continue
+                stack.append(value)
+
+            else:
+                raise Exception(f'Unknown opcode {op}')
+
+    def unwind(self, is_break, pc, stack, blocks):
+        # Mirrors how the tree walker propagates a signal: the innermost loop
+        # whose body is being executed handles break/continue, every other
+        # enclosing construct is abandoned. None when no loop of this code
+        # does, and the signal leaves it
+        while blocks:
+            height, continue_target, break_target, body_start, body_end = blocks[-1]
+            if body_start <= pc - 1 < body_end:
+                del stack[height:]
+                return break_target if is_break else continue_target
+            blocks.pop()
+
+        return None
+
+    def error(self, code, pc, details, context):
+        pos_start, pos_end = code.positions[pc - 1]
+        return RTError(pos_start, pos_end, details, context)
+
+    def operand_error(self, error, pos_start, pos_end, context):
+        # Like Interpreter.operand_error: the error points at the operand
+        # it is about, as compiled into the instruction
+        error.pos_start, error.pos_end, error.context = pos_start, pos_end, context
+        return error
@@ -0,0 +1,106 @@
+import contextlib
+import glob
+import io
+import os
+
+from src.lexer import Lexer
+from src.parser import Parser
+from src.resolver import Resolver
+from src.errors import Context
+from src.engine import Engine
+from src.symbol_table import SymbolTable, Scope
+from src.position import source_of
+from src.token import Token
+import src.built_in as built_in
+
+# Scripts that parse and run, and ones kept for the syntax error they have
+CORPUS = sorted(glob.glob(os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpus", "*.bp")))
+SYNTAX_ERRORS = sorted(glob.glob(os.path.join(os.path.dirname(os.path.abspath(__file__)), "syntax_errors", "*.bp")))
+
+def read(path):
+    with open(path) as f:
+        return f.read()
+
+# The sources of everything lexed here. Nothing that tests check trees and
+# errors with keeps one alive, and their spans are read after lexing is done
+sources = []
+
+def lex(text, fn="<test>"):
+    lexer = Lexer(fn, text)
+    sources.append(lexer.source)
+    return lexer.make_tokens()
+
+def parse(text, fn="<test>"):
+    # The resolved tree, or the first error lexing or parsing gave
+    tokens, error = lex(text, fn)
+    if error: return None, error
+
+    ast = Parser(tokens).parse()
+    if ast.error: return None, ast.error
+
+    return Resolver().resolve(ast.node), None
+
+def location(pos):
+    return source_of(pos).location(pos)
+
+def dump(node):
+    # A tree as nested lists, with its spans as lines and columns, so that
+    # trees parsed from different sources compare equal
+    if isinstance(node, tuple) and node and isinstance(node[0], Token):
+        # A name with what goes with it, like the span of the access it ends
+        # in a dotted assignment
+        return [location(item) if type(item) is int else dump(item) for item in node]
+    if isinstance(node, (list, tuple)): return [dump(item) for item in node]
+    if isinstance(node, Scope): return ["Scope", node.name, node.names, dump(node.parent)]
+    if isinstance(node, (int, float, str)) or not hasattr(node, "__slots__"): return node
+
+    fields = [type(node).__name__]
+    for cls in type(node).__mro__:
+        for name in getattr(cls, "__slots__", ()):
+            value = getattr(node, name, None)
+            if name in ("pos_start", "pos_end") and value != None:
+                fields.append((name, location(value)))
+            else:
+                fields.append((name, dump(value)))
+    return fields
+
+def span(pos, end=False):
+    # Where the first character of a span is, or with end its last
+    pos -= end
+    return list(location(pos))
+
+def shape(node):
+    # A parse tree the way baseline_trees.json holds the ones the original
+    # parser gave: each node and token as a dict of the fields it has set,
+    # and each span as where its first and last characters are, which any
+    # way of keeping positions agrees on
+    if isinstance(node, tuple) and len(node) == 3 and isinstance(node[0], Token):
+        return [shape(node[0]), span(node[1]), span(node[2], True)]
+    if isinstance(node, (list, tuple)): return [shape(item) for item in node]
+    if node == None or isinstance(node, (bool, int, float, str)): return node
+
+    fields = {"": type(node).__name__}
+    for cls in type(node).__mro__:
+        for name in getattr(cls, "__slots__", ()):
+            value = getattr(node, name, None)
+            if value == None: continue
+            if name in ("pos_start", "pos_end"):
+                fields[name] = span(value, name == "pos_end")
+            else:
+                fields[name] = shape(value)
+    return fields
+
+def execute(node, use_vm):
+    # What a run printed, the repr of its value and its error with the span
+    # it points at
+    engine = Engine(use_vm)
+    context = Context("<program>", engine=engine)
+    context.symbol_table = SymbolTable()
+    built_in.register_var(context.symbol_table)
+
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        result = engine.execute(node, context)
+
+    error = result.error
+    return output.getvalue(), repr(result.value), error and (error.pos_start, error.pos_end, error.as_string())
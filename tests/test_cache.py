@@ -0,0 +1,42 @@
+import os
+import pickle
+import BananaPlus
+from helpers import execute
+from src import cache
+
+def parse(path):
+    node, source, error = BananaPlus.parse(str(path), path.read_text(), str(path))
+    assert error == None
+    return node, source
+
+def test_deep_tree_is_cached(tmp_path):
+    path = tmp_path / "deep.bp"
+    path.write_text("let total = " + " + ".join(["1"] * 5000) + "\ntotal\n")
+
+    node, source = parse(path)
+    cached = cache.load(str(path), source)
+
+    assert cached != None and cached is not node
+    assert execute(cached, False) == execute(node, False)
+    assert "5000" in execute(cached, False)[1]
+
+def test_small_tree_is_cached(tmp_path):
+    path = tmp_path / "small.bp"
+    path.write_text("let a = [1, 2]\nprint(a)\n")
+
+    node, source = parse(path)
+    cached = cache.load(str(path), source)
+
+    assert os.listdir(tmp_path / cache.CACHE_DIR) == ["small.bpc"]
+    assert execute(cached, False) == execute(node, False)
+
+def test_failed_store_leaves_no_cache_directory(tmp_path, monkeypatch):
+    def fail(*args):
+        raise pickle.PicklingError("cannot pickle")
+
+    path = tmp_path / "fail.bp"
+    path.write_text("1 + 2\n")
+    monkeypatch.setattr(cache.pickle, "dump", fail)
+    parse(path)
+
+    assert os.listdir(tmp_path) == ["fail.bp"]
@@ -0,0 +1,29 @@
+import os
+import pytest
+from helpers import CORPUS, read, parse, execute
+
+@pytest.mark.parametrize("path", CORPUS, ids=os.path.basename)
+def test_walker_and_vm_agree(path):
+    node, error = parse(read(path), path)
+    assert error == None, error.as_string()
+
+    assert execute(node, False) == execute(node, True)
+
+def test_errors_point_at_the_same_span():
+    node, _ = parse("let a = 1\nfunc f(x) => x + a\nprint(f(2))\nprint(f(\"s\" * 2) - 1)\n")
+
+    walked = execute(node, False)
+    compiled = execute(node, True)
+    assert walked[2] != None
+    assert walked == compiled
+
+def test_jumps_out_of_a_dotted_assignment():
+    # A return, break or continue in the value leaves the assignment
+    # without it being taken for a target that is not an object
+    node, error = parse(read(os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpus", "mv1.bp")))
+    assert error == None
+
+    for use_vm in (False, True):
+        output, _, error = execute(node, use_vm)
+        assert error == None
+        assert output == "3\nearly\nlate\n2\n"
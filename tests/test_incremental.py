@@ -0,0 +1,50 @@
+import random
+from helpers import CORPUS, read, parse, dump
+from src.incremental import Document
+
+# What edits insert: whole statements, the openings and closings of blocks,
+# and bits of lines that leave a chunk unfinished
+SNIPPETS = [
+    "a", "x", " ", "\n", "\n\n", "1", "+", "(", ")", "end", "\nend\n", "if x then\n", "if 1 then\n",
+    "let ", " = ", "\"", "'", "//", ";", "print(1)\n", "func f() => 1\n", "{a: 1}", "[1, 2]",
+    "while a < 3 then\n", "else\n", "elif y then\n", "return", ".", ",", "\t",
+]
+
+def full_parse(text):
+    node, error = parse(text, "<doc>")
+    if error: return "error", error.as_string()
+    return dump(node)
+
+def state(document):
+    if document.error: return "error", document.error.as_string()
+    return dump(document.node)
+
+def test_open_block_takes_in_the_next_chunks():
+    document = Document("<doc>", "print(1)\nprint(2)\nprint(3)\n")
+    document.edit(0, 0, "if 1 then\n")
+
+    assert state(document) == full_parse(document.text)
+    assert [type(node).__name__ for node in document.node.element_nodes] == ["IfNode"]
+
+def test_random_edits_match_a_full_parse():
+    # Short runs of edits from scripts that parse, since once an edit
+    # breaks a script every later one parses the whole of it again
+    rng = random.Random(5)
+    partial_parses = 0
+    for path in CORPUS:
+        for _ in range(10):
+            text = read(path)
+            document = Document("<doc>", text)
+            for _ in range(3):
+                # Blocks mostly get opened and closed at the start of a line
+                offset = rng.randint(0, len(text))
+                if rng.random() < 0.5: offset = text.rfind("\n", 0, offset) + 1
+                removed = min(rng.choice([0, 0, 1, 2, 5]), len(text) - offset)
+                inserted = rng.choice(SNIPPETS) if rng.random() < 0.8 else ""
+                text = text[:offset] + inserted + text[offset + removed:]
+                document.edit(offset, removed, inserted)
+
+                assert state(document) == full_parse(text), (path, text)
+            partial_parses += document.partial_parses
+
+    assert partial_parses > 100
@@ -0,0 +1,63 @@
+import os
+import random
+import pytest
+from benchmarks.char_lexer import CharLexer
+from helpers import CORPUS, SYNTAX_ERRORS, read
+from src.built_in import BuiltInFunction
+from src.lexer import Lexer, InternTable
+from src.rt_types import TT_IDENTIFIER
+
+def names(lexer):
+    tokens, error = lexer.make_tokens()
+    assert error == None
+    return [tok.value for tok in tokens if tok.type == TT_IDENTIFIER]
+
+def test_names_are_shared_within_a_table():
+    interned = InternTable()
+    first = names(Lexer("<test>", "let total = total + 1\n", interned))
+    second = names(Lexer("<test>", "print(" + "total"[:2] + "tal)\n", interned))
+
+    assert first[0] is first[1] is second[1]
+    assert interned.lookups == 5 and interned.misses == 3
+
+def test_every_lexer_starts_its_own_table():
+    first, second = Lexer("<test>", "let name = 1\n"), Lexer("<test>", "name\n")
+    names(first)
+    names(second)
+
+    assert first.interned is not second.interned
+    assert list(second.interned.strings) == ["name"]
+
+def test_names_share_the_built_in_names():
+    keys = {name: name for name in BuiltInFunction.methods}
+    printed, length = names(Lexer("<test>", "print(len(x))\n"))[:2]
+
+    assert printed is keys["print"] and length is keys["len"]
+
+# Bits of scripts that random ones are put together from, along with the
+# cases that are easy to get wrong: comments and strings cut off by the end
+# of the file, escapes, a lone '!' and characters no token starts with
+PIECES = [
+    "let", "func", "if", "then", "end", "name", "x_1", "A9", " ", "\t", "\n", ";",
+    "0", "12", "3.5", "7.", "1.2.3", "+", "+=", "-", "-=", "*", "/", "^", "=", "==", "=>",
+    "!=", "<", "<=", ">", ">=", "(", ")", "[", "]", "{", "}", ":", ".", "?", ",",
+    "// note\n", "// open", "\"str\"", "'s'", "\"a\\\"b\\n\"", "\"open", "'\\", "!", "@", "é",
+]
+
+def lexed(lexer_class, text):
+    lexer = lexer_class("<test>", text)
+    base = lexer.source.base
+    tokens, error = lexer.make_tokens()
+    if error: return type(error), error.pos_start - base, error.pos_end - base, error.details
+    return [(tok.type, tok.value, tok.pos_start - base, tok.pos_end - base) for tok in tokens]
+
+@pytest.mark.parametrize("path", CORPUS + SYNTAX_ERRORS, ids=os.path.basename)
+def test_corpus_lexes_like_char_lexer(path):
+    text = read(path)
+    assert lexed(Lexer, text) == lexed(CharLexer, text)
+
+def test_random_scripts_lex_like_char_lexer():
+    rng = random.Random(11)
+    for _ in range(3000):
+        text = "".join(rng.choice(PIECES) for _ in range(rng.randint(1, 12)))
+        assert lexed(Lexer, text) == lexed(CharLexer, text), text
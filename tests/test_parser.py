@@ -0,0 +1,59 @@
+import json
+import os
+import pytest
+from helpers import CORPUS, SYNTAX_ERRORS, lex, read, shape, span
+from src.parser import Parser, MAX_ERRORS
+
+with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline_trees.json")) as f:
+    BASELINE = json.load(f)
+
+# Scripts the original parser cut short without an error, by dropping a
+# statement that failed partway and stopping at the keyword after it.
+# They report that syntax error now
+TRUNCATED = {"e11.bp"}
+
+def parsed(text, fn):
+    tokens, error = lex(text, fn)
+    if not error:
+        ast = Parser(tokens).parse()
+        if not ast.error: return shape(ast.node)
+        error = ast.error
+    return ["error", error.error_name, error.details, span(error.pos_start)]
+
+def errors(text):
+    tokens, error = lex(text)
+    assert error == None
+    errors = []
+    ast = Parser(tokens).parse(errors=errors)
+    assert ast.error is (errors[0] if errors else None)
+    return errors
+
+@pytest.mark.parametrize("path", CORPUS + SYNTAX_ERRORS, ids=os.path.basename)
+def test_corpus_parses_like_baseline(path):
+    name = os.path.basename(path)
+    tree = parsed(read(path), name)
+
+    if name in TRUNCATED:
+        assert BASELINE[name][""] == "ListNode"
+        assert tree[0] == "error"
+    else:
+        assert tree == BASELINE[name]
+
+def test_every_error_is_collected():
+    found = errors("let a = 1\nlet = 2\nprint(a)\nlet b = (1\nif a then\n    let c = )\nend\nprint(a b)\n")
+
+    assert [(error.details, span(error.pos_start)[0]) for error in found] == [
+        ("Expected identifier", 1),
+        ("Expected ')'", 3),
+        ("Expected 'let', 'if', 'for', 'while', 'func' 'int, float, boolean, identifier, '+', '-', '(', '{', '[' or 'not'", 5),
+        ("Expected ',' or ')'", 7),
+    ]
+
+def test_script_without_errors_collects_none():
+    assert errors("let a = 1\nprint(a)\n") == []
+
+def test_errors_stop_at_max_errors():
+    found = errors("let = 1\n" * (MAX_ERRORS + 20))
+
+    assert len(found) == MAX_ERRORS
+    assert [span(error.pos_start)[0] for error in found] == list(range(MAX_ERRORS))
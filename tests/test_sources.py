@@ -0,0 +1,103 @@
+import contextlib
+import gc
+import io
+import pytest
+
+import BananaPlus
+from src import position
+from src.lexer import Lexer
+
+def run(text):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return BananaPlus.run("<test>", text)
+
+def test_run_releases_its_source():
+    gc.collect()
+    count = len(position.sources)
+    for _ in range(10):
+        run("let x = [1, 2, 3]\nx / 0\n")
+    assert len(position.sources) == count
+
+def test_errors_keep_their_source():
+    gc.collect()
+    count = len(position.sources)
+    _, error = run("let a = 1\nprint(a + \"b\" * \"c\")\n")
+    _, syntax_error = run("let a = (1\n")
+
+    assert len(position.sources) == count + 2
+    assert "print(a + \"b\" * \"c\")" in error.as_string()
+    assert "line 2" in error.as_string()
+    assert "Invalid Syntax" in syntax_error.as_string()
+    del error, syntax_error
+    gc.collect()
+    assert len(position.sources) == count
+
+def test_run_keeps_the_source_of_its_functions():
+    gc.collect()
+    count = len(position.sources)
+    run("func twice(n) => n * 2\n")
+    run("print(twice(2))\n")
+
+    # The second run made no function, so only the first one's source stays
+    assert len(position.sources) == count + 1
+    run("let twice = null\n")
+    gc.collect()
+    assert len(position.sources) == count
+
+def test_released_positions_are_not_found():
+    source = position.Source("<test>", "let a = 1\n")
+    pos = source.base + 3
+    assert position.source_of(pos) is source
+
+    del source
+    gc.collect()
+    with pytest.raises(ValueError):
+        position.source_of(pos)
+
+LINE_ENDS = b"let a = 1\r\nlet b = 2\rlet s = \"x\r\ny\rz\"\r// note\rprint(a + b)\r\n// last\r"
+
+def tokens(lexer):
+    toks, error = lexer.make_tokens()
+    assert error == None
+    return [(tok.type, tok.value, lexer.source.location(tok.pos_start)) for tok in toks]
+
+def test_mapped_line_ends_lex_like_text_mode(tmp_path, monkeypatch):
+    path = tmp_path / "lines.bp"
+    path.write_bytes(LINE_ENDS)
+    with open(path) as f:
+        text = f.read()
+    monkeypatch.setattr(position, "MAP_THRESHOLD", 0)
+    mapped = position.read_source(str(path))
+
+    try:
+        assert tokens(Lexer("lines.bp", mapped)) == tokens(Lexer("lines.bp", text))
+    finally:
+        mapped.close()
+
+def test_mapped_errors_read_the_file_again(tmp_path, monkeypatch):
+    path = tmp_path / "error.bp"
+    path.write_bytes(b"let a = 1\rlet b = 2\r\nprint(a - \"b\")\r")
+    monkeypatch.setattr(position, "MAP_THRESHOLD", 0)
+
+    _, error = BananaPlus.run(str(path), position.read_source(str(path)), str(path))
+
+    assert "line 3" in error.as_string()
+    assert "print(a - \"b\")\n          ^^^\n" in error.as_string()
+
+def test_scripts_decode_the_same_at_any_size(tmp_path, monkeypatch):
+    path = tmp_path / "bad.bp"
+    path.write_bytes(b"let s = \"\xff\"\n")
+    with pytest.raises(UnicodeDecodeError):
+        position.read_source(str(path))
+
+    monkeypatch.setattr(position, "MAP_THRESHOLD", 0)
+    with pytest.raises(UnicodeDecodeError):
+        position.read_source(str(path))
+
+def test_read_file_fails_on_text_it_cannot_decode(tmp_path):
+    path = tmp_path / "bad.txt"
+    path.write_bytes(b"\xff\n")
+
+    _, error = run(f"Files.readFile(\"{path}\")\n")
+
+    assert "Can't open that file" in error.as_string()
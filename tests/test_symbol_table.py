@@ -0,0 +1,13 @@
+from src.symbol_table import SymbolTable, GLOBAL_SLOT
+
+def test_exports_are_made_by_the_first_public_declaration():
+    table = SymbolTable()
+    table.declare(GLOBAL_SLOT, "hidden", 1, False)
+    table.remove("hidden")
+    assert table.exports == None
+
+    table.declare(GLOBAL_SLOT, "shown", 2, True)
+    table.declare(GLOBAL_SLOT, "other", 3, True)
+    table.declare(GLOBAL_SLOT, "other", 4, False)
+    table.assign(GLOBAL_SLOT, "shown", 5)
+    assert list(table.exports) == ["shown"]